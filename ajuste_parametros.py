@@ -0,0 +1,333 @@
+"""
+AJUSTE DE PARÁMETROS DE GUROBI POR CLASE DE INSTANCIA
+configurar_parametros fija Presolve, NodefileStart y MemLimit para todos los modos;
+este módulo busca, sobre instancias representativas de cargar_parametros, los
+parámetros de búsqueda (MIPFocus, Cuts, Heuristics, Symmetry, ...) que llegan antes
+al gap objetivo, y los guarda por clase de instancia (cubetas de zonas × días ×
+carabineros) en resultados/ajustes_gurobi.json. main.py carga automáticamente el
+conjunto de la clase de la instancia que resuelve.
+
+Métodos:
+    tune:    herramienta de ajuste de Gurobi (model.tune()) sobre la instancia
+    carrera: búsqueda propia: la configuración base más candidatos aleatorios del
+             ESPACIO_BUSQUEDA compiten con un presupuesto de trabajo que se duplica
+             en cada ronda, descartando la peor mitad. Se mide en unidades de trabajo
+             de Gurobi (Work), que no dependen de la carga de la máquina.
+
+Solo se guardan parámetros de búsqueda: los de tiempo, memoria, threads y logs
+siguen viniendo de configurar_parametros y de estimador.recomendar_estrategia.
+
+Uso:
+    python ajuste_parametros.py [--testing | --cinco-zonas] [--completo] [--zonas 30,17,8]
+        [--metodo carrera|tune] [--candidatos 12] [--trabajo 60] [--tiempo 3600] [--gap 0.01]
+        [--agregado] [--ajustada] [--semilla 0]
+"""
+
+import os
+import sys
+import json
+import random
+import tempfile
+import contextlib
+from datetime import datetime
+
+ARCHIVO_AJUSTES = "resultados/ajustes_gurobi.json"
+
+# Cubetas de la clase de instancia: se usa la menor cota >= tamaño (o "mas")
+CUBETAS_ZONAS = (1, 5, 10, 50, 200)
+CUBETAS_DIAS = (7, 31, 92, 366)
+CUBETAS_CARABINEROS = (100, 500, 2000, 10000)
+
+# Parámetros que dependen de la corrida o de la máquina: nunca se guardan
+PARAMETROS_EXCLUIDOS = {"TimeLimit", "MIPGap", "Threads", "MemLimit", "NodefileStart", "OutputFlag",
+                        "LogToConsole", "DisplayInterval", "LogFile", "WorkLimit", "SolutionLimit"}
+
+ESPACIO_BUSQUEDA = {
+    "MIPFocus": [0, 1, 2, 3],
+    "Cuts": [-1, 0, 1, 2],
+    "Heuristics": [0.0, 0.05, 0.2, 0.5],
+    "Symmetry": [-1, 0, 2],
+    "Presolve": [-1, 1, 2],
+    "PreDual": [-1, 0, 1],
+    "VarBranch": [-1, 0, 1, 3],
+}
+
+
+def _cubeta(valor, cotas):
+    for cota in cotas:
+        if valor <= cota:
+            return str(cota)
+    return "mas"
+
+
+def clase_instancia(parametros, agregado=False, ajustada=False):
+    """Clave de la clase de instancia, p.ej. "z5_t31_c500" (con sufijos _agregado/_ajustada)"""
+    clase = (f"z{_cubeta(len(parametros['Z']), CUBETAS_ZONAS)}_t{_cubeta(len(parametros['T']), CUBETAS_DIAS)}"
+             f"_c{_cubeta(len(parametros['C']), CUBETAS_CARABINEROS)}")
+    return clase + ("_agregado" if agregado else "") + ("_ajustada" if ajustada else "")
+
+
+def leer_ajustes(archivo=ARCHIVO_AJUSTES):
+    """Contenido completo del archivo de ajustes ({clase: registro}); vacío si no existe"""
+    if not os.path.exists(archivo):
+        return {}
+    with open(archivo, encoding="utf-8") as entrada:
+        return json.load(entrada)
+
+
+def cargar_ajustes(parametros, agregado=False, ajustada=False, archivo=ARCHIVO_AJUSTES):
+    """
+    Parámetros ajustados para la clase de la instancia.
+
+    Returns:
+        dict {parámetro: valor} (vacío si la clase no se ha ajustado)
+    """
+    registro = leer_ajustes(archivo).get(clase_instancia(parametros, agregado, ajustada))
+    return dict(registro["parametros"]) if registro else {}
+
+
+def guardar_ajustes(clase, registro, archivo=ARCHIVO_AJUSTES):
+    """Agrega o reemplaza el registro de una clase conservando las demás"""
+    ajustes = leer_ajustes(archivo)
+    ajustes[clase] = registro
+    os.makedirs(os.path.dirname(archivo) or ".", exist_ok=True)
+    with open(archivo, "w", encoding="utf-8") as salida:
+        json.dump(ajustes, salida, indent=2, ensure_ascii=False)
+    print(f"💾 Ajustes de la clase {clase} guardados en {archivo}")
+
+
+def _construir(parametros, agregado, ajustada, gap):
+    """Modelo silencioso con la configuración base y el inicio heurístico"""
+    from modelo import construir_modelo
+    from heuristica import construir_solucion_heuristica, cargar_inicio_mip
+
+    with open(os.devnull, "w") as nulo, contextlib.redirect_stdout(nulo):
+        modelo = construir_modelo(parametros, agregado=agregado, ajustada=ajustada)
+        cargar_inicio_mip(modelo, construir_solucion_heuristica(parametros), parametros)
+    modelo.setParam("OutputFlag", 0)
+    modelo.setParam("MIPGap", gap)
+    modelo.update()
+    return modelo
+
+
+def _parametros_cambiados(modelo):
+    """Parámetros que difieren del valor por defecto, leídos de un .prm escrito por Gurobi"""
+    with tempfile.TemporaryDirectory() as directorio:
+        archivo_prm = os.path.join(directorio, "ajuste.prm")
+        modelo.write(archivo_prm)
+        with open(archivo_prm) as entrada:
+            lineas = entrada.read().splitlines()
+    cambiados = {}
+    for linea in lineas:
+        partes = linea.split()
+        if (len(partes) != 2 or linea.startswith("#") or partes[0] in PARAMETROS_EXCLUIDOS
+                or partes[0].startswith("Tune")):
+            continue
+        try:
+            valor = float(partes[1])
+        except ValueError:
+            continue
+        cambiados[partes[0]] = int(valor) if valor.is_integer() else valor
+    return cambiados
+
+
+def ajustar_tune(parametros, agregado=False, ajustada=False, gap=0.01, tiempo_total=3600, tiempo_prueba=None):
+    """
+    Ajuste con model.tune(): Gurobi prueba configuraciones y deja la mejor en el modelo.
+
+    Args:
+        tiempo_total: TuneTimeLimit (segundos)
+        tiempo_prueba: TimeLimit de cada prueba (por defecto lo decide Gurobi)
+
+    Returns:
+        dict {parámetro: valor} de la mejor configuración (vacío si ninguna mejora la base)
+    """
+    modelo = _construir(parametros, agregado, ajustada, gap)
+    modelo.setParam("OutputFlag", 1)
+    modelo.setParam("TuneTimeLimit", tiempo_total)
+    if tiempo_prueba is not None:
+        modelo.setParam("TimeLimit", tiempo_prueba)
+    print(f"🎛️  model.tune() durante {tiempo_total:.0f} s...")
+    modelo.tune()
+    if modelo.TuneResultCount == 0:
+        print("   ✓ Ninguna configuración mejora la base")
+        modelo.dispose()
+        return {}
+    base = _parametros_cambiados(modelo)
+    modelo.getTuneResult(0)
+    mejor = _parametros_cambiados(modelo)
+    # El .prm omite los valores por defecto: si el ajuste devolvió a su defecto un
+    # parámetro que la base fijaba (p. ej. Presolve 2 -> -1), hay que guardar ese defecto
+    for nombre in base.keys() - mejor.keys():
+        defecto = modelo.getParamInfo(nombre)[5]
+        mejor[nombre] = int(defecto) if float(defecto).is_integer() else defecto
+    modelo.dispose()
+    # configurar_parametros fija algunos valores en la base: se guarda solo lo que cambió el ajuste
+    return {nombre: valor for nombre, valor in mejor.items() if base.get(nombre) != valor}
+
+
+def _medir(modelo, candidato, base, trabajo, gap):
+    """
+    Resuelve desde cero con la configuración base más el candidato y límite de trabajo.
+
+    Returns:
+        (llegó al gap, trabajo usado, gap final)
+    """
+    modelo.reset(0)
+    for nombre, valor in {**base, **candidato, "WorkLimit": trabajo}.items():
+        modelo.setParam(nombre, valor)
+    modelo.optimize()
+    gap_final = modelo.MIPGap if modelo.SolCount > 0 else float("inf")
+    return gap_final <= gap + 1e-12, modelo.Work, gap_final
+
+
+def _puntaje(medicion):
+    """Orden: primero las que llegaron al gap (por trabajo) y luego el resto (por gap)"""
+    llego, trabajo, gap = medicion
+    return (0, trabajo, gap) if llego else (1, gap, trabajo)
+
+
+def ajustar_carrera(parametros, agregado=False, ajustada=False, gap=0.01, candidatos=12, trabajo_inicial=60,
+                    semilla=0, espacio=None):
+    """
+    Búsqueda aleatoria con eliminación por rondas (racing) sobre un solo modelo construido.
+
+    En cada ronda todas las configuraciones vivas se resuelven desde cero con límite de
+    trabajo; sobrevive la mejor mitad y el límite se duplica. Termina cuando queda una
+    o cuando todas las vivas alcanzan el gap (gana la de menor trabajo).
+
+    Args:
+        candidatos: configuraciones aleatorias además de la base (configuración actual)
+        trabajo_inicial: WorkLimit de la primera ronda (unidades de trabajo de Gurobi, ~1 s)
+
+    Returns:
+        (mejor, mediciones): dict {parámetro: valor} ganador (vacío = la base) y, por
+        configuración evaluada, su última medición ("llego", "trabajo", "gap" y el
+        "limite" de trabajo de esa ronda), de la mejor a la peor
+    """
+    from gurobipy import GRB
+
+    espacio = espacio or ESPACIO_BUSQUEDA
+    rng = random.Random(semilla)
+    configuraciones = [{}]
+    for _ in range(100 * (candidatos + 1)):  # tope por si el espacio tiene menos combinaciones
+        if len(configuraciones) > candidatos:
+            break
+        nombres = rng.sample(sorted(espacio), rng.randint(1, 3))
+        candidato = {nombre: rng.choice(espacio[nombre]) for nombre in sorted(nombres)}
+        if candidato not in configuraciones:
+            configuraciones.append(candidato)
+
+    modelo = _construir(parametros, agregado, ajustada, gap)
+    # Base: los valores con que quedó el modelo (configurar_parametros), sin límite de tiempo
+    base = {nombre: modelo.getParamInfo(nombre)[2] for nombre in espacio}
+    base["TimeLimit"] = GRB.INFINITY
+    limites = {}
+    vivas = list(range(len(configuraciones)))
+    mediciones = {}
+    trabajo = trabajo_inicial
+    ronda = 1
+    while True:
+        print(f"🏁 Ronda {ronda}: {len(vivas)} configuraciones, límite {trabajo:.0f} unidades de trabajo")
+        for i in vivas:
+            if i in mediciones and mediciones[i][0]:
+                continue  # ya llegó al gap: con más trabajo el resultado sería el mismo (Work es determinista)
+            mediciones[i], limites[i] = _medir(modelo, configuraciones[i], base, trabajo, gap), trabajo
+            llego, usado, gap_final = mediciones[i]
+            print(f"   • {configuraciones[i] or 'base'}: {'✓' if llego else '✗'} trabajo {usado:.1f}, gap {gap_final:.2%}")
+        vivas.sort(key=lambda i: _puntaje(mediciones[i]))
+        if len(vivas) == 1 or all(mediciones[i][0] for i in vivas):
+            break
+        vivas = vivas[:max(1, len(vivas) // 2)]
+        trabajo *= 2
+        ronda += 1
+    modelo.dispose()
+    # Las eliminadas en rondas anteriores quedan detrás de las que llegaron más lejos
+    orden = vivas + sorted(set(mediciones) - set(vivas), key=lambda i: (-limites[i], _puntaje(mediciones[i])))
+    resumen = [{"parametros": configuraciones[i], "llego": mediciones[i][0], "trabajo": mediciones[i][1],
+                "gap": mediciones[i][2], "limite": limites[i]} for i in orden]
+    return configuraciones[vivas[0]], resumen
+
+
+def ajustar_clase(parametros, metodo="carrera", agregado=False, ajustada=False, gap=0.01, archivo=ARCHIVO_AJUSTES,
+                  **opciones):
+    """
+    Ajusta los parámetros para la clase de la instancia y los guarda.
+
+    Args:
+        metodo: "carrera" (ajustar_carrera) o "tune" (ajustar_tune)
+        opciones: argumentos del método (candidatos, trabajo_inicial, semilla | tiempo_total, tiempo_prueba)
+
+    Returns:
+        dict {parámetro: valor} guardado para la clase
+    """
+    clase = clase_instancia(parametros, agregado, ajustada)
+    print(f"🎛️  Ajustando la clase {clase} ({len(parametros['Z'])} zonas, {len(parametros['T'])} días, "
+          f"{len(parametros['C'])} carabineros) con {metodo}")
+    registro = {"metodo": metodo, "gap": gap, "fecha": datetime.now().isoformat(timespec="seconds"),
+                "instancia": {"zonas": len(parametros["Z"]), "dias": len(parametros["T"]),
+                              "carabineros": len(parametros["C"])}}
+    if metodo == "tune":
+        mejor = ajustar_tune(parametros, agregado=agregado, ajustada=ajustada, gap=gap, **opciones)
+    elif metodo == "carrera":
+        mejor, mediciones = ajustar_carrera(parametros, agregado=agregado, ajustada=ajustada, gap=gap, **opciones)
+        registro["mediciones"] = mediciones
+    else:
+        raise ValueError(f"Método desconocido: {metodo}. Disponibles: carrera, tune")
+    registro["parametros"] = mejor
+    print(f"🏆 Mejor configuración: {mejor or 'la base (sin cambios)'}")
+    guardar_ajustes(clase, registro, archivo)
+    return mejor
+
+
+if __name__ == "__main__":
+    from parametros import cargar_parametros
+
+    modo_testing, horizonte = "cinco_zonas", "mensual"
+    zonas = None
+    metodo = "carrera"
+    agregado = ajustada = False
+    gap = 0.01
+    opciones = {}
+
+    argumentos = iter(sys.argv[1:])
+    for arg in argumentos:
+        if arg == "--testing":
+            modo_testing, horizonte = True, "testing"
+        elif arg == "--cinco-zonas":
+            modo_testing = "cinco_zonas"
+        elif arg == "--completo":
+            horizonte = "completo"
+        elif arg == "--zonas":
+            zonas = [int(z) for z in next(argumentos, "").split(",") if z.strip()]
+        elif arg == "--metodo":
+            metodo = next(argumentos, "carrera")
+        elif arg == "--candidatos":
+            opciones["candidatos"] = int(next(argumentos, "12"))
+        elif arg == "--trabajo":
+            opciones["trabajo_inicial"] = float(next(argumentos, "60"))
+        elif arg == "--semilla":
+            opciones["semilla"] = int(next(argumentos, "0"))
+        elif arg == "--tiempo":
+            opciones["tiempo_total"] = float(next(argumentos, "3600"))
+        elif arg == "--gap":
+            gap = float(next(argumentos, "0.01"))
+        elif arg == "--agregado":
+            agregado = True
+        elif arg == "--ajustada":
+            ajustada = True
+        else:
+            print(f"❌ Argumento desconocido: {arg}")
+            print(__doc__)
+            sys.exit(1)
+
+    claves_metodo = {"carrera": {"candidatos", "trabajo_inicial", "semilla"}, "tune": {"tiempo_total"}}
+    if metodo not in claves_metodo:
+        print(f"❌ Método desconocido: {metodo}. Disponibles: carrera, tune")
+        sys.exit(1)
+    ignoradas = set(opciones) - claves_metodo[metodo]
+    if ignoradas:
+        print(f"⚠️  Opciones que no usa {metodo}: {sorted(ignoradas)}")
+    parametros = cargar_parametros(modo_testing=modo_testing, horizonte=horizonte, zonas=zonas)
+    ajustar_clase(parametros, metodo=metodo, agregado=agregado, ajustada=ajustada, gap=gap,
+                  **{clave: valor for clave, valor in opciones.items() if clave in claves_metodo[metodo]})
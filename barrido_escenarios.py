@@ -0,0 +1,181 @@
+"""
+BARRIDO DE ESCENARIOS
+Estudios de sensibilidad sobre kappa, lambda y el multiplicador de presupuesto:
+carga los parámetros una sola vez, resuelve cada escenario en un pool de procesos
+(repartiendo los núcleos entre solves concurrentes y Threads de Gurobi) y escribe
+una tabla consolidada con un resultado por escenario.
+
+Uso:
+    python barrido_escenarios.py --kappa 3,5,8 --lambda 0.4,0.6 --presupuesto 5,7 --procesos 2
+"""
+
+import os
+import sys
+import time
+import itertools
+import contextlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import pandas as pd
+from parametros import cargar_parametros, aplicar_escenario
+from heuristica import construir_solucion_heuristica, cargar_inicio_mip
+
+ARCHIVO_BARRIDO = "resultados/barrido_escenarios.csv"
+
+# Estado de cada proceso del pool: los parámetros se envían una vez por proceso,
+# no en cada escenario
+_TRABAJADOR = {}
+
+
+def generar_escenarios(grilla):
+    """
+    Producto cartesiano de una grilla de valores.
+
+    Args:
+        grilla: dict {parámetro: [valores]}, p.ej. {"kappa": [3, 5], "lambda": [0.6]}
+
+    Returns:
+        Lista de dicts {parámetro: valor}
+    """
+    claves = list(grilla)
+    return [dict(zip(claves, valores)) for valores in itertools.product(*(grilla[k] for k in claves))]
+
+
+def _inicializar_trabajador(parametros, hilos, tiempo_limite, agregado, matricial):
+    _TRABAJADOR.update({"parametros": parametros, "hilos": hilos, "tiempo": tiempo_limite,
+                        "agregado": agregado, "matricial": matricial})
+
+
+def resolver_escenario(escenario):
+    """
+    Resuelve un escenario y retorna una fila de la tabla consolidada.
+
+    Se ejecuta en un proceso del pool (ver _inicializar_trabajador): gurobipy se importa
+    aquí y la salida de la construcción y el log de Gurobi se silencian para no
+    intercalar solves concurrentes.
+    """
+    from gurobipy import GurobiError
+    from modelo import construir_modelo
+
+    fila = dict(escenario)
+    inicio = time.perf_counter()
+    sub = aplicar_escenario(_TRABAJADOR["parametros"], escenario)
+    try:
+        with open(os.devnull, "w") as nulo, contextlib.redirect_stdout(nulo):
+            modelo = construir_modelo(sub, agregado=_TRABAJADOR["agregado"], matricial=_TRABAJADOR["matricial"])
+            modelo.setParam("OutputFlag", 0)
+            modelo.setParam("Threads", _TRABAJADOR["hilos"])
+            modelo.setParam("TimeLimit", _TRABAJADOR["tiempo"])
+            cargar_inicio_mip(modelo, construir_solucion_heuristica(sub), sub)
+            modelo.optimize()
+    except GurobiError as error:
+        fila.update({"status": "error", "error": str(error), "tiempo_total": time.perf_counter() - inicio})
+        return fila
+
+    fila.update({"status": modelo.status, "tiempo_solver": modelo.Runtime, "variables": modelo.NumVars,
+                 "restricciones": modelo.NumConstrs})
+    if modelo.SolCount > 0:
+        variables = modelo._variables
+        x = modelo.getAttr("X", list(variables["x"].values()))
+        phi = modelo.getAttr("X", list(variables["phi"].values()))
+        fila.update({
+            "objetivo": modelo.ObjVal,
+            "cota": modelo.ObjBound,
+            "gap": modelo.MIPGap,
+            "patrullas": sum(valor > 0.5 for valor in x),
+            "vehiculos_utilizados": sum(valor > 0.5 for valor in phi),
+        })
+    modelo.dispose()
+    fila["tiempo_total"] = time.perf_counter() - inicio
+    return fila
+
+
+def barrido_escenarios(parametros, escenarios, procesos=None, tiempo_limite=600, agregado=False,
+                       matricial=False, archivo=ARCHIVO_BARRIDO):
+    """
+    Resuelve todos los escenarios en paralelo y guarda la tabla consolidada.
+
+    Args:
+        parametros: dict retornado por cargar_parametros (se envía una vez a cada proceso del pool)
+        escenarios: lista de dicts para aplicar_escenario
+        procesos: solves concurrentes (por defecto min(escenarios, núcleos))
+        tiempo_limite: TimeLimit de Gurobi por escenario (segundos)
+
+    Returns:
+        DataFrame con una fila por escenario
+    """
+    nucleos = os.cpu_count() or 1
+    procesos = max(1, min(procesos or nucleos, len(escenarios), nucleos))
+    hilos = max(1, nucleos // procesos)
+    print(f"🧪 BARRIDO: {len(escenarios)} escenarios, {procesos} procesos × {hilos} threads de Gurobi")
+
+    filas = []
+    with ProcessPoolExecutor(max_workers=procesos, initializer=_inicializar_trabajador,
+                             initargs=(parametros, hilos, tiempo_limite, agregado, matricial)) as pool:
+        futuros = {pool.submit(resolver_escenario, escenario): escenario for escenario in escenarios}
+        for futuro in as_completed(futuros):
+            fila = futuro.result()
+            filas.append(fila)
+            objetivo = f"{fila['objetivo']:.6f}" if "objetivo" in fila else "sin solución"
+            print(f"   ✓ {futuros[futuro]} → {objetivo} ({fila['tiempo_total']:.1f} s, status {fila['status']})")
+
+    claves = list(escenarios[0]) if escenarios else []
+    tabla = pd.DataFrame(filas)
+    if claves:
+        tabla = tabla.sort_values(claves, ignore_index=True)
+    os.makedirs(os.path.dirname(archivo), exist_ok=True)
+    tabla.to_csv(archivo, index=False)
+    print(f"✅ Tabla consolidada guardada en {archivo}")
+    return tabla
+
+
+def _lista_numeros(valor):
+    return [float(v) for v in valor.split(",") if v.strip()]
+
+
+if __name__ == "__main__":
+    modo_testing = "cinco_zonas"
+    horizonte = "mensual"
+    zonas = None
+    grilla = {}
+    procesos = None
+    tiempo_limite = 600
+    agregado = False
+    matricial = False
+
+    argumentos = iter(sys.argv[1:])
+    for arg in argumentos:
+        if arg == "--kappa":
+            grilla["kappa"] = _lista_numeros(next(argumentos, ""))
+        elif arg == "--lambda":
+            grilla["lambda"] = _lista_numeros(next(argumentos, ""))
+        elif arg == "--presupuesto":
+            grilla["multiplicador_presupuesto"] = _lista_numeros(next(argumentos, ""))
+        elif arg == "--procesos":
+            procesos = int(next(argumentos, "1"))
+        elif arg == "--tiempo":
+            tiempo_limite = float(next(argumentos, "600"))
+        elif arg == "--testing":
+            modo_testing, horizonte = True, "testing"
+        elif arg == "--cinco-zonas":
+            modo_testing = "cinco_zonas"
+        elif arg == "--completo":
+            horizonte = "completo"
+        elif arg == "--zonas":
+            zonas = [int(z) for z in next(argumentos, "").split(",") if z.strip()]
+        elif arg == "--agregado":
+            agregado = True
+        elif arg == "--matricial":
+            matricial = True
+        else:
+            print(f"❌ Argumento desconocido: {arg}")
+            print("💡 Argumentos válidos: --kappa, --lambda, --presupuesto (listas separadas por coma), "
+                  "--procesos, --tiempo, --testing, --cinco-zonas, --completo, --zonas, --agregado, --matricial")
+            sys.exit(1)
+
+    if not grilla:
+        print("❌ Indica al menos una lista de valores: --kappa, --lambda o --presupuesto")
+        sys.exit(1)
+
+    parametros = cargar_parametros(modo_testing=modo_testing, horizonte=horizonte, zonas=zonas)
+    barrido_escenarios(parametros, generar_escenarios(grilla), procesos=procesos, tiempo_limite=tiempo_limite,
+                       agregado=agregado, matricial=matricial)
@@ -0,0 +1,215 @@
+"""
+CACHÉ PERSISTENTE DE MODELOS
+Guarda el modelo construido (MPS + índice de claves por familia), opcionalmente el
+modelo presolvido, y la última solución, bajo un hash del diccionario de parámetros,
+la formulación y FORMULACION_VERSION. Las corridas siguientes con los mismos datos
+leen el MPS en vez de reconstruir desde Python y parten desde la solución guardada.
+
+Cada entrada es una carpeta en resultados/cache_modelos/<clave>/; al superar el
+límite de tamaño se eliminan las entradas usadas hace más tiempo (LRU). El modelo
+presolvido (main.py --cache-presolvido) vive en la misma entrada, en un archivo
+por versión de Gurobi y parámetros de presolve, y cuenta para el mismo límite.
+"""
+
+import os
+import time
+import shutil
+import pickle
+import hashlib
+import numpy as np
+
+DIRECTORIO_CACHE_MODELOS = "resultados/cache_modelos"
+LIMITE_CACHE_MB = 2048
+# Claves de parámetros que no cambian el modelo (solo cómo se resuelve)
+CLAVES_EXCLUIDAS = ("ajustes_gurobi",)
+# Parámetros de Gurobi que cambian el modelo presolvido (entran en el nombre de su archivo)
+PARAMETROS_PRESOLVE = ("Presolve", "PrePasses", "Aggregate", "AggFill", "PreDual", "PreDepRow", "PreSparsify")
+
+
+def clave_modelo(parametros, agregado=False, ajustada=False):
+    """Hash de los parámetros que definen el modelo, la formulación y su versión"""
+    from modelo import FORMULACION_VERSION
+
+    h = hashlib.sha256()
+    datos = {clave: valor for clave, valor in parametros.items() if clave not in CLAVES_EXCLUIDAS}
+    h.update(pickle.dumps(datos, protocol=4))
+    h.update(repr((agregado, ajustada, FORMULACION_VERSION)).encode())
+    return h.hexdigest()[:32]
+
+
+def _ruta_entrada(parametros, agregado, directorio, ajustada=False):
+    return os.path.join(directorio, clave_modelo(parametros, agregado, ajustada))
+
+
+def archivo_presolvido(model):
+    """Nombre del MPS presolvido para la versión de Gurobi y los parámetros de presolve del modelo"""
+    import gurobipy as gp
+
+    valores = [model.getParamInfo(nombre)[2] for nombre in PARAMETROS_PRESOLVE]
+    clave = hashlib.sha256(repr((gp.gurobi.version(), valores)).encode()).hexdigest()[:12]
+    return f"presolvido_{clave}.mps"
+
+
+def _guardar_presolvido(model, entrada):
+    """Escribe el modelo presolvido en la entrada si aún no está; retorna True si lo escribió"""
+    from gurobipy import GurobiError
+
+    ruta = os.path.join(entrada, archivo_presolvido(model))
+    if os.path.exists(ruta):
+        return False
+    try:
+        reducido = model.presolve()
+        reducido.write(ruta)
+        reducido.dispose()
+    except GurobiError as error:
+        print(f"⚠️  No se pudo guardar el modelo presolvido: {error}")
+        return False
+    print(f"💾 Modelo presolvido guardado en caché ({os.path.basename(ruta)})")
+    return True
+
+
+def _tamano_mb(ruta):
+    total = 0
+    for raiz, _, archivos in os.walk(ruta):
+        total += sum(os.path.getsize(os.path.join(raiz, archivo)) for archivo in archivos)
+    return total / 2**20
+
+
+def _marcar_uso(entrada):
+    """Actualiza la marca de último uso de la entrada (orden LRU)"""
+    with open(os.path.join(entrada, "ultimo_uso"), "w") as archivo:
+        archivo.write(str(time.time()))
+
+
+def _ultimo_uso(entrada):
+    try:
+        return os.path.getmtime(os.path.join(entrada, "ultimo_uso"))
+    except OSError:
+        return 0.0
+
+
+def evictar(directorio=DIRECTORIO_CACHE_MODELOS, limite_mb=LIMITE_CACHE_MB, conservar=None):
+    """
+    Elimina las entradas menos usadas recientemente hasta quedar bajo limite_mb.
+
+    Args:
+        conservar: entrada que no se elimina aunque sea la más antigua (la recién escrita)
+    """
+    if not os.path.isdir(directorio):
+        return
+    entradas = [os.path.join(directorio, nombre) for nombre in os.listdir(directorio)]
+    entradas = sorted((e for e in entradas if os.path.isdir(e)), key=_ultimo_uso)
+    tamanos = {entrada: _tamano_mb(entrada) for entrada in entradas}
+    total = sum(tamanos.values())
+    for entrada in entradas:
+        if total <= limite_mb:
+            break
+        if entrada == conservar:
+            continue
+        shutil.rmtree(entrada, ignore_errors=True)
+        total -= tamanos[entrada]
+        print(f"🗑️  Caché de modelos: eliminada {os.path.basename(entrada)} ({tamanos[entrada]:.0f} MB)")
+
+
+def guardar_modelo_cache(model, parametros, agregado=False, presolvido=False,
+                         directorio=DIRECTORIO_CACHE_MODELOS, limite_mb=LIMITE_CACHE_MB, ajustada=False):
+    """
+    Escribe el modelo construido en la caché.
+
+    Args:
+        model: modelo retornado por construir_modelo (con model._variables)
+        presolvido: si True, guarda además el modelo presolvido (archivo_presolvido) para
+            inspeccionarlo o ajustar parámetros sobre él
+        limite_mb: tamaño máximo de la caché; se aplica LRU después de escribir
+    """
+    entrada = _ruta_entrada(parametros, agregado, directorio, ajustada)
+    temporal = entrada + ".tmp"
+    shutil.rmtree(temporal, ignore_errors=True)
+    os.makedirs(temporal)
+
+    model.update()
+    model.write(os.path.join(temporal, "modelo.mps"))
+    # Índice de columnas por familia (en el orden de creación) y filas R13 por (z, t)
+    indice = {
+        "familias": [(familia, list(variables.keys())) for familia, variables in model._variables.items()],
+        "R13": {clave: fila.index for clave, fila in getattr(model, "_restricciones", {}).get("R13", {}).items()},
+        "agregado": agregado,
+        "ajustada": ajustada,
+    }
+    with open(os.path.join(temporal, "indice.pkl"), "wb") as archivo:
+        pickle.dump(indice, archivo, protocol=pickle.HIGHEST_PROTOCOL)
+
+    if presolvido:
+        _guardar_presolvido(model, temporal)
+
+    shutil.rmtree(entrada, ignore_errors=True)
+    os.replace(temporal, entrada)
+    _marcar_uso(entrada)
+    print(f"💾 Modelo guardado en caché ({entrada}, {_tamano_mb(entrada):.0f} MB)")
+    evictar(directorio, limite_mb, conservar=entrada)
+
+
+def guardar_solucion_cache(model, parametros, agregado=False, directorio=DIRECTORIO_CACHE_MODELOS, ajustada=False):
+    """Guarda los valores de la solución actual (en el orden de columnas del modelo)"""
+    entrada = _ruta_entrada(parametros, agregado, directorio, ajustada)
+    if not os.path.isdir(entrada) or model.SolCount == 0:
+        return
+    valores = np.asarray(model.getAttr("X", model.getVars()), dtype=float)
+    np.save(os.path.join(entrada, "solucion.npy"), valores)
+    _marcar_uso(entrada)
+    print(f"💾 Solución guardada en caché ({entrada})")
+
+
+def cargar_modelo_cache(parametros, agregado=False, directorio=DIRECTORIO_CACHE_MODELOS, ajustada=False,
+                        presolvido=False, limite_mb=LIMITE_CACHE_MB):
+    """
+    Lee el modelo de la caché si existe una entrada para estos parámetros.
+
+    Reconstruye model._variables y model._restricciones desde el índice, aplica
+    configurar_parametros y, si hay una solución guardada, la carga como MIP start
+    (model._inicio_cache = True). Con presolvido=True escribe además el modelo
+    presolvido si la entrada no lo tiene para los parámetros de presolve actuales
+    (y vuelve a aplicar el límite LRU).
+
+    Returns:
+        Modelo listo para resolver, o None si no hay entrada
+    """
+    import gurobipy as gp
+    from modelo import configurar_parametros
+
+    entrada = _ruta_entrada(parametros, agregado, directorio, ajustada)
+    ruta_mps = os.path.join(entrada, "modelo.mps")
+    if not os.path.exists(ruta_mps):
+        return None
+
+    inicio = time.perf_counter()
+    with open(os.path.join(entrada, "indice.pkl"), "rb") as archivo:
+        indice = pickle.load(archivo)
+    model = gp.read(ruta_mps)
+    configurar_parametros(model, parametros.get("ajustes_gurobi"))
+
+    columnas = model.getVars()
+    variables, posicion = {}, 0
+    for familia, claves in indice["familias"]:
+        variables[familia] = gp.tupledict(zip(claves, columnas[posicion:posicion + len(claves)]))
+        posicion += len(claves)
+    filas = model.getConstrs()
+    model._variables = variables
+    model._restricciones = {"R13": {clave: filas[i] for clave, i in indice["R13"].items()}}
+    model._agregado = indice["agregado"]
+    model._ajustada = indice.get("ajustada", False)
+
+    model._inicio_cache = False
+    ruta_solucion = os.path.join(entrada, "solucion.npy")
+    if os.path.exists(ruta_solucion):
+        valores = np.load(ruta_solucion)
+        if len(valores) == len(columnas):
+            model.setAttr("Start", columnas, valores.tolist())
+            model._inicio_cache = True
+
+    _marcar_uso(entrada)
+    origen = "con solución previa como inicio" if model._inicio_cache else "sin solución previa"
+    print(f"⚡ Modelo cargado desde caché en {time.perf_counter() - inicio:.2f} s ({origen})")
+    if presolvido and _guardar_presolvido(model, entrada):
+        evictar(directorio, limite_mb, conservar=entrada)
+    return model
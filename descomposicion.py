@@ -0,0 +1,240 @@
+"""
+DESCOMPOSICIÓN POR ESTACIÓN (RELAJACIÓN LAGRANGEANA)
+Carabineros, vehículos y presupuestos pertenecen a una estación; las zonas solo se
+acoplan a través de la cobertura sum_p x[p,z,m,t] en R12-R14. Se introduce una copia
+s[z,m,t] de la cobertura, que es la que usan R12-R14, y se dualiza el acople
+s[z,m,t] <= sum_p x[p,z,m,t] con multiplicadores pi[z,m,t] >= 0:
+
+    L(pi) = min_zonas [sum zeta + sum pi·s] + sum_e min_estación_e [-sum pi·x]
+
+El problema de zonas es un LP pequeño; cada estación resuelve un MIP independiente
+(R1, R3-R11 de sus carabineros y vehículos, formulación agregada) en un pool de
+procesos. Los multiplicadores se actualizan por subgradiente (paso de Polyak) y la
+cobertura de las estaciones se repara con la heurística greedy para obtener un plan
+factible y una cota superior.
+"""
+
+import os
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from parametros import calcular_compatibilidad
+from heuristica import construir_solucion_heuristica, criminalidad_base, plan_factible
+from modelo_matricial import forma_matricial
+
+# Estado de cada proceso del pool: parámetros y modelos de estación ya construidos
+_TRABAJADOR = {}
+
+
+def subinstancia_estacion(parametros, e):
+    """Parámetros restringidos a los carabineros, vehículos y presupuesto de la estación e"""
+    sub = dict(parametros)
+    sub["C"] = [c for c in parametros["C"] if (c, e) in parametros["beta"]]
+    sub["P"] = [p for p in parametros["P"] if (p, e) in parametros["alpha"]]
+    sub["E"] = [e]
+    sub["P_e"] = {e: parametros["P_e"][e]}
+    return sub
+
+
+def _inicializar_trabajador(parametros, agregado, hilos, tiempo_estacion):
+    _TRABAJADOR.update({"parametros": parametros, "agregado": agregado, "hilos": hilos,
+                        "tiempo": tiempo_estacion, "modelos": {}})
+
+
+def _modelo_estacion(e):
+    """
+    MIP de la estación e: filas locales de forma_matricial (sin R12-R14) sobre las
+    columnas x, y|n y phi; el objetivo se fija en cada iteración con los precios pi.
+    """
+    import gurobipy as gp
+
+    parametros = _TRABAJADOR["parametros"]
+    forma = forma_matricial(subinstancia_estacion(parametros, e), agregado=_TRABAJADOR["agregado"])
+    n_local = forma["familias"]["u"]["inicio"]
+
+    modelo = gp.Model(f"estacion_{e}")
+    modelo.setParam("OutputFlag", 0)
+    modelo.setParam("Threads", _TRABAJADOR["hilos"])
+    modelo.setParam("TimeLimit", _TRABAJADOR["tiempo"])
+    modelo.setParam("MIPGap", 1e-4)
+    lb = np.concatenate([datos["lb"] for datos in forma["familias"].values()])[:n_local]
+    ub = np.concatenate([datos["ub"] for datos in forma["familias"].values()])[:n_local]
+    tipos = np.concatenate([np.full(len(datos["claves"]), datos["tipo"])
+                            for datos in forma["familias"].values()])[:n_local]
+    columnas = modelo.addMVar(n_local, lb=lb, ub=ub, vtype=tipos)
+    for nombre, A, sentido, rhs in forma["restricciones"]:
+        if nombre.startswith(("R12", "R13", "R14")):
+            continue
+        modelo.addMConstr(A[:, :n_local], columnas, sentido, rhs)
+
+    claves_x = forma["familias"]["x"]["claves"]
+    pos_z = {z: i for i, z in enumerate(parametros["Z"])}
+    pos_m = {m: i for i, m in enumerate(parametros["M"])}
+    pos_t = {t: i for i, t in enumerate(parametros["T"])}
+    indices = np.array([(pos_z[z], pos_m[m], pos_t[t]) for (_, z, m, t) in claves_x], dtype=np.int64).reshape(-1, 3)
+    return {"modelo": modelo, "x": columnas[:len(claves_x)], "claves_x": claves_x, "indices": indices}
+
+
+def _resolver_estacion(e, precios):
+    """Resuelve min -sum pi·x para la estación e; retorna (e, x activos, cota, valor)"""
+    modelos = _TRABAJADOR["modelos"]
+    if e not in modelos:
+        modelos[e] = _modelo_estacion(e)
+    datos = modelos[e]
+    modelo = datos["modelo"]
+    if not datos["claves_x"]:
+        return e, [], 0.0, 0.0
+    indices = datos["indices"]
+    datos["x"].Obj = -precios[indices[:, 0], indices[:, 1], indices[:, 2]]
+    modelo.optimize()
+    if modelo.SolCount == 0:
+        return e, [], modelo.ObjBound, 0.0
+    valores = datos["x"].X
+    activos = [datos["claves_x"][i] for i in np.flatnonzero(valores > 0.5)]
+    return e, activos, modelo.ObjBound, modelo.ObjVal
+
+
+class ProblemaZonas:
+    """LP de zonas: R12-R14 sobre la copia de cobertura s[z,m,t] con costo pi·s"""
+
+    def __init__(self, parametros, compat):
+        import gurobipy as gp
+        from gurobipy import GRB
+
+        Z, M, T = parametros["Z"], parametros["M"], parametros["T"]
+        lambda_, Gamma = parametros["lambda"], parametros["Gamma"]
+        zeta_init, u_anterior = parametros["zeta"], parametros.get("u_anterior")
+        base = criminalidad_base(parametros)
+
+        modelo = gp.Model("zonas")
+        modelo.setParam("OutputFlag", 0)
+        # Cada vehículo cubre a lo más una zona por turno: s acotada por los vehículos compatibles
+        s = modelo.addVars(Z, M, T, lb=0.0, name="s")
+        for (z, m, t) in s.keys():
+            s[z, m, t].ub = len(compat["vehiculos_por_zona"][z])
+        u = modelo.addVars(Z, M, T, lb=0.0, name="u")
+        zeta = modelo.addVars(Z, T, lb=0.0, ub=1.0, name="zeta")
+        modelo.setObjective(zeta.sum(), GRB.MINIMIZE)
+
+        modelo.addConstrs((s.sum(z, "*", t) >= parametros["kappa"] for z in Z for t in T), name="R12")
+        for z in Z:
+            for i, t in enumerate(T):
+                cobertura = s.sum(z, "*", t)
+                if i == 0 and u_anterior is None:
+                    anterior = zeta_init[z] + lambda_ * base[z]
+                elif i == 0:
+                    anterior = zeta_init[z] + 0.2 * base[z] + lambda_ * u_anterior[z]
+                else:
+                    anterior = zeta[z, T[i - 1]] + 0.2 * base[z] + lambda_ * u.sum(z, "*", T[i - 1])
+                modelo.addConstr(zeta[z, t] == anterior - Gamma * cobertura / 10, name=f"R13_{z}_{t}")
+        modelo.addConstrs((u[z, m, t] >= zeta[z, t] / 3 - s[z, m, t] for z in Z for m in M for t in T), name="R14")
+
+        self.modelo, self.s, self.zeta = modelo, s, zeta
+        self.forma = (len(Z), len(M), len(T))
+
+    def resolver(self, precios):
+        """Retorna (valor óptimo, suma de zeta, s como arreglo Z×M×T) o None si es infactible"""
+        variables = list(self.s.values())
+        self.modelo.setAttr("Obj", variables, precios.reshape(-1).tolist())
+        self.modelo.optimize()
+        if self.modelo.SolCount == 0:
+            return None
+        valores = np.array(self.modelo.getAttr("X", variables)).reshape(self.forma)
+        return self.modelo.ObjVal, sum(v.X for v in self.zeta.values()), valores
+
+
+def _cobertura(parametros, claves_x):
+    """Arreglo Z×M×T con sum_p x[p,z,m,t] para una lista de claves activas"""
+    pos_z = {z: i for i, z in enumerate(parametros["Z"])}
+    pos_m = {m: i for i, m in enumerate(parametros["M"])}
+    pos_t = {t: i for i, t in enumerate(parametros["T"])}
+    cobertura = np.zeros((len(parametros["Z"]), len(parametros["M"]), len(parametros["T"])))
+    for (_, z, m, t) in claves_x:
+        cobertura[pos_z[z], pos_m[m], pos_t[t]] += 1
+    return cobertura
+
+
+def resolver_descomposicion(parametros, iteraciones=30, procesos=None, agregado=True, tiempo_estacion=60,
+                            paso_inicial=1.0, reparar_cada=5, tolerancia=1e-3, plan_inicial=None):
+    """
+    Relajación lagrangeana por estación con subgradiente y reparación heurística.
+
+    Args:
+        parametros: dict retornado por cargar_parametros
+        iteraciones: máximo de iteraciones del subgradiente
+        procesos: procesos para los MIP de estación (por defecto, núcleos disponibles)
+        agregado: formulación agregada (n[e,k,p,m,t]) en los MIP de estación
+        tiempo_estacion: TimeLimit de cada MIP de estación (segundos)
+        paso_inicial: factor theta del paso de Polyak (se reduce a la mitad sin mejora)
+        reparar_cada: cada cuántas iteraciones se repara la cobertura en un plan factible
+        tolerancia: gap relativo para detenerse
+        plan_inicial: plan heurístico ya calculado (cota superior inicial)
+
+    Returns:
+        (plan, cota_inferior) con plan en el formato de construir_solucion_heuristica
+        (la mejor solución reparada) y la mejor cota lagrangeana
+    """
+    compat = calcular_compatibilidad(parametros)
+    estaciones = sorted({e for (p, e) in parametros["alpha"] if p in compat["carabineros_por_vehiculo"]})
+    zonas = ProblemaZonas(parametros, compat)
+
+    mejor_plan = plan_inicial or construir_solucion_heuristica(parametros)
+    cota_superior = mejor_plan["objetivo"] if plan_factible(mejor_plan) else None
+    cota_inferior = -np.inf
+    precios = np.zeros(zonas.forma)
+    theta, sin_mejora = paso_inicial, 0
+
+    nucleos = os.cpu_count() or 1
+    procesos = max(1, min(procesos or nucleos, len(estaciones), nucleos))
+    hilos = max(1, nucleos // procesos)
+    print(f"🧩 DESCOMPOSICIÓN: {len(estaciones)} estaciones, {len(parametros['Z'])} zonas, "
+          f"{procesos} procesos × {hilos} threads")
+    if cota_superior is not None:
+        print(f"   Cota superior inicial (heurística): {cota_superior:.6f}")
+
+    with ProcessPoolExecutor(max_workers=procesos, initializer=_inicializar_trabajador,
+                             initargs=(parametros, agregado, hilos, tiempo_estacion)) as pool:
+        for k in range(1, iteraciones + 1):
+            resultado_zonas = zonas.resolver(precios)
+            if resultado_zonas is None:
+                print("❌ El problema de zonas es infactible: la cobertura disponible no alcanza R12/zeta <= 1")
+                break
+            valor_zonas, _, s = resultado_zonas
+
+            claves_x, valor_estaciones = [], 0.0
+            for e, activos, cota, _ in pool.map(_resolver_estacion, estaciones, [precios] * len(estaciones)):
+                claves_x.extend(activos)
+                valor_estaciones += cota
+            lagrangeano = valor_zonas + valor_estaciones
+
+            if lagrangeano > cota_inferior + 1e-9:
+                cota_inferior, sin_mejora = lagrangeano, 0
+            else:
+                sin_mejora += 1
+                if sin_mejora >= 3:
+                    theta, sin_mejora = theta / 2, 0
+
+            if k % reparar_cada == 0 or k == iteraciones:
+                plan = construir_solucion_heuristica(parametros, plan_base={"x": claves_x, "y": []})
+                if plan_factible(plan) and (cota_superior is None or plan["objetivo"] < cota_superior):
+                    mejor_plan, cota_superior = plan, plan["objetivo"]
+
+            gap = (cota_superior - cota_inferior) / max(abs(cota_superior), 1e-9) if cota_superior is not None else np.inf
+            print(f"   it {k:3d}: L(pi) = {lagrangeano:.6f}, cota inferior {cota_inferior:.6f}, "
+                  f"cota superior {cota_superior if cota_superior is not None else float('nan'):.6f}, gap {gap:.2%}")
+            if gap <= tolerancia or theta < 1e-4:
+                break
+
+            # Subgradiente de s - sum_p x con paso de Polyak hacia la mejor cota superior
+            subgradiente = s - _cobertura(parametros, claves_x)
+            norma = float((subgradiente ** 2).sum())
+            if norma < 1e-12:
+                break
+            objetivo_paso = cota_superior if cota_superior is not None else lagrangeano + abs(lagrangeano) * 0.1 + 1.0
+            paso = theta * max(objetivo_paso - lagrangeano, 1e-6) / norma
+            precios = np.maximum(0.0, precios + paso * subgradiente)
+
+    if cota_superior is None:
+        print("⚠️  No se obtuvo un plan factible: se retorna la mejor reparación heurística")
+    else:
+        print(f"✅ Descomposición terminada: objetivo {cota_superior:.6f}, cota inferior {cota_inferior:.6f}")
+    return mejor_plan, cota_inferior
@@ -0,0 +1,294 @@
+"""
+ESTIMADOR PREVIO A LA CONSTRUCCIÓN
+Cuenta, a partir del diccionario de parámetros y sin construir el modelo, las
+variables, restricciones y no nulos exactos tras el filtro de compatibilidad (las
+mismas tuplas que crea construir_modelo), estima la memoria de construcción y de
+resolución y recomienda una estrategia (monolítico, horizonte rodante o
+descomposición) con los parámetros de memoria y threads de Gurobi para esta máquina.
+
+Uso:
+    python estimador.py [--cinco-zonas | --testing] [--completo] [--zonas 30,17,8] [--agregado]
+"""
+
+import os
+import sys
+from parametros import calcular_compatibilidad, clases_experiencia
+
+# Memoria por elemento, medida construyendo el modelo de 5 zonas (mensual y agregado):
+# objetos de Python del constructor (Var, LinExpr, tupledict) ...
+BYTES_PYTHON_VARIABLE = 545
+BYTES_PYTHON_NO_NULO = 84
+MB_PYTHON_BASE = 5
+# ... y el modelo dentro de Gurobi (leído desde MPS en un proceso limpio)
+BYTES_GUROBI_FILA_COLUMNA = 40
+BYTES_GUROBI_NO_NULO = 16
+# Durante la resolución conviven el modelo original, el presolvido, la factorización
+# del LP, cortes y heurísticas: regla conservadora de 4 veces el modelo (sin árbol B&B)
+FACTOR_RESOLUCION = 4
+# Fracción de la RAM disponible que se deja a Gurobi (MemLimit)
+FRACCION_RAM = 0.8
+# Ventanas candidatas del horizonte rodante (días resueltos, días comprometidos)
+VENTANAS_RODANTE = [(14, 7), (7, 3)]
+
+
+def contar_modelo(parametros, agregado=False, compat=None, ajustada=False):
+    """
+    Cuenta variables, restricciones y no nulos de construir_modelo sin construirlo.
+
+    Args:
+        parametros: dict retornado por cargar_parametros
+        agregado: contar la formulación agregada (n[e,k,p,m,t] en lugar de y)
+        compat: índice de calcular_compatibilidad ya calculado (opcional)
+        ajustada: contar la formulación ajustada (sin R4, R6, R7 ni R14_no_negativo; R9 por turno)
+
+    Returns:
+        dict con "variables" y "restricciones" por familia, "enteras", "continuas",
+        "total_variables", "total_restricciones" y "no_nulos"
+    """
+    P, E, Z, T, M = parametros["P"], parametros["E"], parametros["Z"], parametros["T"], parametros["M"]
+    compat = compat or calcular_compatibilidad(parametros)
+    P_activos = compat["P_activos"]
+    zonas_por_vehiculo = compat["zonas_por_vehiculo"]
+    vehiculos_por_zona = compat["vehiculos_por_zona"]
+    nT, nM = len(T), len(M)
+    turnos = nM * nT
+
+    # Términos de sum_z x[p,z,m,t] y de la tripulación sum y[.,p,m,t] por patrulla
+    n_zonas = {p: len(zonas_por_vehiculo[p]) for p in P_activos}
+    if agregado:
+        clases, estaciones_vehiculo = clases_experiencia(parametros, compat)
+        niveles_por_estacion = {}
+        for (e, k) in clases:
+            niveles_por_estacion[e] = niveles_por_estacion.get(e, 0) + 1
+        n_tripulacion = {p: sum(niveles_por_estacion.get(e, 0) for e in estaciones_vehiculo[p]) for p in P_activos}
+        vehiculos_por_clase = {(e, k): sum(e in estaciones_vehiculo[p] for p in P_activos) for (e, k) in clases}
+        filas_r1 = len(clases) * nT
+        no_nulos_r1 = sum(vehiculos_por_clase.values()) * turnos
+    else:
+        n_tripulacion = {p: len(compat["carabineros_por_vehiculo"][p]) for p in P_activos}
+        filas_r1 = len(compat["vehiculos_por_carabinero"]) * nT
+        no_nulos_r1 = sum(len(v) for v in compat["vehiculos_por_carabinero"].values()) * turnos
+
+    suma_zonas = sum(n_zonas.values())
+    suma_tripulacion = sum(n_tripulacion.values())
+    suma_vehiculos_zona = sum(len(vehiculos_por_zona[z]) for z in Z)
+    n_activos = len(P_activos)
+
+    variables = {
+        "x": suma_zonas * turnos,
+        "n" if agregado else "y": suma_tripulacion * turnos,
+        "phi": len(P) * nT,
+        "u": len(Z) * turnos,
+        "zeta": len(Z) * nT,
+    }
+
+    vehiculos_por_estacion = {}
+    for (p, e) in parametros["alpha"]:
+        vehiculos_por_estacion[e] = vehiculos_por_estacion.get(e, 0) + 1
+
+    restricciones, no_nulos = {}, {}
+    restricciones["R1"], no_nulos["R1"] = filas_r1, no_nulos_r1
+    for nombre in ("R3", "R8") if ajustada else ("R3", "R7", "R8"):
+        restricciones[nombre] = n_activos * turnos
+        no_nulos[nombre] = (suma_zonas + suma_tripulacion) * turnos
+    if not ajustada:
+        restricciones["R4"], no_nulos["R4"] = n_activos * turnos, suma_zonas * turnos
+    if not (agregado or ajustada):
+        # Una fila y[c,p,m,t] <= sum_z x[p,z,m,t] por cada y
+        restricciones["R6"] = variables["y"]
+        no_nulos["R6"] = sum(n_tripulacion[p] * (1 + n_zonas[p]) for p in P_activos) * turnos
+    if ajustada:
+        restricciones["R9"], no_nulos["R9"] = n_activos * turnos, (suma_zonas + n_activos) * turnos
+    else:
+        restricciones["R9"], no_nulos["R9"] = n_activos * nT, (nM * suma_zonas + n_activos) * nT
+    restricciones["R10"], no_nulos["R10"] = len(P) * nT, (len(P) + nM * suma_tripulacion) * nT
+    restricciones["R11"] = len(E)
+    no_nulos["R11"] = sum(vehiculos_por_estacion.get(e, 0) for e in E) * nT
+    restricciones["R12"], no_nulos["R12"] = len(Z) * nT, nM * suma_vehiculos_zona * nT
+    # R13: zeta[t] (y zeta[t-1] y los u del día anterior desde el segundo día) más la cobertura
+    restricciones["R13"] = len(Z) * nT
+    no_nulos["R13"] = len(Z) * nT + (len(Z) * (1 + nM)) * max(nT - 1, 0) + nM * suma_vehiculos_zona * nT
+    # R14: u, zeta y la cobertura del turno (más la fila u >= 0 si no es la ajustada)
+    restricciones["R14"] = (1 if ajustada else 2) * len(Z) * turnos
+    no_nulos["R14"] = ((2 if ajustada else 3) * len(Z) + suma_vehiculos_zona) * turnos
+
+    continuas = variables["u"] + variables["zeta"]
+    total_variables = sum(variables.values())
+    return {
+        "variables": variables,
+        "restricciones": restricciones,
+        "enteras": total_variables - continuas,
+        "continuas": continuas,
+        "total_variables": total_variables,
+        "total_restricciones": sum(restricciones.values()),
+        "no_nulos": sum(no_nulos.values()),
+    }
+
+
+def estimar_memoria(conteo):
+    """
+    Memoria estimada en GB de un conteo de contar_modelo.
+
+    Returns:
+        dict con "construccion" (objetos de Python del constructor), "modelo" (copia
+        en Gurobi) y "resolucion" (pico esperado del proceso al resolver, sin árbol B&B)
+    """
+    filas_columnas = conteo["total_variables"] + conteo["total_restricciones"]
+    construccion = (MB_PYTHON_BASE * 2**20 + BYTES_PYTHON_VARIABLE * conteo["total_variables"]
+                    + BYTES_PYTHON_NO_NULO * conteo["no_nulos"]) / 2**30
+    modelo = (BYTES_GUROBI_FILA_COLUMNA * filas_columnas + BYTES_GUROBI_NO_NULO * conteo["no_nulos"]) / 2**30
+    return {"construccion": construccion, "modelo": modelo, "resolucion": construccion + FACTOR_RESOLUCION * modelo}
+
+
+def recursos_maquina():
+    """RAM disponible en GB (MemAvailable de /proc/meminfo o RAM física) y núcleos"""
+    memoria = None
+    try:
+        with open("/proc/meminfo") as archivo:
+            for linea in archivo:
+                if linea.startswith("MemAvailable:"):
+                    memoria = int(linea.split()[1]) / 2**20
+                    break
+    except OSError:
+        pass
+    if memoria is None:
+        try:
+            memoria = os.sysconf("SC_PHYS_PAGES") * os.sysconf("SC_PAGE_SIZE") / 2**30
+        except (ValueError, OSError, AttributeError):
+            memoria = 8.0
+    return {"memoria_gb": memoria, "nucleos": os.cpu_count() or 1}
+
+
+def _ajustes_gurobi(memoria, presupuesto, hilos):
+    """MemLimit al presupuesto y nodos a disco solo con lo que sobre tras el modelo"""
+    libre = max(presupuesto - memoria["resolucion"], 0)
+    return {
+        "Threads": hilos,
+        "MemLimit": round(presupuesto, 2),
+        "NodefileStart": round(max(0.5, 0.5 * libre), 2),
+    }
+
+
+def recomendar_estrategia(parametros, agregado=False, memoria_gb=None, nucleos=None, ajustada=False):
+    """
+    Elige cómo resolver la instancia para que quepa en la memoria de la máquina.
+
+    Prueba, en orden: monolítico con la formulación pedida, monolítico agregado,
+    horizonte rodante (ventanas de VENTANAS_RODANTE) y descomposición por estación.
+    Se queda con la primera cuyo pico estimado de resolución cabe en FRACCION_RAM
+    de la RAM disponible.
+
+    Args:
+        parametros: dict retornado por cargar_parametros
+        agregado, ajustada: formulación pedida por el usuario
+        memoria_gb, nucleos: recursos a considerar (por defecto, los de esta máquina)
+
+    Returns:
+        dict con "estrategia" ("monolitico", "rodante" o "descomposicion"), "agregado",
+        "gurobi" (Threads, MemLimit, NodefileStart), "conteo", "memoria", "motivo" y,
+        según la estrategia, "ventana"/"paso" o "procesos"
+    """
+    recursos = recursos_maquina()
+    memoria_gb = memoria_gb or recursos["memoria_gb"]
+    nucleos = nucleos or recursos["nucleos"]
+    presupuesto = FRACCION_RAM * memoria_gb
+    compat = calcular_compatibilidad(parametros)
+
+    candidatos = [agregado] if agregado else [False, True]
+    for formulacion in candidatos:
+        conteo = contar_modelo(parametros, agregado=formulacion, compat=compat, ajustada=ajustada)
+        memoria = estimar_memoria(conteo)
+        if memoria["resolucion"] <= presupuesto:
+            motivo = "el modelo completo cabe en memoria"
+            if formulacion != agregado:
+                motivo += " con la formulación agregada"
+            return {"estrategia": "monolitico", "agregado": formulacion, "conteo": conteo, "memoria": memoria,
+                    "gurobi": _ajustes_gurobi(memoria, presupuesto, nucleos), "motivo": motivo}
+
+    # Horizonte rodante: solo cambia T, la compatibilidad es la misma
+    for ventana, paso in VENTANAS_RODANTE:
+        if ventana >= len(parametros["T"]):
+            continue
+        sub = dict(parametros)
+        sub["T"] = parametros["T"][:ventana]
+        conteo = contar_modelo(sub, agregado=candidatos[-1], compat=compat, ajustada=ajustada)
+        memoria = estimar_memoria(conteo)
+        if memoria["resolucion"] <= presupuesto:
+            return {"estrategia": "rodante", "agregado": candidatos[-1], "ventana": ventana, "paso": paso,
+                    "conteo": conteo, "memoria": memoria, "gurobi": _ajustes_gurobi(memoria, presupuesto, nucleos),
+                    "motivo": f"el modelo completo no cabe; una ventana de {ventana} días sí"}
+
+    # Descomposición: la estación más grande fija la memoria de cada proceso
+    from descomposicion import subinstancia_estacion
+    mayor = None
+    for e in parametros["E"]:
+        sub = subinstancia_estacion(parametros, e)
+        conteo = contar_modelo(sub, agregado=True)
+        if mayor is None or conteo["no_nulos"] > mayor["no_nulos"]:
+            mayor = conteo
+    memoria = estimar_memoria(mayor)
+    procesos = int(max(1, min(nucleos, len(parametros["E"]), presupuesto // max(memoria["resolucion"], 1e-3))))
+    motivo = "ni el modelo completo ni una ventana del horizonte rodante caben en memoria"
+    if memoria["resolucion"] > presupuesto:
+        motivo += " (⚠️ ni siquiera la estación más grande cabe: se usará disco para los nodos)"
+    return {"estrategia": "descomposicion", "agregado": True, "procesos": procesos, "conteo": mayor,
+            "memoria": memoria, "gurobi": _ajustes_gurobi(memoria, presupuesto / procesos, max(1, nucleos // procesos)),
+            "motivo": motivo}
+
+
+def mostrar_estimacion(conteo, memoria, recomendacion=None, recursos=None):
+    """Imprime el conteo, la memoria estimada y la recomendación"""
+    print("📐 ESTIMACIÓN PREVIA DEL MODELO")
+    print(f"   • Variables: {conteo['total_variables']:,} ({conteo['enteras']:,} enteras, "
+          f"{conteo['continuas']:,} continuas)")
+    for familia, cantidad in conteo["variables"].items():
+        print(f"      - {familia}: {cantidad:,}")
+    print(f"   • Restricciones: {conteo['total_restricciones']:,}")
+    print(f"   • No nulos: {conteo['no_nulos']:,}")
+    print(f"   • Memoria estimada: construcción {memoria['construccion']:.2f} GB, modelo en Gurobi "
+          f"{memoria['modelo']:.2f} GB, pico al resolver {memoria['resolucion']:.2f} GB")
+    if recursos:
+        print(f"   • Máquina: {recursos['memoria_gb']:.1f} GB disponibles, {recursos['nucleos']} núcleos")
+    if recomendacion:
+        detalle = ""
+        if recomendacion["estrategia"] == "rodante":
+            detalle = f" (ventanas de {recomendacion['ventana']} días comprometiendo {recomendacion['paso']})"
+        elif recomendacion["estrategia"] == "descomposicion":
+            detalle = f" ({recomendacion['procesos']} procesos)"
+        formulacion = "agregada" if recomendacion["agregado"] else "individual"
+        print(f"🧭 Recomendación: {recomendacion['estrategia']}{detalle}, formulación {formulacion} — "
+              f"{recomendacion['motivo']}")
+        print(f"   • Pico estimado de cada solve: {recomendacion['memoria']['resolucion']:.2f} GB")
+        ajustes = ", ".join(f"{nombre}={valor}" for nombre, valor in recomendacion["gurobi"].items())
+        print(f"   • Gurobi: {ajustes}")
+
+
+if __name__ == "__main__":
+    from parametros import cargar_parametros
+
+    modo_testing = "cinco_zonas"
+    horizonte = "mensual"
+    zonas = None
+    agregado = False
+
+    argumentos = iter(sys.argv[1:])
+    for arg in argumentos:
+        if arg == "--cinco-zonas":
+            modo_testing = "cinco_zonas"
+        elif arg == "--testing":
+            modo_testing, horizonte = True, "testing"
+        elif arg == "--completo":
+            horizonte = "completo"
+        elif arg == "--zonas":
+            zonas = [int(z) for z in next(argumentos, "").split(",") if z.strip()]
+        elif arg == "--agregado":
+            agregado = True
+        else:
+            print(f"❌ Argumento desconocido: {arg}")
+            print(__doc__)
+            sys.exit(1)
+
+    parametros = cargar_parametros(modo_testing=modo_testing, horizonte=horizonte, zonas=zonas)
+    recomendacion = recomendar_estrategia(parametros, agregado=agregado)
+    conteo = contar_modelo(parametros, agregado=agregado)
+    mostrar_estimacion(conteo, estimar_memoria(conteo), recomendacion, recursos_maquina())
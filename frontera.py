@@ -0,0 +1,262 @@
+"""
+FRONTERA DE PARETO COSTO - PELIGROSIDAD
+El objetivo del modelo es solo la peligrosidad (suma de zeta); el costo operativo
+O[v,t] aparece únicamente en el presupuesto por estación (R11). Este módulo traza la
+curva de compromiso entre ambos con el método epsilon-restricción: agrega al modelo
+una cota global de costo sum_{p,t} costo_diario[p,t]·phi[p,t] <= cota_costo y la
+recorre en K puntos entre el costo mínimo factible y el costo del plan de mínima
+peligrosidad.
+
+El modelo se construye una sola vez: entre puntos solo cambia el lado derecho de la
+cota, y los puntos se resuelven de menor a mayor costo para que el plan del punto
+anterior siga siendo factible y sirva de inicio (Start) del siguiente. Con frio=True
+cada punto se resuelve desde cero, para comparar tiempos.
+
+Uso:
+    python frontera.py [--testing | --cinco-zonas] [--zonas 30,17,8] [--puntos 8] [--agregado]
+        [--ajustada] [--matricial] [--tiempo 600] [--gap 0.01] [--frio] [--destino resultados/frontera]
+
+Resultado: <destino>/frontera.csv con un punto por fila (cota, costo y peligrosidad del
+plan, gap, tiempo) y el plan de cada punto en <destino>/punto_<k> (mismo formato que
+guardar_resultados; la columna "plan" de la tabla apunta a ese directorio).
+"""
+
+import os
+import sys
+import time
+import contextlib
+import numpy as np
+import pandas as pd
+from heuristica import construir_solucion_heuristica, cargar_inicio_mip
+from resultados import extraer_solucion, tabla_desde_claves, guardar_resultados
+
+DIRECTORIO_FRONTERA = "resultados/frontera"
+COLUMNAS = ["punto", "cota_costo", "costo", "peligrosidad", "cota", "gap", "tiempo", "nodos", "status", "plan"]
+
+
+def costos_vehiculo_dia(parametros):
+    """Costo diario de activar cada vehículo: {(p, t): sum_v w[p,v]·O[v,t]} (el mismo de R11)"""
+    w, O = parametros["w"], parametros["O"]
+    V = parametros["V"]
+    return {(p, t): sum(w.get((p, v), 0) * O.get((v, t), 0) for v in V)
+            for p in parametros["P"] for t in parametros["T"]}
+
+
+def _resolver_punto(modelo, inicio=None):
+    """Optimiza con inicio opcional (valores de todas las variables) y retorna los valores finales"""
+    from gurobipy import GRB
+
+    modelo.update()
+    variables = modelo.getVars()
+    if inicio is not None:
+        modelo.setAttr("Start", variables, inicio)
+    modelo.optimize()
+    if modelo.SolCount == 0:
+        return None
+    status = modelo.status
+    return {
+        "valores": modelo.getAttr("X", variables),
+        "objetivo": modelo.ObjVal,
+        "cota": modelo.ObjBound,
+        "gap": modelo.MIPGap,
+        "tiempo": modelo.Runtime,
+        "nodos": int(modelo.NodeCount),
+        "status": "optimo" if status == GRB.OPTIMAL else ("limite_tiempo" if status == GRB.TIME_LIMIT
+                                                            else f"status_{status}"),
+    }
+
+
+def _limpiar_inicio(modelo):
+    """Descarta la solución previa y el Start de todas las variables (resolución en frío)"""
+    from gurobipy import GRB
+    modelo.reset(0)
+    variables = modelo.getVars()
+    modelo.setAttr("Start", variables, [GRB.UNDEFINED] * len(variables))
+
+
+def _tablas_punto(modelo, parametros):
+    """Tablas del plan actual; en la formulación agregada reconstruye y desde la dotación n"""
+    from parametros import asignar_carabineros
+
+    tablas = extraer_solucion(modelo)
+    if modelo._agregado:
+        n = tablas["n"][tablas["n"]["valor"] > 0.5]
+        dotacion = dict(zip(n[["e", "k", "p", "m", "t"]].itertuples(index=False, name=None), n["valor"]))
+        tablas["y"] = tabla_desde_claves("y", asignar_carabineros(parametros, dotacion))
+    return tablas
+
+
+def frontera_pareto(parametros, puntos=8, agregado=False, ajustada=False, matricial=False, tiempo_limite=600,
+                    gap=None, hilos=None, frio=False, directorio=DIRECTORIO_FRONTERA):
+    """
+    Traza la frontera costo - peligrosidad con un solo modelo.
+
+    Primero resuelve los dos extremos: mínima peligrosidad sin cota de costo y, entre
+    esos planes, el de menor costo (extremo superior), y mínimo costo (el extremo
+    inferior). Luego recorre
+    `puntos` cotas equiespaciadas de menor a mayor; el último punto es el de mínima
+    peligrosidad y se reutiliza sin volver a resolver.
+
+    Args:
+        puntos: número de puntos de la frontera (K >= 2)
+        tiempo_limite, gap, hilos: TimeLimit, MIPGap y Threads de Gurobi por resolución
+        frio: si True, cada punto parte sin inicio (para medir el ahorro del arranque en caliente)
+
+    Returns:
+        DataFrame con una fila por punto (columnas COLUMNAS)
+    """
+    from gurobipy import LinExpr
+    from modelo import construir_modelo
+
+    inicio_total = time.perf_counter()
+    puntos = max(2, int(puntos))
+    print("🔧 Construyendo modelo...")
+    with open(os.devnull, "w") as nulo, contextlib.redirect_stdout(nulo):
+        modelo = construir_modelo(parametros, agregado=agregado, matricial=matricial, ajustada=ajustada)
+    modelo.setParam("OutputFlag", 0)
+    modelo.setParam("TimeLimit", tiempo_limite)
+    if gap is not None:
+        modelo.setParam("MIPGap", gap)
+    if hilos is not None:
+        modelo.setParam("Threads", hilos)
+
+    # Cota global de costo: se agrega holgada y solo se cambia su RHS entre puntos
+    phi = modelo._variables["phi"]
+    costo_diario = costos_vehiculo_dia(parametros)
+    claves = [clave for clave in phi.keys() if costo_diario.get(clave, 0) != 0]
+    coeficientes = [costo_diario[clave] for clave in claves]
+    costo = LinExpr(coeficientes, [phi[clave] for clave in claves])
+    costo_maximo = float(sum(coeficientes))
+    limite = modelo.addConstr(costo <= costo_maximo + 1, name="R_costo_total")
+    modelo.update()
+    peligrosidad = modelo.getObjective()
+    cargar_inicio_mip(modelo, construir_solucion_heuristica(parametros), parametros)
+
+    print("📉 Extremo de mínima peligrosidad...")
+    minima_peligrosidad = _resolver_punto(modelo)
+    if minima_peligrosidad is None:
+        print("❌ El modelo no tiene solución factible")
+        return pd.DataFrame(columns=COLUMNAS)
+
+    # Lexicográfico: entre los planes de mínima peligrosidad, el de menor costo; sin este
+    # paso el extremo superior tomaría el costo arbitrario del primer plan óptimo
+    modelo.setObjective(costo)
+    tolerancia = 1e-6 * max(1.0, abs(minima_peligrosidad["objetivo"]))
+    tope_peligrosidad = modelo.addConstr(peligrosidad <= minima_peligrosidad["objetivo"] + tolerancia)
+    if frio:
+        _limpiar_inicio(modelo)
+    lexicografico = _resolver_punto(modelo, None if frio else minima_peligrosidad["valores"])
+    if lexicografico is not None:
+        extremo = {**minima_peligrosidad, "valores": lexicografico["valores"], "objetivo": peligrosidad.getValue(),
+                   "tiempo": minima_peligrosidad["tiempo"] + lexicografico["tiempo"],
+                   "nodos": minima_peligrosidad["nodos"] + lexicografico["nodos"]}
+    else:
+        # Sin solución en el tiempo límite: se conserva el plan de mínima peligrosidad
+        _resolver_punto(modelo, minima_peligrosidad["valores"])
+        extremo = minima_peligrosidad
+    tablas_extremo, costo_superior = _tablas_punto(modelo, parametros), costo.getValue()
+    modelo.remove(tope_peligrosidad)
+    print(f"   ✓ peligrosidad {extremo['objetivo']:.6f}, costo {costo_superior:,.0f} ({extremo['tiempo']:.1f} s)")
+
+    print("💰 Extremo de mínimo costo...")
+    if frio:
+        _limpiar_inicio(modelo)
+    minimo_costo = _resolver_punto(modelo, None if frio else extremo["valores"])
+    costo_inferior = minimo_costo["objetivo"] if minimo_costo is not None else costo_superior
+    modelo.setObjective(peligrosidad)
+    print(f"   ✓ costo {costo_inferior:,.0f} ({minimo_costo['tiempo'] if minimo_costo else 0:.1f} s)")
+
+    cotas = np.linspace(costo_inferior, costo_superior, puntos)
+    if costo_superior - costo_inferior <= 1e-9 * max(1.0, abs(costo_superior)):
+        print("   ⚠️  Costo constante entre los extremos: la frontera es un solo punto")
+        cotas = cotas[-1:]
+
+    os.makedirs(directorio, exist_ok=True)
+    metadatos_base = {"agregado": agregado, "ajustada": ajustada, "matricial": matricial, "frio": frio}
+    filas = []
+    anterior = minimo_costo["valores"] if minimo_costo is not None else None
+    print(f"📈 Recorriendo {len(cotas)} puntos de la frontera{' (en frío)' if frio else ''}...")
+    for k, cota_costo in enumerate(cotas):
+        if k == len(cotas) - 1:
+            # La cota más holgada es el extremo de mínima peligrosidad, ya resuelto
+            resultado, tablas, costo_plan = extremo, tablas_extremo, costo_superior
+        else:
+            limite.RHS = float(cota_costo)
+            if frio:
+                _limpiar_inicio(modelo)
+            resultado = _resolver_punto(modelo, None if frio else anterior)
+            if resultado is None:
+                filas.append({"punto": k, "cota_costo": cota_costo, "status": "sin_solucion"})
+                print(f"   ✗ punto {k}: cota {cota_costo:,.0f} sin solución")
+                continue
+            tablas, costo_plan = _tablas_punto(modelo, parametros), costo.getValue()
+            anterior = resultado["valores"]
+
+        ruta = os.path.join(directorio, f"punto_{k}")
+        with open(os.devnull, "w") as nulo, contextlib.redirect_stdout(nulo):
+            guardar_resultados(tablas, resultado["objetivo"], modelo.NumVars, directorio=ruta,
+                               metadatos={**metadatos_base, "punto": k, "cota_costo": float(cota_costo),
+                                          "costo": costo_plan, "gap": resultado["gap"],
+                                          "status": resultado["status"]})
+        filas.append({"punto": k, "cota_costo": float(cota_costo), "costo": costo_plan,
+                      "peligrosidad": resultado["objetivo"], "cota": resultado["cota"], "gap": resultado["gap"],
+                      "tiempo": resultado["tiempo"], "nodos": resultado["nodos"], "status": resultado["status"],
+                      "plan": ruta})
+        print(f"   ✓ punto {k}: costo {costo_plan:,.0f} (cota {cota_costo:,.0f}) → peligrosidad "
+              f"{resultado['objetivo']:.6f}, gap {resultado['gap']:.2%}, {resultado['tiempo']:.1f} s")
+
+    tabla = pd.DataFrame(filas, columns=COLUMNAS)
+    tabla.to_csv(os.path.join(directorio, "frontera.csv"), index=False)
+    tiempo_solver = (minimo_costo["tiempo"] if minimo_costo else 0) + tabla["tiempo"].fillna(0).sum()
+    print(f"✅ Frontera guardada en {directorio}/frontera.csv "
+          f"(solver {tiempo_solver:.1f} s, total {time.perf_counter() - inicio_total:.1f} s)")
+    modelo.dispose()
+    return tabla
+
+
+if __name__ == "__main__":
+    from parametros import cargar_parametros
+
+    modo_testing, horizonte = "cinco_zonas", "mensual"
+    zonas = None
+    puntos = 8
+    agregado = ajustada = matricial = frio = False
+    tiempo_limite, gap, hilos = 600, None, None
+    destino = DIRECTORIO_FRONTERA
+
+    argumentos = iter(sys.argv[1:])
+    for arg in argumentos:
+        if arg == "--testing":
+            modo_testing, horizonte = True, "testing"
+        elif arg == "--cinco-zonas":
+            modo_testing = "cinco_zonas"
+        elif arg == "--completo":
+            horizonte = "completo"
+        elif arg == "--zonas":
+            zonas = [int(z) for z in next(argumentos, "").split(",") if z.strip()]
+        elif arg == "--puntos":
+            puntos = int(next(argumentos, "8"))
+        elif arg == "--agregado":
+            agregado = True
+        elif arg == "--ajustada":
+            ajustada = True
+        elif arg == "--matricial":
+            matricial = True
+        elif arg == "--tiempo":
+            tiempo_limite = float(next(argumentos, "600"))
+        elif arg == "--gap":
+            gap = float(next(argumentos, "0.01"))
+        elif arg == "--hilos":
+            hilos = int(next(argumentos, "1"))
+        elif arg == "--frio":
+            frio = True
+        elif arg == "--destino":
+            destino = next(argumentos, destino)
+        else:
+            print(f"❌ Argumento desconocido: {arg}")
+            print(__doc__)
+            sys.exit(1)
+
+    parametros = cargar_parametros(modo_testing=modo_testing, horizonte=horizonte, zonas=zonas)
+    frontera_pareto(parametros, puntos=puntos, agregado=agregado, ajustada=ajustada, matricial=matricial,
+                    tiempo_limite=tiempo_limite, gap=gap, hilos=hilos, frio=frio, directorio=destino)
@@ -0,0 +1,288 @@
+"""
+HEURÍSTICA CONSTRUCTIVA GREEDY
+Construye un plan factible (x, y, phi) directamente desde los parámetros, sin
+solver: sirve como solución inicial (MIP start) para Gurobi y como plan utilizable
+por sí solo cuando no hay licencia disponible.
+"""
+
+import math
+from parametros import calcular_compatibilidad
+
+EXPERIENCIA_MINIMA = 4  # R3
+
+
+def criminalidad_base(parametros):
+    """Peligrosidad estructural de cada zona: sum_d I[d,z]·IDD[d]"""
+    I, IDD = parametros["I"], parametros["IDD"]
+    return {z: sum(I.get((d, z), 0) * IDD[d] for d in parametros["D"]) for z in parametros["Z"]}
+
+
+def _zeta_dia(parametros, base, zeta_previo, u_previo, primero, cobertura_zt):
+    """zeta[z,t] según R13 dado el estado del día anterior (u_previo = sum_m u[z,m,t-1])"""
+    lambda_, Gamma = parametros["lambda"], parametros["Gamma"]
+    if primero and u_previo is None:
+        return zeta_previo + lambda_ * base - Gamma * cobertura_zt / 10
+    return zeta_previo + 0.2 * base + lambda_ * u_previo - Gamma * cobertura_zt / 10
+
+
+def calcular_peligrosidad(parametros, cobertura):
+    """
+    Recorre las recurrencias R13/R14 para una cobertura dada.
+
+    u toma el menor valor factible: max(0, zeta/3 - cobertura) y, si la cobertura
+    llevaría zeta del día siguiente bajo 0, el exceso necesario para mantener zeta >= 0
+    (u no tiene cota superior en el modelo y actúa como holgura de R13).
+
+    Args:
+        cobertura: dict {(z, m, t): número de patrullas}
+
+    Returns:
+        (zeta, u) como dicts {(z, t): valor} y {(z, m, t): valor}
+    """
+    Z, M, T = parametros["Z"], parametros["M"], parametros["T"]
+    lambda_ = parametros["lambda"]
+    base = criminalidad_base(parametros)
+    u_anterior = parametros.get("u_anterior") or {}
+    zeta, u = {}, {}
+    for z in Z:
+        zeta_previo, u_previo = parametros["zeta"][z], u_anterior.get(z)
+        for i, t in enumerate(T):
+            cobertura_zt = sum(cobertura.get((z, m, t), 0) for m in M)
+            valor = _zeta_dia(parametros, base[z], zeta_previo, u_previo, i == 0, cobertura_zt)
+            if valor < 0 and i > 0:
+                u[z, M[0], T[i - 1]] += -valor / lambda_
+                valor = 0.0
+            zeta[z, t] = valor
+            for m in M:
+                u[z, m, t] = max(0.0, valor / 3 - cobertura.get((z, m, t), 0))
+            zeta_previo, u_previo = valor, sum(u[z, m, t] for m in M)
+    return zeta, u
+
+
+def _elegir_tripulacion(disponibles, q, capacidad):
+    """
+    Tripulación mínima con experiencia total >= 4 y tamaño <= capacidad.
+
+    Prefiere un solo carabinero con la menor experiencia suficiente, para reservar
+    a los más experimentados; si no existe, suma los más experimentados.
+    """
+    suficientes = [c for c in disponibles if q[c] >= EXPERIENCIA_MINIMA]
+    if suficientes:
+        return [min(suficientes, key=lambda c: q[c])]
+    tripulacion, experiencia = [], 0
+    for c in sorted(disponibles, key=lambda c: -q[c]):
+        if len(tripulacion) >= capacidad:
+            break
+        tripulacion.append(c)
+        experiencia += q[c]
+        if experiencia >= EXPERIENCIA_MINIMA:
+            return tripulacion
+    return None
+
+
+def construir_solucion_heuristica(parametros, plan_base=None):
+    """
+    Asigna patrullas día a día priorizando las zonas más peligrosas (I·IDD).
+
+    Respeta la pertenencia a estación (R2), compatibilidad vehículo-zona (R5),
+    experiencia mínima (R3), capacidad R_v (R8), un turno por vehículo (R4), una
+    asignación diaria por carabinero (R1) y el presupuesto por estación (R11).
+
+    Args:
+        parametros: dict retornado por cargar_parametros
+        plan_base: dict opcional {"x": [(p,z,m,t)], "y": [(c,p,m,t)]} con patrullas que
+            se intentan conservar primero (se descartan las que violan alguna restricción)
+
+    Returns:
+        dict con "x", "y", "phi" (listas de claves activas), "zeta", "u" (dicts de valores),
+        "objetivo" y "faltantes" ({(z, t): patrullas que no se pudieron asignar para R12})
+    """
+    Z, M, T, V = parametros["Z"], parametros["M"], parametros["T"], parametros["V"]
+    q, w, O, R_v = parametros["q"], parametros["w"], parametros["O"], parametros["R_v"]
+    alpha, P_e = parametros["alpha"], parametros["P_e"]
+    compat = calcular_compatibilidad(parametros)
+    vehiculos_por_zona = compat["vehiculos_por_zona"]
+    carabineros_por_vehiculo = compat["carabineros_por_vehiculo"]
+
+    capacidad = {p: sum(R_v[v] * w.get((p, v), 0) for v in V) for p in compat["P_activos"]}
+    costo = {(p, t): sum(w.get((p, v), 0) * O.get((v, t), 0) for v in V)
+             for p in compat["P_activos"] for t in T}
+    estacion = {p: e for (p, e) in alpha}
+    saldo = dict(P_e)
+
+    base = criminalidad_base(parametros)
+    u_anterior = parametros.get("u_anterior") or {}
+    zonas_prioridad = sorted(Z, key=lambda z: -base[z])
+    requeridas = math.ceil(parametros["kappa"])
+
+    x, y, phi = [], [], set()
+    ocupado_turno = set()    # (p, m, t) ya asignados (R4)
+    ocupado_dia = set()      # (c, t) ya asignados (R1)
+    cobertura = {}
+    # Dentro de un día los turnos, el saldo y los carabineros libres solo se consumen: un
+    # vehículo sin turnos, sin presupuesto o sin tripulación posible no vuelve a servir ese
+    # día, y se descarta de los candidatos en vez de reintentarlo en cada ronda
+    agotados = set()         # (p, t)
+    libres = {}              # (p, t) -> carabineros compatibles aún libres ese día
+
+    def disponibles_dia(p, t):
+        # Se compacta al usarla: cada carabinero sale de la lista una sola vez por día
+        lista = [c for c in libres.get((p, t), carabineros_por_vehiculo[p]) if (c, t) not in ocupado_dia]
+        libres[p, t] = lista
+        return lista
+
+    def zona_admite(z, t):
+        if t != T[0]:
+            return True
+        # El primer día no tiene holgura u previa: la cobertura no puede llevar zeta bajo 0
+        cobertura_zt = sum(cobertura.get((z, turno, t), 0) for turno in M) + 1
+        return _zeta_dia(parametros, base[z], parametros["zeta"][z], u_anterior.get(z), True, cobertura_zt) >= 0
+
+    def asignar(p, z, m, t, tripulacion=None):
+        if (p, t) in agotados or (p, m, t) in ocupado_turno or z not in compat["zonas_por_vehiculo"].get(p, ()):
+            return False
+        if not zona_admite(z, t):
+            return False
+        activar = (p, t) not in phi
+        e = estacion.get(p)
+        if activar and (e not in saldo or saldo[e] < costo[p, t]):
+            agotados.add((p, t))
+            return False
+        disponibles = disponibles_dia(p, t)
+        if tripulacion is not None:
+            tripulacion = [c for c in tripulacion if c in disponibles]
+            if (not tripulacion or len(tripulacion) > capacidad[p]
+                    or sum(q[c] for c in tripulacion) < EXPERIENCIA_MINIMA):
+                tripulacion = None
+        if tripulacion is None:
+            tripulacion = _elegir_tripulacion(disponibles, q, capacidad[p])
+        if tripulacion is None:
+            agotados.add((p, t))
+            return False
+        if activar:
+            phi.add((p, t))
+            saldo[e] -= costo[p, t]
+        ocupado_turno.add((p, m, t))
+        if all((p, turno, t) in ocupado_turno for turno in M):
+            agotados.add((p, t))
+        x.append((p, z, m, t))
+        for c in tripulacion:
+            ocupado_dia.add((c, t))
+            y.append((c, p, m, t))
+        cobertura[z, m, t] = cobertura.get((z, m, t), 0) + 1
+        return True
+
+    # Conservar primero las patrullas del plan base que sigan siendo factibles
+    if plan_base:
+        tripulaciones = {}
+        for (c, p, m, t) in plan_base.get("y", []):
+            tripulaciones.setdefault((p, m, t), []).append(c)
+        for (p, z, m, t) in plan_base.get("x", []):
+            if t in T and z in Z:
+                asignar(p, z, m, t, tripulaciones.get((p, m, t)))
+
+    # Estado de R13 por zona para estimar zeta del día en curso
+    zeta_previo = {z: parametros["zeta"][z] for z in Z}
+    u_previo = {z: u_anterior.get(z) for z in Z}
+
+    orden_costo = {}         # (z, t) -> (vehículos de la zona por costo del día sin los agotados, len(agotados))
+
+    def asignar_en_zona(z, t):
+        """Primera patrulla factible en el orden turnos × candidatos; False si la zona no admite más"""
+        if not zona_admite(z, t):
+            return False
+        # Candidatos: primero los vehículos ya activos ese día (sin costo adicional) y luego
+        # los más baratos. El costo no cambia en el día: se ordena una vez por zona y se
+        # recorre en dos pasadas (activos, inactivos) hasta la primera asignación
+        orden, compactado = orden_costo.get((z, t)) or (sorted(vehiculos_por_zona[z], key=lambda p: costo[p, t]), -1)
+        if compactado != len(agotados):
+            # Solo se recompacta si hay vehículos agotados nuevos desde la última vez
+            orden = [p for p in orden if (p, t) not in agotados]
+            orden_costo[z, t] = (orden, len(agotados))
+        for m in turnos(z, t):
+            for activo in (True, False):
+                for p in orden:
+                    if (((p, t) in phi) == activo and (p, m, t) not in ocupado_turno
+                            and (p, t) not in agotados and asignar(p, z, m, t)):
+                        return True
+        return False
+
+    def turnos(z, t):
+        # Repartir las patrullas de la zona entre turnos, empezando por el menos cubierto
+        return sorted(M, key=lambda m: (cobertura.get((z, m, t), 0), m))
+
+    def zeta_hoy(z, i, t):
+        cobertura_zt = sum(cobertura.get((z, m, t), 0) for m in M)
+        return _zeta_dia(parametros, base[z], zeta_previo[z], u_previo[z], i == 0, cobertura_zt)
+
+    faltantes = {}
+    for i, t in enumerate(T):
+        agotadas = set()
+        # Rondas: en cada una, las zonas más peligrosas eligen primero una patrulla más
+        for ronda in range(requeridas):
+            for z in zonas_prioridad:
+                if z in agotadas or sum(cobertura.get((z, m, t), 0) for m in M) >= requeridas:
+                    continue
+                if not asignar_en_zona(z, t):
+                    agotadas.add(z)
+        for z in agotadas:
+            faltantes[z, t] = requeridas - sum(cobertura.get((z, m, t), 0) for m in M)
+
+        # Patrullas extra donde zeta superaría su cota superior de 1
+        for z in zonas_prioridad:
+            while zeta_hoy(z, i, t) > 1 and asignar_en_zona(z, t):
+                pass
+            valor = zeta_hoy(z, i, t)
+            if i > 0:
+                valor = max(valor, 0.0)
+            zeta_previo[z] = valor
+            u_previo[z] = sum(max(0.0, valor / 3 - cobertura.get((z, m, t), 0)) for m in M)
+
+    zeta, u = calcular_peligrosidad(parametros, cobertura)
+    return {
+        "x": x, "y": y, "phi": sorted(phi),
+        "zeta": zeta, "u": u,
+        "objetivo": sum(zeta.values()),
+        "faltantes": faltantes,
+    }
+
+
+def plan_factible(plan):
+    """True si el plan cumple la cobertura mínima R12 y 0 <= zeta <= 1 en todos los días"""
+    valores = plan["zeta"].values()
+    return not plan["faltantes"] and -1e-6 <= min(valores, default=0.0) and max(valores, default=0.0) <= 1 + 1e-6
+
+
+def valores_plan(plan, parametros, variables):
+    """
+    Valores de un plan por familia de variables del modelo: {familia: {clave: valor}}.
+
+    En la formulación agregada, las tripulaciones se traducen a conteos n[e,k,p,m,t];
+    las claves ausentes valen 0.
+    """
+    valores = {"x": dict.fromkeys(plan["x"], 1.0), "phi": dict.fromkeys(plan["phi"], 1.0),
+               "zeta": plan["zeta"], "u": plan["u"]}
+    if "n" in variables:
+        conteos = {}
+        q = parametros["q"]
+        estacion = {c: e for (c, e) in parametros["beta"]}
+        for (c, p, m, t) in plan["y"]:
+            clave = (estacion[c], q[c], p, m, t)
+            conteos[clave] = conteos.get(clave, 0) + 1
+        valores["n"] = conteos
+    else:
+        valores["y"] = dict.fromkeys(plan["y"], 1.0)
+    return valores
+
+
+def cargar_inicio_mip(modelo, plan, parametros):
+    """
+    Carga un plan completo como MIP start (todas las variables reciben valor).
+
+    En la formulación agregada, las tripulaciones se traducen a conteos n[e,k,p,m,t].
+    """
+    variables = modelo._variables
+    for familia, fijados in valores_plan(plan, parametros, variables).items():
+        tupledict = variables[familia]
+        claves = list(tupledict.keys())
+        modelo.setAttr("Start", list(tupledict.values()), [fijados.get(clave, 0.0) for clave in claves])
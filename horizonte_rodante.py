@@ -0,0 +1,127 @@
+"""
+HORIZONTE RODANTE PARA PLANES LARGOS
+Resuelve el horizonte en ventanas solapadas (p.ej. 14 días comprometiendo 7) para
+acotar la memoria del modelo en el horizonte "completo" de 365 días.
+"""
+
+import pandas as pd
+from gurobipy import GRB
+from modelo import construir_modelo
+from parametros import asignar_carabineros
+from resultados import extraer_solucion, tabla_desde_claves
+
+
+def _subproblema_ventana(parametros, dias, estado, presupuesto_restante, dias_restantes):
+    """Copia de los parámetros restringida a los días de la ventana"""
+    sub = dict(parametros)
+    sub["T"] = dias
+    sub["O"] = {(v, t): costo for (v, t), costo in parametros["O"].items() if t in dias}
+    sub["zeta"] = dict(estado["zeta"])
+    if estado["u"] is not None:
+        sub["u_anterior"] = dict(estado["u"])
+    # R11 prorrateada: la ventana recibe la fracción del saldo que le corresponde por días
+    fraccion = min(1.0, len(dias) / dias_restantes)
+    sub["P_e"] = {e: max(saldo, 0.0) * fraccion for e, saldo in presupuesto_restante.items()}
+    return sub
+
+
+def _cargar_inicio(modelo, inicio):
+    """Usa la cola de la ventana anterior como solución inicial (MIP start)"""
+    for familia, tabla in inicio.items():
+        variables = modelo._variables.get(familia)
+        if variables is None or tabla.empty:
+            continue
+        claves = tabla.drop(columns="valor").itertuples(index=False, name=None)
+        pares = [(variables[clave], valor) for clave, valor in zip(claves, tabla["valor"]) if clave in variables]
+        if pares:
+            modelo.setAttr("Start", [var for var, _ in pares], [valor for _, valor in pares])
+
+
+def resolver_horizonte_rodante(parametros, ventana=14, paso=7, agregado=False, tiempo_ventana=300,
+                               matricial=False, ajustada=False):
+    """
+    Resuelve el horizonte completo en ventanas solapadas.
+
+    Cada ventana fija definitivamente los primeros `paso` días (x, y, phi), traspasa
+    zeta y u del último día comprometido como estado inicial de la siguiente, descuenta
+    el gasto comprometido del presupuesto R11 y parte desde la cola de la ventana previa.
+
+    Args:
+        parametros: dict retornado por cargar_parametros
+        ventana: días resueltos en cada ventana
+        paso: días comprometidos por ventana (paso <= ventana)
+        agregado: usar la formulación agregada de construir_modelo
+        tiempo_ventana: TimeLimit de Gurobi por ventana (segundos)
+        matricial: usar el constructor matricial de construir_modelo
+        ajustada: usar la formulación ajustada de construir_modelo
+
+    Returns:
+        (tablas, objetivo) con las mismas tablas que extraer_solucion para el modelo
+        monolítico, o (None, None) si alguna ventana no encuentra solución factible
+    """
+    T = parametros["T"]
+    paso = min(paso, ventana)
+    w, O, V, alpha = parametros["w"], parametros["O"], parametros["V"], parametros["alpha"]
+    estacion_vehiculo = {p: e for (p, e) in alpha}
+    costo_diario = {(p, t): sum(w.get((p, v), 0) * O.get((v, t), 0) for v in V)
+                    for p in parametros["P"] for t in T}
+
+    estado = {"zeta": dict(parametros["zeta"]), "u": None}
+    presupuesto_restante = dict(parametros["P_e"])
+    inicio = {}
+    partes = {}
+    objetivo = 0.0
+
+    print(f"🔁 HORIZONTE RODANTE: {len(T)} días en ventanas de {ventana} comprometiendo {paso}")
+    for i in range(0, len(T), paso):
+        dias = T[i:i + ventana]
+        ultima = i + ventana >= len(T)
+        # La última ventana compromete todos sus días
+        comprometidos = set(dias) if ultima else set(dias[:paso])
+        print(f"\n🪟 Ventana días {dias[0]}-{dias[-1]} (comprometiendo {dias[0]}-{max(comprometidos)})")
+
+        sub = _subproblema_ventana(parametros, dias, estado, presupuesto_restante, len(T) - i)
+        modelo = construir_modelo(sub, agregado=agregado, matricial=matricial, ajustada=ajustada)
+        modelo.setParam("TimeLimit", tiempo_ventana)
+        _cargar_inicio(modelo, inicio)
+        modelo.optimize()
+
+        if modelo.SolCount == 0:
+            print(f"❌ Ventana {dias[0]}-{dias[-1]} sin solución factible. Status: {modelo.status}")
+            return None, None
+        if modelo.status != GRB.OPTIMAL:
+            print(f"⚠️  Ventana con status {modelo.status}, se usa la mejor solución encontrada")
+
+        # Comprometer los primeros días y preparar el inicio de la siguiente ventana
+        tablas = extraer_solucion(modelo)
+        inicio = {familia: tabla[~tabla["t"].isin(comprometidos)] for familia, tabla in tablas.items()}
+        fijas = {familia: tabla[tabla["t"].isin(comprometidos)] for familia, tabla in tablas.items()}
+
+        if agregado:
+            n = fijas.pop("n")
+            n = n[n["valor"] > 0.5]
+            dotacion = dict(zip(n[["e", "k", "p", "m", "t"]].itertuples(index=False, name=None), n["valor"]))
+            fijas["y"] = tabla_desde_claves("y", asignar_carabineros(sub, dotacion))
+        for familia, tabla in fijas.items():
+            partes.setdefault(familia, []).append(tabla)
+
+        for p, t in fijas["phi"].loc[fijas["phi"]["valor"] > 0.5, ["p", "t"]].itertuples(index=False, name=None):
+            if estacion_vehiculo.get(p) in presupuesto_restante:
+                presupuesto_restante[estacion_vehiculo[p]] -= costo_diario[p, t]
+
+        ultimo = max(comprometidos)
+        zeta, u = fijas["zeta"], fijas["u"]
+        objetivo += zeta["valor"].sum()
+        zeta_final = zeta[zeta["t"] == ultimo].set_index("z")["valor"]
+        u_final = u[u["t"] == ultimo].groupby("z")["valor"].sum()
+        estado = {
+            "zeta": {z: float(zeta_final.get(z, 0.0)) for z in parametros["Z"]},
+            "u": {z: float(u_final.get(z, 0.0)) for z in parametros["Z"]},
+        }
+        modelo.dispose()
+        if ultima:
+            break
+
+    print(f"\n✅ Horizonte rodante completado. Peligrosidad total: {objetivo:.6f}")
+    tablas = {familia: pd.concat(lista, ignore_index=True) for familia, lista in partes.items()}
+    return tablas, objetivo
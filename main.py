@@ -3,13 +3,13 @@ SISTEMA DE OPTIMIZACIÓN DE PATRULLAJE PREVENTIVO
 Versión oficial - Modelo de asignación de recursos policiales
 """
 
-from gurobipy import *
-from modelo import construir_modelo, resolver_modelo
-from parametros import cargar_parametros
+from parametros import cargar_parametros, asignar_carabineros
+from heuristica import construir_solucion_heuristica
+from resultados import (tabla_desde_claves, tablas_desde_plan, guardar_resultados,
+                        guardar_progreso, hitos_progreso)
 import sys
 import pandas as pd
 import os
-from collections import defaultdict
 
 def mostrar_ayuda():
     """Muestra las opciones disponibles del programa"""
@@ -18,100 +18,233 @@ def mostrar_ayuda():
     print("MODOS DISPONIBLES:")
     print("  --cinco-zonas    : 5 zonas representativas + 30 días (RECOMENDADO)")
     print("  --testing        : 1 zona + 7 días (PRUEBA RÁPIDA)")
+    print("\nOPCIONES:")
+    print("  --completo       : Horizonte completo de 365 días")
+    print("  --agregado       : Formulación agregada (dotación entera por estación y experiencia)")
+    print("  --rodante        : Horizonte rodante (ventanas de 14 días comprometiendo 7)")
+    print("  --excel          : Exporta además variables_activas.xlsx y resumen_diario_recursos.xlsx")
+    print("  --heuristica     : Solo heurística greedy, sin solver (no requiere licencia de Gurobi)")
+    print("  --rapido         : Relajación LP + redondeo con reparación: respuesta aproximada en segundos con su gap")
+    print("  --descomposicion : Relajación lagrangeana por estación + reparación heurística (instancias grandes)")
+    print("  --matricial      : Construye el modelo con matrices dispersas (API matricial de gurobipy)")
+    print("  --ajustada       : Formulación ajustada: mismo óptimo, relajación LP más fuerte y menos filas")
+    print("  --perfilar       : Mide tiempo, memoria, filas y no nulos de cada familia al construir (resultados/perfiles)")
+    print("  --pool 10        : Guarda hasta 10 planes distintos cercanos al óptimo y sus diferencias (resultados/pool)")
+    print("  --gap-pool 0.05  : Gap relativo máximo de los planes del pool respecto del mejor (por defecto 5%)")
+    print("  --sin-ajustes    : Ignora los parámetros de Gurobi ajustados por clase (ajuste_parametros.py)")
+    print("  --zonas 30,17,8  : Instancia mínima con las comisarías, carabineros y vehículos de esas zonas")
+    print("  --sin-cache      : Relee los CSV ignorando la caché de parámetros (.cache/parametros)")
+    print("  --cache          : Reutiliza el modelo construido y la última solución (resultados/cache_modelos)")
+    print("  --cache-presolvido : Como --cache, y guarda además el modelo presolvido en la misma entrada")
+    print("  --auto           : Estima tamaño y memoria antes de construir y elige estrategia y parámetros de Gurobi")
+    print("  --solver highs   : Resuelve el modelo monolítico con HiGHS (sin licencia); por defecto gurobi")
     print("\nEJEMPLOS:")
     print("  python main.py                # Modo recomendado (5 zonas + 30 días)")
     print("  python main.py --cinco-zonas  # Modo explícito")
     print("  python main.py --testing      # Prueba rápida")
+    print("  python main.py --cinco-zonas --agregado  # Modelo agregado, sin simetría entre carabineros")
+    print("  python main.py --completo --rodante      # Plan anual con memoria acotada")
+    print("  python main.py --heuristica              # Plan factible en segundos, sin Gurobi")
+    print("  python main.py --completo --descomposicion  # Estaciones en paralelo con cota inferior")
+    print("  python main.py --zonas 30,17,8           # Solo esas zonas y las comisarías que las atienden")
+    print("  python main.py --rapido                  # Curva de peligrosidad aproximada para comparar escenarios")
+    print("  python main.py --completo --auto         # Monolítico, rodante o descomposición según la RAM")
+    print("  python main.py --testing --solver highs  # Mismo modelo con un solver de código abierto")
+    print("  python main.py --pool 10 --gap-pool 0.02 # Planes alternativos casi óptimos para elegir")
 
 
 
-def resolver_modelo_policial(modo_testing="cinco_zonas", horizonte="mensual"):
+def plan_heuristico(parametros):
+    """
+    Construye el plan greedy: resultado de --heuristica, inicio MIP del modelo
+    monolítico y cota superior inicial de la descomposición. --rapido y --rodante
+    no lo usan, así que solo se calcula en esas ramas.
+    """
+    print("🧭 Construyendo plan heurístico greedy...")
+    plan = construir_solucion_heuristica(parametros)
+    print(f"   ✓ {len(plan['x'])} patrullas, peligrosidad total {plan['objetivo']:.6f}, "
+          f"{len(plan['faltantes'])} (zona, día) bajo la cobertura mínima")
+    return plan
+
+
+def resolver_modelo_policial(modo_testing="cinco_zonas", horizonte="mensual", agregado=False, rodante=False,
+                             exportar_excel=False, solo_heuristica=False, usar_cache=True, zonas=None,
+                             matricial=False, descomposicion=False, automatico=False, usar_cache_modelo=False,
+                             rapido=False, solver="gurobi", ajustada=False, perfilar=False, pool=0,
+                             gap_pool=0.05, usar_ajustes=True, cache_presolvido=False):
     """
     Resuelve el modelo de optimización policial
+
+    Con automatico=True la estrategia (monolítico, rodante o descomposición), la
+    formulación y los parámetros de memoria y threads de Gurobi los decide
+    estimador.recomendar_estrategia según el tamaño estimado y la máquina.
+
+    Con usar_cache_modelo=True el modelo monolítico se lee de cache_modelo si ya se
+    construyó con los mismos parámetros, y la solución final se guarda como inicio
+    para la próxima corrida. cache_presolvido=True guarda además el modelo presolvido.
+
+    Con solver distinto de "gurobi" el modelo monolítico se construye y resuelve a
+    través de la capa de solvers.py (sin licencia de Gurobi); rodante y la caché de
+    modelos siguen requiriendo Gurobi.
+
+    Con ajustada=True se usa la formulación ajustada de construir_modelo (sin M_big,
+    sin las filas redundantes R4/R6/R7/R14_no_negativo).
+
+    Con perfilar=True la construcción del modelo monolítico se mide por familia
+    (perfilador.py) y el reporte se guarda en resultados/perfiles.
+
+    Con pool > 1 la resolución monolítica con Gurobi guarda además hasta pool planes
+    distintos dentro de gap_pool del óptimo en resultados/pool, con las patrullas
+    movidas entre cada par de planes.
+
+    Con usar_ajustes=True se aplican los parámetros de Gurobi guardados por
+    ajuste_parametros.py para la clase de la instancia (si existen).
     """
-    
     print("📊 Cargando parámetros...")
-    parametros = cargar_parametros(modo_testing=modo_testing, horizonte=horizonte)
-    
-    print("🔧 Construyendo modelo...")
-    modelo = construir_modelo(parametros)
-    
-    os.makedirs("resultados", exist_ok=True)
-    print("⚡ Resolviendo modelo...")
-    exito = resolver_modelo(modelo)
-    
-    if exito:
+    try:
+        parametros = cargar_parametros(modo_testing=modo_testing, horizonte=horizonte, zonas=zonas,
+                                       usar_cache=usar_cache)
+    except ValueError as error:
+        print(f"❌ {error}")
+        return
+
+    ventana_rodante, procesos = {}, None
+    if not (solo_heuristica or rapido):
+        from estimador import contar_modelo, estimar_memoria, recomendar_estrategia, recursos_maquina, mostrar_estimacion
+        recursos = recursos_maquina()
+        recomendacion = recomendar_estrategia(parametros, agregado=agregado, memoria_gb=recursos["memoria_gb"],
+                                              nucleos=recursos["nucleos"], ajustada=ajustada)
+        conteo = contar_modelo(parametros, agregado=agregado, ajustada=ajustada)
+        memoria = estimar_memoria(conteo)
+        if automatico:
+            mostrar_estimacion(conteo, memoria, recomendacion, recursos)
+            agregado = recomendacion["agregado"]
+            rodante = recomendacion["estrategia"] == "rodante"
+            descomposicion = recomendacion["estrategia"] == "descomposicion"
+            if rodante:
+                ventana_rodante = {"ventana": recomendacion["ventana"], "paso": recomendacion["paso"]}
+            procesos = recomendacion.get("procesos")
+            parametros["ajustes_gurobi"] = recomendacion["gurobi"]
+        else:
+            mostrar_estimacion(conteo, memoria)
+            if not (rodante or descomposicion) and recomendacion["estrategia"] != "monolitico":
+                print(f"⚠️  El modelo completo no cabe en {recursos['memoria_gb']:.1f} GB disponibles; "
+                      f"se recomienda {recomendacion['estrategia']} (usa --auto)")
+
+    ajustes = {}
+    if usar_ajustes:
+        from ajuste_parametros import cargar_ajustes, clase_instancia
+        ajustes = cargar_ajustes(parametros, agregado=agregado, ajustada=ajustada)
+        if ajustes:
+            print(f"🎛️  Parámetros ajustados para la clase {clase_instancia(parametros, agregado, ajustada)}: {ajustes}")
+            # Threads y memoria de --auto se mantienen: los ajustes solo traen parámetros de búsqueda
+            parametros["ajustes_gurobi"] = {**ajustes, **parametros.get("ajustes_gurobi", {})}
+
+    metadatos = {"modo": modo_testing, "horizonte": horizonte, "agregado": agregado, "rodante": rodante, "zonas": zonas,
+                 "matricial": matricial, "descomposicion": descomposicion, "automatico": automatico, "rapido": rapido,
+                 "solver": solver, "ajustada": ajustada, "pool": pool,
+                 "ajustes_gurobi": ajustes}
+
+    if solo_heuristica:
+        plan = plan_heuristico(parametros)
+        metadatos.update({"heuristica": True, "faltantes": len(plan["faltantes"])})
+        guardar_resultados(tablas_desde_plan(plan), plan["objetivo"], metadatos=metadatos,
+                           exportar_excel=exportar_excel)
+        return
+
+    if rapido:
+        from relajacion import resolver_rapido
+        plan, cota_lp = resolver_rapido(parametros, agregado=True, ajustada=ajustada)
+        metadatos.update({"cota_lp": cota_lp, "faltantes": len(plan["faltantes"])})
+        if cota_lp is not None:
+            metadatos["gap"] = (plan["objetivo"] - cota_lp) / max(abs(plan["objetivo"]), 1e-9)
         print("\n📋 Procesando resultados...")
+        guardar_resultados(tablas_desde_plan(plan), plan["objetivo"], metadatos=metadatos,
+                           exportar_excel=exportar_excel)
+        return
 
-        variables_activas = []
-        total_variables = 0
-        variables_cero = 0
-
-        for var in modelo.getVars():
-            total_variables += 1
-            if abs(var.X) < 1e-10:
-                variables_cero += 1
-            elif var.X > 1e-10:
-                nombre = var.VarName
-                valor = var.X
-                variables_activas.append((nombre, valor))
-
-        print(f"📊 Estadísticas del modelo:")
-        print(f"   • Total de variables: {total_variables:,}")
-        print(f"   • Variables activas: {len(variables_activas):,}")
-        print(f"   • Función objetivo: {modelo.objVal:.6f}")
-        
-        # Guardar variables activas
-        df_vars = pd.DataFrame(variables_activas, columns=["variable", "valor"])
-        df_vars.to_excel("resultados/variables_activas.xlsx", index=False)
-        
-        # Generar resumen diario
-        resumen = defaultdict(lambda: defaultdict(float))
-
-        for nombre, valor in variables_activas:
-            try:
-                if nombre.startswith("x["):  # x[p,z,m,t]
-                    partes = nombre[2:-1].split(",")
-                    t = int(partes[3])
-                    resumen[t]["patrullas_asignadas"] += 1
-                elif nombre.startswith("y["):  # y[c,p,m,t]
-                    partes = nombre[2:-1].split(",")
-                    t = int(partes[3])
-                    resumen[t]["carabineros_asignados"] += 1
-                elif nombre.startswith("phi["):  # phi[p,t]
-                    partes = nombre[4:-1].split(",")
-                    t = int(partes[1])
-                    resumen[t]["vehiculos_utilizados"] += 1
-                elif nombre.startswith("u["):  # u[z,m,t]
-                    partes = nombre[2:-1].split(",")
-                    t = int(partes[2])
-                    resumen[t]["peligrosidad_acumulada"] += valor
-                elif nombre.startswith("zeta["):  # zeta[z,t]
-                    partes = nombre[5:-1].split(",")
-                    t = int(partes[1])
-                    resumen[t]["deficit_cobertura"] += valor
-            except Exception as e:
-                continue  # Ignorar errores de parsing
-
-        # Convertir resumen a DataFrame
-        filas = []
-        for dia in sorted(resumen):
-            fila = {"dia": dia}
-            fila.update(resumen[dia])
-            filas.append(fila)
-
-        df_resumen = pd.DataFrame(filas)
-        df_resumen.to_excel("resultados/resumen_diario_recursos.xlsx", index=False)
-        
-        print("✅ Archivos guardados:")
-        print("   • resultados/variables_activas.xlsx")
-        print("   • resultados/resumen_diario_recursos.xlsx")
-        
-        print(f"\n🎯 FUNCIÓN OBJETIVO FINAL: {modelo.objVal:.6f}")
-        print("   (Peligrosidad total minimizada - MENOR es MEJOR)")
+    if descomposicion:
+        from descomposicion import resolver_descomposicion
+        plan, cota_inferior = resolver_descomposicion(parametros, procesos=procesos, agregado=True,
+                                                      plan_inicial=plan_heuristico(parametros))
+        metadatos.update({"cota_inferior": cota_inferior, "faltantes": len(plan["faltantes"]),
+                          "gap": (plan["objetivo"] - cota_inferior) / max(abs(plan["objetivo"]), 1e-9)})
+        print("\n📋 Procesando resultados...")
+        guardar_resultados(tablas_desde_plan(plan), plan["objetivo"], metadatos=metadatos,
+                           exportar_excel=exportar_excel)
+        return
 
-    else:
+    if rodante and solver == "gurobi":
+        from horizonte_rodante import resolver_horizonte_rodante
+        if pool > 1:
+            print("⚠️  --pool requiere el modelo monolítico; se ignora con --rodante")
+        print("🔁 Resolviendo con horizonte rodante...")
+        tablas, objetivo = resolver_horizonte_rodante(parametros, agregado=agregado, matricial=matricial,
+                                                      ajustada=ajustada, **ventana_rodante)
+        if tablas is None:
+            print("\n❌ No se pudo resolver el modelo satisfactoriamente.")
+            return
+        print("\n📋 Procesando resultados...")
+        guardar_resultados(tablas, objetivo, metadatos=metadatos, exportar_excel=exportar_excel)
+        return
+
+    # Modelo monolítico con cualquier backend de solvers.py; gurobipy o highspy solo se
+    # importan al construir el modelo
+    from solvers import crear_modelo, mostrar_reporte
+    opciones, extras, perfil = {}, {}, None
+    if solver == "gurobi":
+        if perfilar:
+            from perfilador import PerfilConstruccion
+            perfil = PerfilConstruccion()
+        opciones = {"matricial": matricial, "perfil": perfil, "cache": usar_cache_modelo or cache_presolvido,
+                    "presolvido": cache_presolvido}
+        extras = {"pool": pool, "gap_pool": gap_pool}
+    elif rodante or usar_cache_modelo or cache_presolvido or pool > 1:
+        print(f"⚠️  --rodante, --cache y --pool requieren Gurobi; se resuelve el modelo monolítico con {solver}")
+    modelo = crear_modelo(parametros, solver=solver, agregado=agregado, ajustada=ajustada, **opciones)
+    if perfil is not None and not modelo.desde_cache:
+        perfil.mostrar()
+        perfil.guardar(metadatos=metadatos)
+    if not modelo.con_inicio:
+        modelo.cargar_inicio(plan_heuristico(parametros))
+
+    os.makedirs("resultados", exist_ok=True)
+    print("⚡ Resolviendo modelo...")
+    ajustes = parametros.get("ajustes_gurobi", {})
+    reporte = modelo.resolver(tiempo_limite=ajustes.get("TimeLimit", 1800), hilos=ajustes.get("Threads"), **extras)
+    mostrar_reporte(reporte)
+    if not reporte["con_solucion"]:
         print("\n❌ No se pudo resolver el modelo satisfactoriamente.")
+        return
+
+    print("\n📋 Procesando resultados...")
+    tablas = modelo.tablas()
+    if agregado:
+        # Reconstruir la asignación individual de carabineros a partir de la dotación n
+        n = tablas["n"][tablas["n"]["valor"] > 0.5]
+        dotacion = dict(zip(n[["e", "k", "p", "m", "t"]].itertuples(index=False, name=None), n["valor"]))
+        tablas["y"] = tabla_desde_claves("y", asignar_carabineros(parametros, dotacion))
+    metadatos.update({"status": reporte["estado"], "gap": reporte["gap"], "tiempo": reporte["tiempo"],
+                      "cota": reporte["cota"], "optimo": reporte["estado"] == "optimo",
+                      "nodos": reporte["nodos"]})
+    if solver == "gurobi":
+        metadatos.update(hitos_progreso(modelo.progreso))
+    guardar_resultados(tablas, reporte["objetivo"], reporte["variables"], metadatos=metadatos,
+                       exportar_excel=exportar_excel)
+    if solver != "gurobi":
+        return
+
+    guardar_progreso(modelo.progreso)
+    if pool > 1:
+        from resultados import guardar_pool
+        soluciones = modelo.soluciones_pool()
+        if agregado:
+            for _, tablas_pool in soluciones:
+                n = tablas_pool["n"][tablas_pool["n"]["valor"] > 0.5]
+                dotacion = dict(zip(n[["e", "k", "p", "m", "t"]].itertuples(index=False, name=None), n["valor"]))
+                tablas_pool["y"] = tabla_desde_claves("y", asignar_carabineros(parametros, dotacion))
+        guardar_pool(soluciones, reporte["variables"], metadatos={**metadatos, "gap_pool": gap_pool})
+    modelo.guardar_solucion_cache()
 
 if __name__ == "__main__":
     print("🚔 Iniciando Sistema de Optimización de Patrullaje Preventivo...")
@@ -120,28 +253,128 @@ if __name__ == "__main__":
     modo_testing = "cinco_zonas"
     horizonte = "mensual"
     
+    agregado = False
+    rodante = False
+    exportar_excel = False
+    solo_heuristica = False
+    usar_cache = True
+    zonas = None
+    matricial = False
+    descomposicion = False
+    automatico = False
+    usar_cache_modelo = False
+    cache_presolvido = False
+    rapido = False
+    solver = "gurobi"
+    ajustada = False
+    perfilar = False
+    pool = 0
+    gap_pool = 0.05
+    usar_ajustes = True
+    
     # Procesar argumentos
     if len(sys.argv) > 1:
-        arg = sys.argv[1]
-        
-        if arg == "--help" or arg == "-h":
-            mostrar_ayuda()
-            sys.exit(0)
-        elif arg == "--cinco-zonas":
-            modo_testing = "cinco_zonas"
-            print("📊 MODO 5 ZONAS: 5 zonas representativas + 30 días")
-        elif arg == "--testing":
-            modo_testing = True
-            horizonte = "testing"
-            print("🧪 MODO TESTING: 1 zona + 7 días")
-        else:
-            print(f"❌ Argumento desconocido: {arg}")
-            print("💡 Argumentos válidos: --cinco-zonas, --testing")
-            mostrar_ayuda()
-            sys.exit(1)
+        argumentos = iter(sys.argv[1:])
+        for arg in argumentos:
+            if arg == "--help" or arg == "-h":
+                mostrar_ayuda()
+                sys.exit(0)
+            elif arg == "--cinco-zonas":
+                modo_testing = "cinco_zonas"
+                print("📊 MODO 5 ZONAS: 5 zonas representativas + 30 días")
+            elif arg == "--testing":
+                modo_testing = True
+                horizonte = "testing"
+                print("🧪 MODO TESTING: 1 zona + 7 días")
+            elif arg == "--completo":
+                horizonte = "completo"
+                print("📅 HORIZONTE COMPLETO: 365 días")
+            elif arg == "--rodante":
+                rodante = True
+                print("🔁 HORIZONTE RODANTE: ventanas de 14 días comprometiendo 7")
+            elif arg == "--excel":
+                exportar_excel = True
+                print("📗 Exportando también a Excel")
+            elif arg == "--heuristica":
+                solo_heuristica = True
+                print("🧭 SOLO HEURÍSTICA: plan greedy sin solver")
+            elif arg == "--agregado":
+                agregado = True
+                print("🧮 FORMULACIÓN AGREGADA: dotación entera por estación y experiencia")
+            elif arg == "--zonas" or arg.startswith("--zonas="):
+                valor = arg.partition("=")[2] if "=" in arg else next(argumentos, "")
+                try:
+                    zonas = [int(z) for z in valor.split(",") if z.strip()]
+                except ValueError:
+                    zonas = []
+                if not zonas:
+                    print("❌ --zonas requiere una lista de id_zona separados por coma, p.ej. --zonas 30,17,8")
+                    sys.exit(1)
+                print(f"🗺️  ZONAS: {zonas}")
+            elif arg == "--rapido":
+                rapido = True
+                print("⚡ MODO RÁPIDO: relajación LP + redondeo con reparación")
+            elif arg == "--descomposicion":
+                descomposicion = True
+                print("🧩 DESCOMPOSICIÓN POR ESTACIÓN: relajación lagrangeana de la cobertura")
+            elif arg == "--matricial":
+                matricial = True
+                print("🧱 CONSTRUCTOR MATRICIAL: matrices dispersas + addMConstr")
+            elif arg == "--ajustada":
+                ajustada = True
+                print("📐 FORMULACIÓN AJUSTADA: R9 por turno sin M_big y sin filas redundantes")
+            elif arg == "--perfilar":
+                perfilar = True
+                print("🔬 PERFILADOR: tiempo y memoria por familia de variables y restricciones")
+            elif arg == "--pool" or arg.startswith("--pool="):
+                valor = arg.partition("=")[2] if "=" in arg else next(argumentos, "")
+                if not valor.isdigit() or int(valor) < 2:
+                    print("❌ --pool requiere un número de soluciones mayor que 1, p.ej. --pool 10")
+                    sys.exit(1)
+                pool = int(valor)
+                print(f"🔀 POOL: hasta {pool} planes distintos cercanos al óptimo")
+            elif arg == "--gap-pool" or arg.startswith("--gap-pool="):
+                valor = arg.partition("=")[2] if "=" in arg else next(argumentos, "")
+                try:
+                    gap_pool = float(valor)
+                except ValueError:
+                    print("❌ --gap-pool requiere un gap relativo, p.ej. --gap-pool 0.05")
+                    sys.exit(1)
+            elif arg == "--cache":
+                usar_cache_modelo = True
+                print("💾 CACHÉ DE MODELOS: reutiliza modelo y solución si los datos no cambiaron")
+            elif arg == "--cache-presolvido":
+                usar_cache_modelo = cache_presolvido = True
+                print("💾 CACHÉ DE MODELOS: reutiliza modelo y solución, y guarda el modelo presolvido")
+            elif arg == "--auto":
+                automatico = True
+                print("🧭 AUTOMÁTICO: estrategia y parámetros de Gurobi según el tamaño estimado")
+            elif arg == "--solver" or arg.startswith("--solver="):
+                solver = arg.partition("=")[2] if "=" in arg else next(argumentos, "")
+                if solver not in ("gurobi", "highs"):
+                    print("❌ --solver requiere gurobi o highs, p.ej. --solver highs")
+                    sys.exit(1)
+                print(f"🧰 SOLVER: {solver}")
+            elif arg == "--sin-ajustes":
+                usar_ajustes = False
+                print("🎛️  Parámetros de Gurobi ajustados por clase desactivados")
+            elif arg == "--sin-cache":
+                usar_cache = False
+                print("🗃️  Caché de parámetros desactivada")
+            else:
+                print(f"❌ Argumento desconocido: {arg}")
+                print("💡 Argumentos válidos: --cinco-zonas, --testing, --completo, --agregado, --rodante, --excel, --heuristica, --descomposicion, --matricial, --zonas, --sin-cache, --auto, --cache, --cache-presolvido, --rapido, --solver, --ajustada, --perfilar, --pool, --gap-pool, --sin-ajustes")
+                mostrar_ayuda()
+                sys.exit(1)
     else:
         print("📊 MODO POR DEFECTO: 5 zonas representativas + 30 días")
         print("   Ejecuta 'python main.py --help' para ver opciones")
     
     # Ejecutar optimización
-    resolver_modelo_policial(modo_testing, horizonte)
+    resolver_modelo_policial(modo_testing, horizonte, agregado=agregado, rodante=rodante,
+                             exportar_excel=exportar_excel, solo_heuristica=solo_heuristica,
+                             usar_cache=usar_cache, zonas=zonas, matricial=matricial,
+                             descomposicion=descomposicion, automatico=automatico,
+                             usar_cache_modelo=usar_cache_modelo, rapido=rapido, solver=solver,
+                             ajustada=ajustada, perfilar=perfilar, pool=pool, gap_pool=gap_pool,
+                             usar_ajustes=usar_ajustes, cache_presolvido=cache_presolvido)
@@ -1,6 +1,62 @@
 from gurobipy import Model, GRB, quicksum
+from parametros import calcular_compatibilidad, clases_experiencia
+
+# Subir al cambiar variables o restricciones: invalida la caché de modelos (cache_modelo.py)
+FORMULACION_VERSION = 1
+
+def configurar_parametros(model, ajustes=None):
+    """
+    Parámetros de Gurobi comunes a todos los constructores del modelo.
+
+    Args:
+        ajustes: dict {parámetro: valor} que reemplaza los valores por defecto,
+            p.ej. los de estimador.recomendar_estrategia (parametros["ajustes_gurobi"])
+    """
+    valores = {
+        # logs
+        "OutputFlag": 1,
+        "LogToConsole": 1,       # Asegura que imprime en consola
+        "DisplayInterval": 10,   # Muestra progreso cada 10s
+
+        "TimeLimit": 1800,  # 30 min máximo según requisitos del proyecto
+
+        # Configuraciones para reducir uso de memoria
+        "NodefileStart": 0.5,  # Usar disco cuando memoria > 0.5 GB
+        "MemLimit": 8,  # Límite de memoria en GB
+        "Presolve": 2,  # Presolve agresivo para reducir variables
+    }
+    valores.update(ajustes or {})
+    for nombre, valor in valores.items():
+        model.setParam(nombre, valor)
+
+def construir_modelo(parametros, agregado=False, matricial=False, ajustada=False, perfil=None):
+    """
+    Construye el modelo de patrullaje.
+
+    Args:
+        parametros: dict retornado por cargar_parametros
+        agregado: Si True, reemplaza y[c,p,m,t] por enteros n[e,k,p,m,t] que cuentan
+            cuántos carabineros de la estación e con experiencia k tripulan la patrulla.
+            Elimina la simetría entre carabineros equivalentes; los IDs se recuperan
+            con asignar_carabineros.
+        matricial: Si True, arma la misma formulación con matrices dispersas y la API
+            matricial de gurobipy (ver modelo_matricial.py)
+        ajustada: Si True, usa la formulación ajustada: mismo conjunto factible en
+            (x, y, zeta) y mismo óptimo, con relajación LP más fuerte y menos filas.
+            R9 se desagrega por turno (sum_z x[p,z,m,t] <= phi[p,t], sin M_big) y
+            domina a R4; R3 usa coeficientes min(q, 4) y así implica R7; R6 queda
+            implícita en R8, cuyo coeficiente baja a la tripulación posible; y se omite
+            R14_no_negativo, que repite la cota u >= 0.
+        perfil: perfilador.PerfilConstruccion opcional; registra tiempo, memoria, filas y
+            no nulos de cada familia de variables y restricciones
+    """
+    if matricial:
+        from modelo_matricial import construir_modelo_matricial
+        return construir_modelo_matricial(parametros, agregado=agregado, ajustada=ajustada, perfil=perfil)
+
+    # Cada marca cierra una familia en el perfil (sin perfil no hace nada)
+    marca = perfil.marca if perfil is not None else (lambda familia, model=None: None)
 
-def construir_modelo(parametros):
     print("🔧 Iniciando construcción del modelo...")
     
     # Desempaquetar parámetros y conjuntos
@@ -14,43 +70,113 @@ def construir_modelo(parametros):
     kappa = parametros["kappa"]
     M_big = parametros["M_big"]
 
+    # Índice de compatibilidad: x e y solo se crean sobre tuplas factibles (reemplaza R2 y R5)
+    compat = calcular_compatibilidad(parametros)
+    P_activos = compat["P_activos"]
+    zonas_por_vehiculo = compat["zonas_por_vehiculo"]
+    vehiculos_por_zona = compat["vehiculos_por_zona"]
+    carabineros_por_vehiculo = compat["carabineros_por_vehiculo"]
+    vehiculos_por_carabinero = compat["vehiculos_por_carabinero"]
+
+    indices_x = [(p, z, m, t) for (p, z) in compat["pares_pz"] for m in M for t in T]
+    if agregado:
+        clases, estaciones_vehiculo = clases_experiencia(parametros, compat)
+        niveles_por_estacion = {}
+        for (e, k) in clases:
+            niveles_por_estacion.setdefault(e, []).append(k)
+        indices_y = [(e, k, p, m, t) for p in P_activos for e in estaciones_vehiculo[p]
+                     for k in sorted(niveles_por_estacion.get(e, [])) for m in M for t in T]
+    else:
+        indices_y = [(c, p, m, t) for (c, p) in compat["pares_cp"] for m in M for t in T]
+
+    marca("compatibilidad (R2/R5)")
+    if ajustada:
+        print("📐 Formulación ajustada: R9 por turno sin M_big, R3 con coeficientes min(q, 4), sin R4/R6/R7")
     print(f"📊 Tamaños de conjuntos: C={len(C)}, P={len(P)}, E={len(E)}, Z={len(Z)}, T={len(T)}")
-    print(f"📊 Variables estimadas: {len(P)*len(Z)*len(M)*len(T) + len(C)*len(P)*len(M)*len(T)} aprox.")
+    print(f"📊 Vehículos con tripulación y zona compatibles: {len(P_activos)} de {len(P)}")
+    print(f"📊 Variables enteras: {len(indices_x) + len(indices_y) + len(P)*len(T)} "
+          f"(producto completo: {len(P)*len(Z)*len(M)*len(T) + len(C)*len(P)*len(M)*len(T) + len(P)*len(T)})")
 
     model = Model("Patrullaje Preventivo")
-    # logs
-    model.setParam("OutputFlag", 1)         
-    model.setParam("LogToConsole", 1)       # Asegura que imprime en consola
-    model.setParam("DisplayInterval", 10)   # Muestra progreso cada 10s
+    configurar_parametros(model, parametros.get("ajustes_gurobi"))
 
-    model.setParam("TimeLimit", 1800)  # 30 min máximo según requisitos del proyecto
-    
-    # Configuraciones para reducir uso de memoria
-    model.setParam("NodefileStart", 0.5)  # Usar disco cuando memoria > 0.5 GB
-    model.setParam("MemLimit", 8)  # Límite de memoria en GB
-    model.setParam("Presolve", 2)  # Presolve agresivo para reducir variables
+    marca("configuracion", model)
 
     print("✅ Creando variables de decisión...")
-    # Variables de decisión según documentación
-    x = model.addVars(P, Z, M, T, vtype=GRB.BINARY, name="x")
-    print(f"   ✓ Variable x: {len(P)*len(Z)*len(M)*len(T)} variables binarias")
+    # Variables de decisión según documentación (x e y solo en tuplas compatibles)
+    x = model.addVars(indices_x, vtype=GRB.BINARY, name="x")
+    print(f"   ✓ Variable x: {len(indices_x)} variables binarias")
     
-    y = model.addVars(C, P, M, T, vtype=GRB.BINARY, name="y")
-    print(f"   ✓ Variable y: {len(C)*len(P)*len(M)*len(T)} variables binarias")
+    marca("x", model)
+    capacidad = {p: sum(R_v[v] * w.get((p, v), 0) for v in V) for p in P}
+
+    if agregado:
+        # n[e,k,p,m,t]: carabineros de clase (e,k) en la patrulla p (acotado por clase y capacidad)
+        y = model.addVars(indices_y, vtype=GRB.INTEGER, lb=0, name="n")
+        for (e, k, p, m, t) in indices_y:
+            y[e, k, p, m, t].ub = min(len(clases[e, k]), capacidad[p])
+        print(f"   ✓ Variable n: {len(indices_y)} variables enteras (dotación por estación y experiencia)")
+    else:
+        y = model.addVars(indices_y, vtype=GRB.BINARY, name="y")
+        print(f"   ✓ Variable y: {len(indices_y)} variables binarias")
     
+    marca("n" if agregado else "y", model)
+
     phi = model.addVars(P, T, vtype=GRB.BINARY, name="phi")
     print(f"   ✓ Variable phi: {len(P)*len(T)} variables binarias")
     
+    marca("phi", model)
+
     u = model.addVars(Z, M, T, lb=0.0, vtype=GRB.CONTINUOUS, name="u")
     print(f"   ✓ Variable u: {len(Z)*len(M)*len(T)} variables continuas (peligrosidad por turno)")
     
+    marca("u", model)
+
     zeta = model.addVars(Z, T, lb=0.0, ub=1.0, vtype=GRB.CONTINUOUS, name="zeta")
     print(f"   ✓ Variable zeta: {len(Z)*len(T)} variables continuas (peligrosidad diaria [0,1])")
 
+    marca("zeta", model)
+
+    # Expresiones auxiliares reutilizadas por varias restricciones
+    # Coeficiente de experiencia en R3; en la formulación ajustada se reduce a min(q, 4),
+    # porque con q >= 4 un solo carabinero ya cumple la experiencia mínima
+    nivel = (lambda k: min(k, 4)) if ajustada else (lambda k: k)
+    patrulla_activa = {
+        (p, m, t): quicksum(x[p, z, m, t] for z in zonas_por_vehiculo[p])
+        for p in P_activos for m in M for t in T
+    }
+    if agregado:
+        tripulacion = {
+            (p, m, t): quicksum(y[e, k, p, m, t] for e in estaciones_vehiculo[p]
+                                for k in niveles_por_estacion.get(e, []))
+            for p in P_activos for m in M for t in T
+        }
+        experiencia = {
+            (p, m, t): quicksum(nivel(k) * y[e, k, p, m, t] for e in estaciones_vehiculo[p]
+                                for k in niveles_por_estacion.get(e, []))
+            for p in P_activos for m in M for t in T
+        }
+        tripulantes_posibles = {p: sum(len(clases[e, k]) for e in estaciones_vehiculo[p]
+                                       for k in niveles_por_estacion.get(e, [])) for p in P_activos}
+    else:
+        tripulacion = {
+            (p, m, t): quicksum(y[c, p, m, t] for c in carabineros_por_vehiculo[p])
+            for p in P_activos for m in M for t in T
+        }
+        experiencia = {
+            (p, m, t): quicksum(y[c, p, m, t] * nivel(q[c]) for c in carabineros_por_vehiculo[p])
+            for p in P_activos for m in M for t in T
+        }
+        tripulantes_posibles = {p: len(carabineros_por_vehiculo[p]) for p in P_activos}
+    if ajustada:
+        capacidad = {p: min(capacidad[p], tripulantes_posibles.get(p, 0)) for p in P}
+
+    marca("expresiones", model)
+
     # Establecer valores iniciales de peligrosidad
     print("✅ Estableciendo valores iniciales...")
     for z in Z:
-        zeta[z, 1].start = zeta_init.get(z, 0.5)
+        zeta[z, T[0]].start = zeta_init.get(z, 0.5)
 
     # Función objetivo: minimizar suma de peligrosidad
     print("✅ Definiendo función objetivo...")
@@ -59,134 +185,197 @@ def construir_modelo(parametros):
         GRB.MINIMIZE
     )
 
+    marca("objetivo", model)
+
     print("✅ Agregando restricciones...")
     
     # R1: Asignación diaria única de carabinero
     print("   🔄 R1: Asignación diaria única...")
-    model.addConstrs(
-        (quicksum(y[c, p, m, t] for p in P for m in M) <= 1
-         for c in C for t in T),
-        name="R1_asignacion_diaria_unica"
-    )
+    if agregado:
+        # Cada clase (e,k) no puede aportar más carabineros de los que tiene en el día
+        vehiculos_por_clase = {
+            (e, k): [p for p in P_activos if e in estaciones_vehiculo[p]] for (e, k) in clases
+        }
+        model.addConstrs(
+            (quicksum(y[e, k, p, m, t] for p in vehiculos_por_clase[e, k] for m in M) <= len(clases[e, k])
+             for (e, k) in clases for t in T),
+            name="R1_asignacion_diaria_unica"
+        )
+    else:
+        model.addConstrs(
+            (quicksum(y[c, p, m, t] for p in vehiculos_por_carabinero[c] for m in M) <= 1
+             for c in vehiculos_por_carabinero for t in T),
+            name="R1_asignacion_diaria_unica"
+        )
+
+    marca("R1", model)
 
     # R2: Compatibilidad de estaciones para carabinero y vehículo
-    print("   🔄 R2: Compatibilidad estaciones...")
-    model.addConstrs(
-        (y[c, p, m, t] <= quicksum(beta.get((c, e), 0) * alpha.get((p, e), 0) for e in E)
-         for c in C for p in P for m in M for t in T),
-        name="R2_compatibilidad_estacion"
-    )
+    print("   🔄 R2: Compatibilidad estaciones (implícita en los índices de y)...")
 
     # R3: Experiencia mínima por patrulla
     print("   🔄 R3: Experiencia mínima...")
     model.addConstrs(
-        (4 * quicksum(x[p, z, m, t] for z in Z) <= quicksum(y[c, p, m, t] * q[c] for c in C)
-         for p in P for m in M for t in T),
+        (4 * patrulla_activa[p, m, t] <= experiencia[p, m, t]
+         for p in P_activos for m in M for t in T),
         name="R3_experiencia_minima"
     )
 
+    marca("R3", model)
+
     # R4: Asignación única de patrulla por turno
-    print("   🔄 R4: Asignación única patrulla...")
-    model.addConstrs(
-        (quicksum(x[p, z, m, t] for z in Z) <= 1
-         for p in P for m in M for t in T),
-        name="R4_asignacion_unica_patrulla"
-    )
+    if ajustada:
+        print("   🔄 R4: Asignación única patrulla (implícita en R9 por turno)...")
+    else:
+        print("   🔄 R4: Asignación única patrulla...")
+        model.addConstrs(
+            (patrulla_activa[p, m, t] <= 1
+             for p in P_activos for m in M for t in T),
+            name="R4_asignacion_unica_patrulla"
+        )
+
+    marca("R4", model)
 
     # R5: Compatibilidad de tipo de vehículo con zona
-    print("   🔄 R5: Compatibilidad vehículo-zona...")
-    model.addConstrs(
-        (x[p, z, m, t] <= quicksum(w.get((p, v), 0) * r.get((v, z), 0) for v in V)
-         for p in P for z in Z for m in M for t in T),
-        name="R5_compatibilidad_vehiculo_zona"
-    )
+    print("   🔄 R5: Compatibilidad vehículo-zona (implícita en los índices de x)...")
 
     # R6: Asignación carabineros a patrullas activas por turno
-    print("   🔄 R6: Carabineros a patrullas activas...")
-    model.addConstrs(
-        (y[c, p, m, t] <= quicksum(x[p, z, m, t] for z in Z)
-         for c in C for p in P for m in M for t in T),
-        name="R6_carabineros_patrullas_activas"
-    )
+    if agregado or ajustada:
+        # R8 ya anula la tripulación (o la dotación) de patrullas inactivas
+        print("   🔄 R6: Carabineros a patrullas activas (implícita en R8)...")
+    else:
+        print("   🔄 R6: Carabineros a patrullas activas...")
+        model.addConstrs(
+            (y[c, p, m, t] <= patrulla_activa[p, m, t]
+             for (c, p, m, t) in indices_y),
+            name="R6_carabineros_patrullas_activas"
+        )
+
+    marca("R6", model)
 
     # R7: Límite de carabineros por patrullas I
-    print("   🔄 R7: Límite carabineros I...")
-    model.addConstrs(
-        (quicksum(x[p, z, m, t] for z in Z) <= quicksum(y[c, p, m, t] for c in C)
-         for p in P for m in M for t in T),
-        name="R7_limite_carabineros_I"
-    )
+    if ajustada:
+        # Con coeficientes min(q, 4) <= 4, R3 implica sum y >= patrulla_activa
+        print("   🔄 R7: Límite carabineros I (implícita en R3 ajustada)...")
+    else:
+        print("   🔄 R7: Límite carabineros I...")
+        model.addConstrs(
+            (patrulla_activa[p, m, t] <= tripulacion[p, m, t]
+             for p in P_activos for m in M for t in T),
+            name="R7_limite_carabineros_I"
+        )
+
+    marca("R7", model)
 
     # R8: Límite de carabineros por patrulla II
     print("   🔄 R8: Límite carabineros II...")
     model.addConstrs(
-        (quicksum(y[c, p, m, t] for c in C) <= 
-         quicksum(R_v[v] * w.get((p, v), 0) * quicksum(x[p, z, m, t] for z in Z) for v in V)
-         for p in P for m in M for t in T),
+        (tripulacion[p, m, t] <= capacidad[p] * patrulla_activa[p, m, t]
+         for p in P_activos for m in M for t in T),
         name="R8_limite_carabineros_II"
     )
 
+    marca("R8", model)
+
     # R9: Activación diaria de vehículo I
     print("   🔄 R9: Activación vehículo I...")
-    model.addConstrs(
-        (quicksum(x[p, z, m, t] for m in M for z in Z) <= M_big * phi[p, t]
-         for p in P for t in T),
-        name="R9_activacion_vehiculo_I"
-    )
+    if ajustada:
+        model.addConstrs(
+            (patrulla_activa[p, m, t] <= phi[p, t]
+             for p in P_activos for m in M for t in T),
+            name="R9_activacion_vehiculo_I"
+        )
+    else:
+        model.addConstrs(
+            (quicksum(patrulla_activa[p, m, t] for m in M) <= M_big * phi[p, t]
+             for p in P_activos for t in T),
+            name="R9_activacion_vehiculo_I"
+        )
+
+    marca("R9", model)
 
     # R10: Activación diaria de vehículo II
     print("   🔄 R10: Activación vehículo II...")
     model.addConstrs(
-        (phi[p, t] <= quicksum(y[c, p, m, t] for c in C for m in M)
+        (phi[p, t] <= quicksum(tripulacion.get((p, m, t), 0) for m in M)
          for p in P for t in T),
         name="R10_activacion_vehiculo_II"
     )
 
+    marca("R10", model)
+
     # R11: Límite presupuestario por estación
     print("   🔄 R11: Límite presupuestario...")
+    costo_diario = {(p, t): sum(w.get((p, v), 0) * O.get((v, t), 0) for v in V) for p in P for t in T}
+    vehiculos_por_estacion = {}
+    for (p, e) in alpha:
+        vehiculos_por_estacion.setdefault(e, []).append(p)
     model.addConstrs(
-        (quicksum(phi[p, t] * quicksum(w.get((p, v), 0) * O.get((v, t), 0) for v in V) * alpha.get((p, e), 0)
-                  for p in P for t in T) <= P_e[e]
+        (quicksum(phi[p, t] * costo_diario[p, t]
+                  for p in vehiculos_por_estacion.get(e, []) for t in T) <= P_e[e]
          for e in E),
         name="R11_limite_presupuestario"
     )
 
+    marca("R11", model)
+
     # R12: Cobertura mínima DIARIA OBLIGATORIA - TODOS LOS DÍAS
     print("   🔄 R12: Cobertura mínima...")
     
     # CAMBIO CLAVE: Requerir patrullaje mínimo CADA DÍA independientemente de peligrosidad
     # Esto asegura que el modelo genere un plan mensual real
+    cobertura = {
+        (z, m, t): quicksum(x[p, z, m, t] for p in vehiculos_por_zona[z])
+        for z in Z for m in M for t in T
+    }
     model.addConstrs(
-        (quicksum(x[p, z, m, t] for p in P for m in M) >= kappa
+        (quicksum(cobertura[z, m, t] for m in M) >= kappa
          for z in Z for t in T),
         name="R12_patrullaje_diario_obligatorio"
     )
 
+    marca("R12", model)
+
     # R13: Actualización dinámica de peligrosidad (según documentación)
     print("   🔄 R13: Actualización dinámica de peligrosidad...")
     
-    # Para el primer día (t=1)
+    # Para el primer día del horizonte (t=1, o el inicio de una ventana del horizonte rodante)
+    t0 = T[0]
+    u_anterior = parametros.get("u_anterior")
+    # sum_d I[d,z]·IDD[d] es constante en t: se calcula una vez por zona
+    criminalidad = {z: sum(I.get((d, z), 0) * IDD[d] for d in D) for z in Z}
+    # Referencias a las filas R13 por (z, t): la replanificación cambia su lado derecho
+    r13 = {}
     for z in Z:
-        criminalidad_base = quicksum(I.get((d, z), 0) * IDD[d] for d in D)
-        cobertura_zt = quicksum(x[p, z, m, 1] for p in P for m in M)
-        model.addConstr(
-            zeta[z, 1] == zeta_init[z] + lambda_ * criminalidad_base - (Gamma * cobertura_zt) / 10,
-            name=f"R13_inicial_{z}"
-        )
+        criminalidad_base = criminalidad[z]
+        cobertura_zt = quicksum(cobertura[z, m, t0] for m in M)
+        if u_anterior is None:
+            r13[z, t0] = model.addConstr(
+                zeta[z, t0] == zeta_init[z] + lambda_ * criminalidad_base - (Gamma * cobertura_zt) / 10,
+                name=f"R13_inicial_{z}"
+            )
+        else:
+            # Continuación: zeta_init es zeta[z,t0-1] y u_anterior la suma de u[z,m,t0-1]
+            r13[z, t0] = model.addConstr(
+                zeta[z, t0] == zeta_init[z] + 0.2 * criminalidad_base + lambda_ * u_anterior[z] - (Gamma * cobertura_zt) / 10,
+                name=f"R13_inicial_{z}"
+            )
     
-    # Para días posteriores (t > 1)
+    # Para días posteriores (t > t0)
     for z in Z:
         for t in T:
-            if t > 1:
-                criminalidad_base = quicksum(I.get((d, z), 0) * IDD[d] for d in D)
-                cobertura_zt = quicksum(x[p, z, m, t] for p in P for m in M)
+            if t > t0:
+                criminalidad_base = criminalidad[z]
+                cobertura_zt = quicksum(cobertura[z, m, t] for m in M)
                 sum_u_anterior = quicksum(u[z, m, t-1] for m in M)
                 
-                model.addConstr(
+                r13[z, t] = model.addConstr(
                     zeta[z, t] == zeta[z, t-1] + 0.2 * criminalidad_base + lambda_ * sum_u_anterior - (Gamma * cobertura_zt) / 10,
                     name=f"R13_dinamica_{z}_{t}"
                 )
     
+    marca("R13", model)
+
     # R14: Definición de peligrosidad por turno
     print("   🔄 R14: Definición de peligrosidad por turno...")
     
@@ -195,17 +384,21 @@ def construir_modelo(parametros):
     for z in Z:
         for m in M:
             for t in T:
-                cobertura_turno = quicksum(x[p, z, m, t] for p in P)
+                cobertura_turno = cobertura[z, m, t]
                 # Distribuir la peligrosidad diaria entre los 3 turnos y restar cobertura del turno
                 model.addConstr(
                     u[z, m, t] >= (zeta[z, t] / 3) - cobertura_turno,
                     name=f"R14_peligrosidad_turno_{z}_{m}_{t}"
                 )
                 # También asegurar que u no sea negativo cuando hay suficiente cobertura
-                model.addConstr(
-                    u[z, m, t] >= 0,
-                    name=f"R14_no_negativo_{z}_{m}_{t}"
-                )
+                # (en la formulación ajustada basta la cota inferior de la variable)
+                if not ajustada:
+                    model.addConstr(
+                        u[z, m, t] >= 0,
+                        name=f"R14_no_negativo_{z}_{m}_{t}"
+                    )
+
+    marca("R14", model)
 
     print("✅ Modelo construido exitosamente!")
     print(f"📊 Total variables: {model.NumVars}")
@@ -215,22 +408,87 @@ def construir_modelo(parametros):
     print("   • Variable zeta: Peligrosidad diaria [0,1] (continua)")
     print("   • R13: Actualización dinámica según ecuaciones documentadas")
     print("   • R14: Definición explícita de peligrosidad por turno")
+
+    # Referencias a las familias de variables para el post-proceso de la solución
+    model._variables = {"x": x, "n" if agregado else "y": y, "phi": phi, "u": u, "zeta": zeta}
+    model._restricciones = {"R13": r13}
+    model._agregado = agregado
+    model._ajustada = ajustada
     return model
 
-def resolver_modelo(model):
-    """Resuelve el modelo y retorna información de la solución"""
+def _registrar_progreso(model, where):
+    """Callback: registra (tiempo, incumbente, cota, gap, nodos, trabajo) en model._progreso"""
+    if where == GRB.Callback.MIPSOL:
+        evento = "incumbente"
+        incumbente = min(model.cbGet(GRB.Callback.MIPSOL_OBJ), model.cbGet(GRB.Callback.MIPSOL_OBJBST))
+        cota = model.cbGet(GRB.Callback.MIPSOL_OBJBND)
+        nodos = model.cbGet(GRB.Callback.MIPSOL_NODCNT)
+    elif where == GRB.Callback.MIP:
+        if model.cbGet(GRB.Callback.RUNTIME) < model._proximo_registro:
+            return
+        evento = "intervalo"
+        incumbente = model.cbGet(GRB.Callback.MIP_OBJBST)
+        cota = model.cbGet(GRB.Callback.MIP_OBJBND)
+        nodos = model.cbGet(GRB.Callback.MIP_NODCNT)
+    else:
+        return
+    tiempo = model.cbGet(GRB.Callback.RUNTIME)
+    model._progreso.append({
+        "tiempo": tiempo, "evento": evento, "incumbente": incumbente, "cota": cota,
+        "gap": _gap(incumbente, cota), "nodos": nodos, "trabajo": model.cbGet(GRB.Callback.WORK),
+    })
+    model._proximo_registro = tiempo + model._intervalo_progreso
+
+def _gap(incumbente, cota):
+    """Gap relativo con la misma definición de Gurobi (inf sin incumbente)"""
+    if incumbente >= GRB.INFINITY or cota <= -GRB.INFINITY:
+        return float("inf")
+    if abs(incumbente - cota) <= 1e-10:
+        return 0.0
+    return abs(incumbente - cota) / abs(incumbente) if incumbente != 0 else float("inf")
+
+def resolver_modelo(model, intervalo_progreso=10, pool=0, gap_pool=0.05):
+    """
+    Resuelve el modelo y retorna información de la solución.
+
+    Registra en model._progreso la evolución de incumbente y cota en cada nueva
+    solución y cada intervalo_progreso segundos. Retorna True si hay un plan utilizable:
+    óptimo, o la mejor solución encontrada al agotar el tiempo u otro límite.
+
+    Con pool > 1 la misma optimización busca además hasta pool soluciones distintas
+    dentro de gap_pool (relativo) del óptimo (PoolSearchMode=2); se leen con
+    resultados.extraer_pool. Buscar el pool sistemáticamente alarga la resolución.
+    """
+    model._progreso = []
+    model._intervalo_progreso = intervalo_progreso
+    model._proximo_registro = intervalo_progreso
+    if pool > 1:
+        model.setParam("PoolSearchMode", 2)
+        model.setParam("PoolSolutions", pool)
+        model.setParam("PoolGap", gap_pool)
     print("🚀 Llamando a model.optimize()...")
-    model.optimize()
+    model.optimize(_registrar_progreso)
+    if model.SolCount > 0:
+        model._progreso.append({
+            "tiempo": model.Runtime, "evento": "final", "incumbente": model.ObjVal, "cota": model.ObjBound,
+            "gap": model.MIPGap, "nodos": model.NodeCount, "trabajo": model.Work,
+        })
     
     if model.status == GRB.OPTIMAL:
         print(f"Solución óptima encontrada!")
         print(f"Valor objetivo: {model.ObjVal:.2f}")
         print(f"Tiempo de ejecución: {model.Runtime:.2f} segundos")
         print(f"Variables: {model.NumVars}, Restricciones: {model.NumConstrs}")
+        if pool > 1:
+            print(f"Pool: {model.SolCount} soluciones dentro de {gap_pool:.1%} del óptimo")
+        return True
+    elif model.SolCount > 0:
+        motivo = "Tiempo límite alcanzado" if model.status == GRB.TIME_LIMIT else f"Búsqueda detenida (status {model.status})"
+        print(f"{motivo}. Mejor solución: {model.ObjVal:.2f} (gap {model.MIPGap:.2%}), se usa como plan")
         return True
     elif model.status == GRB.TIME_LIMIT:
-        print(f"Tiempo límite alcanzado. Mejor solución: {model.ObjVal:.2f}")
+        print("Tiempo límite alcanzado sin solución factible")
         return False
     else:
         print(f"No se encontró solución óptima. Status: {model.status}")
-        return False
\ No newline at end of file
+        return False
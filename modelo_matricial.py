@@ -0,0 +1,337 @@
+"""
+CONSTRUCTOR MATRICIAL DEL MODELO
+Arma la misma formulación de modelo.py (R1-R14) como matrices dispersas de SciPy,
+una por familia de restricciones, y la carga con la API matricial de gurobipy
+(addMVar/addMConstr) en vez de generadores y quicksum anidados.
+
+forma_matricial no depende de ningún solver: describe columnas, cotas, tipos,
+objetivo y bloques de filas (A, sentido, rhs), de modo que otros backends pueden
+reutilizarla.
+"""
+
+import numpy as np
+import scipy.sparse as sp
+from parametros import calcular_compatibilidad, clases_experiencia
+
+
+def _expandir(n_grupos, n_m, n_t):
+    """Índices (grupo, m, t) de un bloque grupo × M × T en orden grupo, m, t"""
+    grupo = np.repeat(np.arange(n_grupos), n_m * n_t)
+    m = np.tile(np.repeat(np.arange(n_m), n_t), n_grupos)
+    t = np.tile(np.arange(n_t), n_grupos * n_m)
+    return grupo, m, t
+
+
+def _bloque(n_filas, n_columnas, *partes):
+    """Matriz CSR a partir de tripletas (filas, columnas, valores)"""
+    filas = np.concatenate([np.asarray(f, dtype=np.int64) for f, _, _ in partes])
+    columnas = np.concatenate([np.asarray(c, dtype=np.int64) for _, c, _ in partes])
+    valores = np.concatenate([np.broadcast_to(np.asarray(v, dtype=float), np.shape(f))
+                              for f, _, v in partes])
+    return sp.csr_matrix((valores, (filas, columnas)), shape=(n_filas, n_columnas))
+
+
+def forma_matricial(parametros, agregado=False, ajustada=False):
+    """
+    Forma matricial del modelo de patrullaje (minimización).
+
+    Args:
+        parametros: dict retornado por cargar_parametros
+        agregado: misma opción que construir_modelo (dotación n[e,k,p,m,t] en vez de y)
+        ajustada: misma opción que construir_modelo (formulación ajustada, sin R4/R6/R7)
+
+    Returns:
+        dict con:
+            "familias": {familia: {"claves", "inicio", "tipo" ("B"/"I"/"C"), "lb", "ub"}} en
+                el orden de las columnas (x, y|n, phi, u, zeta)
+            "n": número total de columnas
+            "objetivo": vector de costos
+            "inicio_mip": {columna: valor} con los valores iniciales de zeta
+            "restricciones": lista de (nombre, A, sentido, rhs) con sentido en "<", ">", "="
+    """
+    C, P, E, V, Z, T, M, D = (parametros[k] for k in ("C", "P", "E", "V", "Z", "T", "M", "D"))
+    q, I, IDD = parametros["q"], parametros["I"], parametros["IDD"]
+    O, P_e, w, R_v = parametros["O"], parametros["P_e"], parametros["w"], parametros["R_v"]
+    alpha, zeta_init = parametros["alpha"], parametros["zeta"]
+    Gamma, lambda_, kappa, M_big = parametros["Gamma"], parametros["lambda"], parametros["kappa"], parametros["M_big"]
+
+    compat = calcular_compatibilidad(parametros)
+    P_activos = compat["P_activos"]
+    n_m, n_t, n_z = len(M), len(T), len(Z)
+    mt = n_m * n_t
+    pos_activo = {p: i for i, p in enumerate(P_activos)}
+    pos_p = {p: i for i, p in enumerate(P)}
+    pos_z = {z: i for i, z in enumerate(Z)}
+    activo_en_p = np.array([pos_p[p] for p in P_activos], dtype=np.int64)
+    capacidad = np.array([sum(R_v[v] * w.get((p, v), 0) for v in V) for p in P_activos], dtype=float)
+
+    # Columnas x[p,z,m,t] sobre los pares compatibles
+    pares_pz = compat["pares_pz"]
+    grupo, x_m, x_t = _expandir(len(pares_pz), n_m, n_t)
+    x_p = np.array([pos_activo[p] for p, _ in pares_pz], dtype=np.int64)[grupo]
+    x_z = np.array([pos_z[z] for _, z in pares_pz], dtype=np.int64)[grupo]
+    claves_x = [(p, z, m, t) for (p, z) in pares_pz for m in M for t in T]
+
+    # Columnas y[c,p,m,t] o n[e,k,p,m,t]: vehículo, coeficiente de experiencia y fila de R1
+    if agregado:
+        clases, estaciones_vehiculo = clases_experiencia(parametros, compat)
+        niveles_por_estacion = {}
+        for (e, k) in clases:
+            niveles_por_estacion.setdefault(e, []).append(k)
+        tripletas = [(e, k, p) for p in P_activos for e in estaciones_vehiculo[p]
+                     for k in sorted(niveles_por_estacion.get(e, []))]
+        pos_clase = {clase: i for i, clase in enumerate(clases)}
+        grupo, y_m, y_t = _expandir(len(tripletas), n_m, n_t)
+        y_p = np.array([pos_activo[p] for _, _, p in tripletas], dtype=np.int64)[grupo]
+        y_exp = np.array([k for _, k, _ in tripletas], dtype=float)[grupo]
+        y_r1 = np.array([pos_clase[e, k] for e, k, _ in tripletas], dtype=np.int64)[grupo]
+        n_r1, rhs_r1 = len(clases), np.repeat([float(len(clases[clase])) for clase in clases], n_t)
+        claves_y = [(e, k, p, m, t) for (e, k, p) in tripletas for m in M for t in T]
+        tamano_clase = np.array([len(clases[e, k]) for e, k, _ in tripletas], dtype=float)[grupo]
+        tipo_y, ub_y = "I", np.minimum(tamano_clase, capacidad[y_p])
+        tripulantes = np.bincount([pos_activo[p] for _, _, p in tripletas], minlength=len(P_activos),
+                                  weights=[len(clases[e, k]) for e, k, _ in tripletas])
+    else:
+        pares_cp = compat["pares_cp"]
+        pos_c = {c: i for i, c in enumerate(compat["vehiculos_por_carabinero"])}
+        grupo, y_m, y_t = _expandir(len(pares_cp), n_m, n_t)
+        y_p = np.array([pos_activo[p] for _, p in pares_cp], dtype=np.int64)[grupo]
+        y_exp = np.array([q[c] for c, _ in pares_cp], dtype=float)[grupo]
+        y_r1 = np.array([pos_c[c] for c, _ in pares_cp], dtype=np.int64)[grupo]
+        n_r1, rhs_r1 = len(pos_c), np.ones(len(pos_c) * n_t)
+        claves_y = [(c, p, m, t) for (c, p) in pares_cp for m in M for t in T]
+        tipo_y, ub_y = "B", np.ones(len(claves_y))
+        tripulantes = np.bincount([pos_activo[p] for _, p in pares_cp], minlength=len(P_activos))
+
+    if ajustada:
+        # Reducción de coeficientes de R3 y R8 (ver construir_modelo)
+        y_exp = np.minimum(y_exp, 4)
+        capacidad = np.minimum(capacidad, tripulantes)
+
+    # Desplazamientos de cada familia en el vector de columnas
+    n_x, n_y = len(claves_x), len(claves_y)
+    col_x, col_y = np.arange(n_x), n_x + np.arange(n_y)
+    ini_phi = n_x + n_y
+    ini_u = ini_phi + len(P) * n_t
+    ini_zeta = ini_u + n_z * mt
+    n = ini_zeta + n_z * n_t
+
+    def col_phi(p, t):
+        return ini_phi + p * n_t + t
+
+    def col_u(z, m, t):
+        return ini_u + z * mt + m * n_t + t
+
+    def col_zeta(z, t):
+        return ini_zeta + z * n_t + t
+
+    familias = {
+        "x": {"claves": claves_x, "inicio": 0, "tipo": "B", "lb": np.zeros(n_x), "ub": np.ones(n_x)},
+        "n" if agregado else "y": {"claves": claves_y, "inicio": n_x, "tipo": tipo_y,
+                                   "lb": np.zeros(n_y), "ub": ub_y},
+        "phi": {"claves": [(p, t) for p in P for t in T], "inicio": ini_phi, "tipo": "B",
+                "lb": np.zeros(len(P) * n_t), "ub": np.ones(len(P) * n_t)},
+        "u": {"claves": [(z, m, t) for z in Z for m in M for t in T], "inicio": ini_u, "tipo": "C",
+              "lb": np.zeros(n_z * mt), "ub": np.full(n_z * mt, np.inf)},
+        "zeta": {"claves": [(z, t) for z in Z for t in T], "inicio": ini_zeta, "tipo": "C",
+                 "lb": np.zeros(n_z * n_t), "ub": np.ones(n_z * n_t)},
+    }
+
+    # Filas "patrulla activa" (p,m,t) para p en P_activos: sum_z x[p,z,m,t]
+    n_pmt = len(P_activos) * mt
+    x_pmt = x_p * mt + x_m * n_t + x_t
+    y_pmt = y_p * mt + y_m * n_t + y_t
+    cero = np.zeros(0)
+
+    restricciones = []
+
+    # R1: Asignación diaria única (por carabinero, o por clase en la forma agregada)
+    restricciones.append(("R1_asignacion_diaria_unica",
+                          _bloque(n_r1 * n_t, n, (y_r1 * n_t + y_t, col_y, 1.0)), "<", rhs_r1))
+
+    # R3: 4·patrulla_activa - experiencia <= 0
+    restricciones.append(("R3_experiencia_minima",
+                          _bloque(n_pmt, n, (x_pmt, col_x, 4.0), (y_pmt, col_y, -y_exp)), "<", np.zeros(n_pmt)))
+
+    # R4: patrulla_activa <= 1 (implícita en R9 por turno en la formulación ajustada)
+    if not ajustada:
+        restricciones.append(("R4_asignacion_unica_patrulla",
+                              _bloque(n_pmt, n, (x_pmt, col_x, 1.0)), "<", np.ones(n_pmt)))
+
+    # R6: y[c,p,m,t] - patrulla_activa[p,m,t] <= 0 (implícita en R8 en las formas agregada y ajustada)
+    if not (agregado or ajustada):
+        patrulla_x = sp.csr_matrix((np.ones(n_x), (x_pmt, col_x)), shape=(n_pmt, n_x))
+        y_a_patrulla = sp.csr_matrix((np.ones(n_y), (np.arange(n_y), y_pmt)), shape=(n_y, n_pmt))
+        activa = (y_a_patrulla @ patrulla_x).tocoo()
+        restricciones.append(("R6_carabineros_patrullas_activas",
+                              _bloque(n_y, n, (np.arange(n_y), col_y, 1.0), (activa.row, activa.col, -activa.data)),
+                              "<", np.zeros(n_y)))
+
+    # R7: patrulla_activa - tripulacion <= 0 (implícita en R3 ajustada)
+    if not ajustada:
+        restricciones.append(("R7_limite_carabineros_I",
+                              _bloque(n_pmt, n, (x_pmt, col_x, 1.0), (y_pmt, col_y, -1.0)), "<", np.zeros(n_pmt)))
+
+    # R8: tripulacion - capacidad·patrulla_activa <= 0
+    restricciones.append(("R8_limite_carabineros_II",
+                          _bloque(n_pmt, n, (y_pmt, col_y, 1.0), (x_pmt, col_x, -capacidad[x_p])), "<", np.zeros(n_pmt)))
+
+    # R9: sum_m patrulla_activa - M_big·phi <= 0, para p en P_activos
+    # (ajustada: patrulla_activa[p,m,t] - phi[p,t] <= 0 por turno)
+    if ajustada:
+        fila_pmt = np.arange(n_pmt)
+        restricciones.append(("R9_activacion_vehiculo_I",
+                              _bloque(n_pmt, n, (x_pmt, col_x, 1.0),
+                                      (fila_pmt, col_phi(activo_en_p[fila_pmt // mt], fila_pmt % n_t), -1.0)),
+                              "<", np.zeros(n_pmt)))
+    else:
+        n_pt = len(P_activos) * n_t
+        fila_pt = np.arange(n_pt)
+        restricciones.append(("R9_activacion_vehiculo_I",
+                              _bloque(n_pt, n, (x_p * n_t + x_t, col_x, 1.0),
+                                      (fila_pt, col_phi(activo_en_p[fila_pt // n_t], fila_pt % n_t), -M_big)),
+                              "<", np.zeros(n_pt)))
+
+    # R10: phi - sum_m tripulacion <= 0, para todo p en P
+    n_phi = len(P) * n_t
+    restricciones.append(("R10_activacion_vehiculo_II",
+                          _bloque(n_phi, n, (np.arange(n_phi), ini_phi + np.arange(n_phi), 1.0),
+                                  (activo_en_p[y_p] * n_t + y_t, col_y, -1.0)),
+                          "<", np.zeros(n_phi)))
+
+    # R11: sum_{p de e, t} costo_diario[p,t]·phi[p,t] <= P_e[e]
+    pos_e = {e: i for i, e in enumerate(E)}
+    pares_pe = [(pos_p[p], pos_e[e]) for (p, e) in alpha if e in pos_e]
+    costo = np.array([[sum(w.get((p, v), 0) * O.get((v, t), 0) for v in V) for t in T] for p in P],
+                     dtype=float).reshape(len(P), n_t)
+    r11_p = np.repeat([p for p, _ in pares_pe], n_t).astype(np.int64)
+    r11_e = np.repeat([e for _, e in pares_pe], n_t).astype(np.int64)
+    r11_t = np.tile(np.arange(n_t), len(pares_pe))
+    restricciones.append(("R11_limite_presupuestario",
+                          _bloque(len(E), n, (r11_e, col_phi(r11_p, r11_t), costo[r11_p, r11_t] if len(r11_p) else cero)),
+                          "<", np.array([P_e[e] for e in E], dtype=float)))
+
+    # R12: sum_{p,m} x[p,z,m,t] >= kappa
+    restricciones.append(("R12_patrullaje_diario_obligatorio",
+                          _bloque(n_z * n_t, n, (x_z * n_t + x_t, col_x, 1.0)), ">", np.full(n_z * n_t, float(kappa))))
+
+    # R13: zeta[z,t] - zeta[z,t-1] - lambda·sum_m u[z,m,t-1] + Gamma/10·cobertura[z,t] = constante
+    # Filas: primero el día inicial de cada zona y luego (z, t) para t > t0
+    def fila_r13(z, t):
+        return np.where(t == 0, z, n_z + z * (n_t - 1) + t - 1)
+
+    criminalidad = np.array([sum(I.get((d, z), 0) * IDD[d] for d in D) for z in Z], dtype=float)
+    zz, tt = np.repeat(np.arange(n_z), n_t), np.tile(np.arange(n_t), n_z)
+    siguientes = tt > 0
+    uz, um, ut = np.repeat(np.arange(n_z), mt), np.tile(np.repeat(np.arange(n_m), n_t), n_z), np.tile(np.arange(n_t), n_z * n_m)
+    u_con_siguiente = ut < n_t - 1
+    iniciales = np.array([zeta_init[z] for z in Z], dtype=float)
+    u_anterior = parametros.get("u_anterior")
+    if u_anterior is None:
+        rhs_inicial = iniciales + lambda_ * criminalidad
+    else:
+        # Continuación: zeta_init es zeta[z,t0-1] y u_anterior la suma de u[z,m,t0-1]
+        rhs_inicial = iniciales + 0.2 * criminalidad + lambda_ * np.array([u_anterior[z] for z in Z], dtype=float)
+    restricciones.append(("R13_peligrosidad",
+                          _bloque(n_z * n_t, n,
+                                  (fila_r13(zz, tt), col_zeta(zz, tt), 1.0),
+                                  (fila_r13(zz[siguientes], tt[siguientes]), col_zeta(zz[siguientes], tt[siguientes] - 1), -1.0),
+                                  (fila_r13(uz[u_con_siguiente], ut[u_con_siguiente] + 1),
+                                   col_u(uz[u_con_siguiente], um[u_con_siguiente], ut[u_con_siguiente]), -lambda_),
+                                  (fila_r13(x_z, x_t), col_x, Gamma / 10)),
+                          "=", np.concatenate([rhs_inicial, np.repeat(0.2 * criminalidad, n_t - 1)])))
+
+    # R14: u[z,m,t] - zeta[z,t]/3 + cobertura[z,m,t] >= 0 y u >= 0 (la ajustada deja solo la cota)
+    n_u = n_z * mt
+    fila_u = np.arange(n_u)
+    restricciones.append(("R14_peligrosidad_turno",
+                          _bloque(n_u, n, (fila_u, ini_u + fila_u, 1.0), (fila_u, col_zeta(uz, ut), -1 / 3),
+                                  (x_z * mt + x_m * n_t + x_t, col_x, 1.0)),
+                          ">", np.zeros(n_u)))
+    if not ajustada:
+        restricciones.append(("R14_no_negativo",
+                              _bloque(n_u, n, (fila_u, ini_u + fila_u, 1.0)), ">", np.zeros(n_u)))
+
+    objetivo = np.zeros(n)
+    objetivo[ini_zeta:] = 1.0
+    inicio_mip = {int(col_zeta(pos_z[z], 0)): zeta_init.get(z, 0.5) for z in Z}
+
+    return {
+        "familias": familias,
+        "n": n,
+        "objetivo": objetivo,
+        "inicio_mip": inicio_mip,
+        "restricciones": restricciones,
+    }
+
+
+def construir_modelo_matricial(parametros, agregado=False, nombres=False, ajustada=False, perfil=None):
+    """
+    Construye con la API matricial de gurobipy el mismo modelo que construir_modelo.
+
+    Args:
+        parametros: dict retornado por cargar_parametros
+        agregado: usar la formulación agregada (n[e,k,p,m,t])
+        ajustada: usar la formulación ajustada (ver construir_modelo)
+        perfil: perfilador.PerfilConstruccion opcional; forma_matricial se mide como una
+            sola etapa y luego cada familia de variables y cada bloque addMConstr
+        nombres: si True, nombra las variables como addVars (x[p,z,m,t], ...); útil para
+            escribir archivos LP comparables, pero más lento
+
+    Returns:
+        Modelo con model._variables {familia: tupledict} igual que construir_modelo
+    """
+    # gurobipy solo se necesita para este backend; forma_matricial es independiente del solver
+    import gurobipy as gp
+    from gurobipy import GRB
+    from modelo import configurar_parametros
+
+    marca = perfil.marca if perfil is not None else (lambda familia, model=None: None)
+    print("🔧 Iniciando construcción matricial del modelo...")
+    forma = forma_matricial(parametros, agregado=agregado, ajustada=ajustada)
+    marca("forma_matricial")
+    filas = sum(A.shape[0] for _, A, _, _ in forma["restricciones"])
+    no_nulos = sum(A.nnz for _, A, _, _ in forma["restricciones"])
+    print(f"📊 Matriz: {filas:,} filas × {forma['n']:,} columnas, {no_nulos:,} no nulos")
+
+    model = gp.Model("Patrullaje Preventivo")
+    configurar_parametros(model, parametros.get("ajustes_gurobi"))
+    marca("configuracion", model)
+
+    print("✅ Creando variables de decisión...")
+    variables, bloques = {}, []
+    for familia, datos in forma["familias"].items():
+        claves = datos["claves"]
+        nombre = [f"{familia}[{','.join(map(str, clave))}]" for clave in claves] if nombres else familia
+        mvar = model.addMVar(len(claves), lb=datos["lb"], ub=datos["ub"], vtype=datos["tipo"], name=nombre)
+        variables[familia] = gp.tupledict(zip(claves, mvar.tolist()))
+        bloques.append(mvar)
+        print(f"   ✓ Variable {familia}: {len(claves)}")
+        marca(familia, model)
+    todas = gp.hstack(bloques)
+
+    print("✅ Definiendo función objetivo y valores iniciales...")
+    model.setMObjective(None, forma["objetivo"], 0.0, xc=todas, sense=GRB.MINIMIZE)
+    columnas = list(forma["inicio_mip"])
+    if columnas:
+        model.setAttr("Start", todas[columnas].tolist(), list(forma["inicio_mip"].values()))
+    marca("objetivo", model)
+
+    print("✅ Agregando restricciones...")
+    Z, T = parametros["Z"], parametros["T"]
+    restricciones = {}
+    for nombre, A, sentido, rhs in forma["restricciones"]:
+        filas = model.addMConstr(A, todas, sentido, rhs, name=nombre)
+        if nombre == "R13_peligrosidad":
+            # Mismo orden de filas que forma_matricial: día inicial por zona y luego (z, t > t0)
+            claves = [(z, T[0]) for z in Z] + [(z, t) for z in Z for t in T[1:]]
+            restricciones["R13"] = dict(zip(claves, filas.tolist()))
+        print(f"   🔄 {nombre}: {A.shape[0]:,} filas")
+        marca(nombre, model)
+
+    print("✅ Modelo construido exitosamente!")
+    model._variables = variables
+    model._restricciones = restricciones
+    model._agregado = agregado
+    model._ajustada = ajustada
+    return model
@@ -1,18 +1,124 @@
+import os
+import hashlib
+import pickle
 import pandas as pd
 
-def cargar_parametros(modo_testing=True, horizonte="mensual"):
+ARCHIVOS_DATOS = [
+    "zonas.csv", "tipos_delitos.csv", "incidencia_delito.csv", "carabineros.csv",
+    "vehiculos.csv", "costos_diarios.csv", "comisarias.csv",
+]
+DIRECTORIO_CACHE = ".cache/parametros"
+
+# Columna de zonas.csv con la compatibilidad de cada tipo de vehículo (el peatón es compatible siempre)
+COLUMNAS_COMPATIBILIDAD = {
+    2: "compatible_moto",
+    3: "compatible_bici",
+    4: "compatible_caballo",
+    5: "compatible_auto",
+    6: "compatible_furgon"
+}
+
+
+def _clave_cache(directorio_datos, *argumentos):
+    """Hash del contenido de los CSV, del propio cargador y de los argumentos de carga"""
+    h = hashlib.sha256()
+    for nombre in ARCHIVOS_DATOS:
+        with open(os.path.join(directorio_datos, nombre), "rb") as archivo:
+            h.update(archivo.read())
+    with open(__file__, "rb") as archivo:
+        h.update(archivo.read())
+    h.update(repr(argumentos).encode())
+    return h.hexdigest()[:32]
+
+
+def cargar_parametros(modo_testing=True, horizonte="mensual", zonas=None, usar_cache=True, directorio_datos="data"):
     """
     Cargar parámetros del modelo
     
     Args:
         modo_testing: Si True, reduce drasticamente el tamaño
         horizonte: "testing" (7 días), "semanal" (7 días), "mensual" (30 días), "completo" (365 días)
+        zonas: lista opcional de id_zona; si se entrega, las estaciones, carabineros, vehículos y
+            presupuestos se derivan de las comisarías de esas zonas (modo_testing solo fija kappa
+            y el multiplicador de presupuesto)
+        usar_cache: Si True, reutiliza los parámetros ya calculados para los mismos CSV y argumentos
+        directorio_datos: carpeta con los CSV de entrada
     """
+    if not usar_cache:
+        return _construir_parametros(modo_testing, horizonte, zonas, directorio_datos)
+
+    if zonas is not None:
+        zonas = list(zonas)
+    clave = _clave_cache(directorio_datos, modo_testing, horizonte, zonas)
+    ruta = os.path.join(DIRECTORIO_CACHE, f"{clave}.pkl")
+    if os.path.exists(ruta):
+        with open(ruta, "rb") as archivo:
+            parametros = pickle.load(archivo)
+        print(f"⚡ Parámetros cargados desde caché ({ruta})")
+        return parametros
+
+    parametros = _construir_parametros(modo_testing, horizonte, zonas, directorio_datos)
+    os.makedirs(DIRECTORIO_CACHE, exist_ok=True)
+    temporal = f"{ruta}.{os.getpid()}.tmp"
+    with open(temporal, "wb") as archivo:
+        pickle.dump(parametros, archivo, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(temporal, ruta)
+    return parametros
+
+
+def _estaciones_de_zonas(zonas, comisarias_df):
+    """Estaciones (id_comisaria - 1, misma convención que P_e) de las comisarías de las zonas"""
+    seleccion = comisarias_df[comisarias_df["id_zona"].isin(zonas)]
+    return sorted((seleccion["id_comisaria"] - 1).tolist())
+
+
+def _validar_vehiculos_zonas(zonas_sel, comisarias_df, vehiculos_df):
+    """
+    Revisa, zona por zona, los vehículos seleccionados que pueden patrullarla.
+
+    Falla si una zona no tiene ningún vehículo de tipo compatible (R12 no se puede
+    cumplir) y avisa si las comisarías de la zona no aportan vehículos propios.
+    """
+    sin_vehiculos = []
+    for _, zona in zonas_sel.iterrows():
+        z = int(zona["id_zona"])
+        tipos = [1] + [v for v, columna in COLUMNAS_COMPATIBILIDAD.items() if zona[columna]]
+        compatibles = vehiculos_df[vehiculos_df["tipo_medio"].isin(tipos)]
+        if compatibles.empty:
+            sin_vehiculos.append(z)
+            continue
+        estaciones_z = _estaciones_de_zonas([z], comisarias_df)
+        if estaciones_z and not compatibles["id_estacion"].isin(estaciones_z).any():
+            print(f"⚠️  ZONA {z}: sus comisarías {[e + 1 for e in estaciones_z]} no tienen vehículos compatibles; "
+                  f"sus carabineros solo la cubren con vehículos de otras comisarías")
+    if sin_vehiculos:
+        raise ValueError(f"Zonas sin ningún vehículo de tipo compatible en las comisarías seleccionadas: "
+                         f"{sin_vehiculos}; la cobertura mínima (R12) no se puede cumplir")
+
+
+def _construir_parametros(modo_testing, horizonte, zonas, directorio_datos):
+    """Lee los CSV y construye los conjuntos y parámetros con operaciones vectorizadas"""
+    def leer(nombre):
+        return pd.read_csv(os.path.join(directorio_datos, nombre))
+
     # Cargar zonas (Z)
-    zonas_df = pd.read_csv("data/zonas.csv")
+    zonas_df = leer("zonas.csv")
     Z = zonas_df["id_zona"].tolist()
+    comisarias_df = leer("comisarias.csv")
+    estaciones = None
     
-    if modo_testing == True or modo_testing == "diez_zonas" or modo_testing == "cinco_zonas":
+    if zonas is not None:
+        # Zonas explícitas: instancia mínima formada por las comisarías que las atienden
+        desconocidas = sorted(set(zonas) - set(Z))
+        if desconocidas:
+            raise ValueError(f"Zonas inexistentes en zonas.csv: {desconocidas}")
+        Z = list(dict.fromkeys(zonas))
+        estaciones = _estaciones_de_zonas(Z, comisarias_df)
+        print(f"🗺️  ZONAS SELECCIONADAS: {Z} ({len(estaciones)} comisarías)")
+        sin_comisaria = sorted(set(Z) - set(comisarias_df["id_zona"]))
+        if sin_comisaria:
+            print(f"⚠️  Zonas sin comisaría en comisarias.csv (solo las cubren vehículos de las otras comisarías): {sin_comisaria}")
+    elif modo_testing == True or modo_testing == "diez_zonas" or modo_testing == "cinco_zonas":
         # MODO TESTING/5 ZONAS/10 ZONAS: Usar zonas representativas por peligrosidad
         if modo_testing == True:
             Z = Z[:1]  # Solo 1 zona para testing
@@ -27,23 +133,24 @@ def cargar_parametros(modo_testing=True, horizonte="mensual"):
             print(f"📊 MODO 10 ZONAS: Usando {len(Z)} zonas balanceadas (alta/media/baja peligrosidad)")
 
     # Cargar tipos de delitos (D, IDD)
-    delitos_df = pd.read_csv("data/tipos_delitos.csv")
+    delitos_df = leer("tipos_delitos.csv")
     D = delitos_df["id_delito"].tolist()
-    IDD = dict(zip(delitos_df["id_delito"], delitos_df["idd"]))
+    IDD = dict(zip(D, delitos_df["idd"].tolist()))
 
-    # Cargar incidencias (I)
-    incidencia_df = pd.read_csv("data/incidencia_delito.csv")
-    I = {(row["id_delito"], row["id_zona"]): row["incidencia"] 
-         for _, row in incidencia_df.iterrows() 
-         if row["id_zona"] in Z}  # Solo zonas seleccionadas
+    # Cargar incidencias (I), solo zonas seleccionadas
+    incidencia_df = leer("incidencia_delito.csv")
+    incidencia_df = incidencia_df[incidencia_df["id_zona"].isin(Z)]
+    I = dict(zip(zip(incidencia_df["id_delito"].tolist(), incidencia_df["id_zona"].tolist()),
+                 incidencia_df["incidencia"].tolist()))
 
     # Cargar carabineros
-    carab_df = pd.read_csv("data/carabineros.csv")
+    carab_df = leer("carabineros.csv")
     C = carab_df["id_carabinero"].tolist()
-    q = dict(zip(carab_df["id_carabinero"], carab_df["experiencia"]))
-    beta = {(row["id_carabinero"], row["id_estacion"]): 1 for _, row in carab_df.iterrows()}
     
-    if modo_testing == True or modo_testing == "diez_zonas" or modo_testing == "cinco_zonas":
+    if estaciones is not None:
+        C = carab_df.loc[carab_df["id_estacion"].isin(estaciones), "id_carabinero"].tolist()
+        print(f"👮 Carabineros de las comisarías seleccionadas: {len(C)}")
+    elif modo_testing == True or modo_testing == "diez_zonas" or modo_testing == "cinco_zonas":
         # MODO TESTING/5 ZONAS/10 ZONAS: Reducir carabineros
         if modo_testing == True:
             C = C[:100]  # Solo 100 carabineros para testing
@@ -54,14 +161,27 @@ def cargar_parametros(modo_testing=True, horizonte="mensual"):
         else:  # diez_zonas
             C = C[:300]  # Más carabineros para 10 zonas
             print(f"📊 MODO 10 ZONAS: Usando {len(C)} carabineros")
-        q = {c: q[c] for c in C}
-        beta = {(c, e): v for (c, e), v in beta.items() if c in C}
+    carab_sel = carab_df[carab_df["id_carabinero"].isin(C)]
+    q = dict(zip(carab_sel["id_carabinero"].tolist(), carab_sel["experiencia"].tolist()))
+    beta = dict.fromkeys(zip(carab_sel["id_carabinero"].tolist(), carab_sel["id_estacion"].tolist()), 1)
 
     # Cargar vehículos/patrullas
-    vehiculos_df = pd.read_csv("data/vehiculos.csv")
+    vehiculos_df = leer("vehiculos.csv")
+    # vehiculos.csv usa id_estacion = id_comisaria (1-66); se lleva a la convención 0-65 de
+    # carabineros.csv y P_e para que alpha, beta y E hablen de las mismas estaciones
+    vehiculos_df["id_estacion"] = vehiculos_df["id_estacion"] - 1
     P = vehiculos_df["id"].tolist()
     
-    if modo_testing == True or modo_testing == "diez_zonas" or modo_testing == "cinco_zonas":
+    if estaciones is not None:
+        # Vehículos de esas estaciones cuyo tipo puede patrullar al menos una de las zonas
+        zonas_sel = zonas_df[zonas_df["id_zona"].isin(Z)]
+        tipos = [1] + [v for v, columna in COLUMNAS_COMPATIBILIDAD.items() if zonas_sel[columna].any()]
+        vehiculos_df = vehiculos_df[vehiculos_df["id_estacion"].isin(estaciones)
+                                    & vehiculos_df["tipo_medio"].isin(tipos)]
+        P = vehiculos_df["id"].tolist()
+        print(f"🚓 Vehículos compatibles de las comisarías seleccionadas: {len(P)}")
+        _validar_vehiculos_zonas(zonas_sel, comisarias_df, vehiculos_df)
+    elif modo_testing == True or modo_testing == "diez_zonas" or modo_testing == "cinco_zonas":
         # MODO TESTING/5 ZONAS/10 ZONAS: Reducir vehículos
         if modo_testing == True:
             P = P[:50]  # Solo 50 vehículos para testing
@@ -75,7 +195,7 @@ def cargar_parametros(modo_testing=True, horizonte="mensual"):
         vehiculos_df = vehiculos_df[vehiculos_df["id"].isin(P)]
 
     # Conjunto de estaciones (E) y tipos de vehículos (V)
-    E = sorted(carab_df["id_estacion"].unique().tolist())
+    E = sorted(carab_df["id_estacion"].unique().tolist()) if estaciones is None else estaciones
     V = [1, 2, 3, 4, 5, 6]
     
     # Configurar horizonte temporal
@@ -98,77 +218,57 @@ def cargar_parametros(modo_testing=True, horizonte="mensual"):
     M = [1, 2, 3]  # Turnos
 
     # Construir alpha: parámetro binario que indica si el vehículo p pertenece a la estación e
-    alpha = {(row["id"], row["id_estacion"]): 1 
-             for _, row in vehiculos_df.iterrows() 
-             if row["id"] in P}
+    ids_vehiculo = vehiculos_df["id"].tolist()
+    alpha = dict.fromkeys(zip(ids_vehiculo, vehiculos_df["id_estacion"].tolist()), 1)
 
     # Construir w[p,v]: parámetro binario que indica si el vehículo p es de tipo v
-    w = {}
-    for _, row in vehiculos_df.iterrows():
-        if row["id"] in P:
-            p = row["id"]
-            v = row["tipo_medio"]
-            w[(p, v)] = 1
-
-    # Cargar costos de uso de vehículos O[v,t]
-    costos_df = pd.read_csv("data/costos_diarios.csv")
+    w = dict.fromkeys(zip(ids_vehiculo, vehiculos_df["tipo_medio"].tolist()), 1)
+
+    # Cargar costos de uso de vehículos O[v,t] (solo días seleccionados)
+    costos_df = leer("costos_diarios.csv")
+    costos_df = costos_df[costos_df["Dia"].isin(T)]
+    columnas_costo = {
+        1: "Costo_uso_peaton",
+        2: "Costo_uso_moto",
+        3: "Costo_uso_bici",
+        4: "Costo_uso_caballo",
+        5: "Costo_uso_auto",
+        6: "Costo_uso_furgon"
+    }
+    dias = costos_df["Dia"].tolist()
     O = {}
-    for _, row in costos_df.iterrows():
-        t = row["Dia"]
-        if t in T:  # Solo días seleccionados
-            costos_por_tipo = {
-                1: row["Costo_uso_peaton"],
-                2: row["Costo_uso_moto"], 
-                3: row["Costo_uso_bici"],
-                4: row["Costo_uso_caballo"], 
-                5: row["Costo_uso_auto"], 
-                6: row["Costo_uso_furgon"]
-            }
-            for v in V:
-                O[(v, t)] = costos_por_tipo[v]
+    for v in V:
+        O.update(zip(((v, t) for t in dias), costos_df[columnas_costo[v]].tolist()))
 
     # Cargar presupuesto por estación desde comisarias.csv
-    comisarias_df = pd.read_csv("data/comisarias.csv")
     # Mapear IDs de comisaria (1-66) a IDs de estación (0-65)
-    P_e = {}
-    for _, row in comisarias_df.iterrows():
-        estacion_id = row["id_comisaria"] - 1  # Convertir de 1-66 a 0-65
-        if modo_testing == True or modo_testing == "diez_zonas" or modo_testing == "cinco_zonas":
-            # En modo testing/5 zonas/10 zonas, aumentar presupuesto para evitar infactibilidad
-            if modo_testing == True:
-                multiplicador = 10
-            elif modo_testing == "cinco_zonas":
-                multiplicador = 7
-            else:  # diez_zonas
-                multiplicador = 5
-            P_e[estacion_id] = row["presupuesto_anual"] * multiplicador
-        else:
-            P_e[estacion_id] = row["presupuesto_anual"]
+    if modo_testing == True:
+        multiplicador = 10  # En modo testing/5 zonas/10 zonas, aumentar presupuesto para evitar infactibilidad
+    elif modo_testing == "cinco_zonas":
+        multiplicador = 7
+    elif modo_testing == "diez_zonas":
+        multiplicador = 5
+    else:
+        multiplicador = 1
+    P_e = dict(zip((comisarias_df["id_comisaria"] - 1).tolist(),
+                   (comisarias_df["presupuesto_anual"] * multiplicador).tolist()))
+    if estaciones is not None:
+        P_e = {e: P_e[e] for e in estaciones}
 
     # Compatibilidad vehículo-zona r[v,z]
+    zonas_sel = zonas_df[zonas_df["id_zona"].isin(Z)]  # Solo zonas seleccionadas
+    ids_zona = zonas_sel["id_zona"].tolist()
     r = {}
-    vehiculo_cols = {
-        2: "compatible_moto",
-        3: "compatible_bici",
-        4: "compatible_caballo",
-        5: "compatible_auto",
-        6: "compatible_furgon"
-    }
-    for _, row in zonas_df.iterrows():
-        z = row["id_zona"]
-        if z in Z:  # Solo zonas seleccionadas
-            for v in V:
-                if v == 1:
-                    r[(v, z)] = 1  # peatón compatible en todas las zonas
-                else:
-                    r[(v, z)] = row[vehiculo_cols[v]]
+    for z in ids_zona:
+        r[(1, z)] = 1  # peatón compatible en todas las zonas
+    for v, columna in COLUMNAS_COMPATIBILIDAD.items():
+        r.update(zip(((v, z) for z in ids_zona), zonas_sel[columna].tolist()))
+
+    # Peligrosidad teórica de cada zona: sum_d I[d,z] * IDD[d]
+    peligrosidad_zona = {z: sum(I.get((d, z), 0) * IDD[d] for d in D) for z in Z}
 
     # Calcular Gamma según la documentación: máximo de peligrosidad teórica entre todas las zonas
-    Gamma = 0
-    for z in Z:
-        peligrosidad_zona = sum(I.get((d, z), 0) * IDD[d] for d in D)
-        if peligrosidad_zona > Gamma:
-            Gamma = peligrosidad_zona
+    Gamma = max([0] + list(peligrosidad_zona.values()))
     
     # Evitar división por cero
     if Gamma == 0:
@@ -176,15 +276,8 @@ def cargar_parametros(modo_testing=True, horizonte="mensual"):
 
     # Peligrosidad inicial zeta[z,1] para cada zona SIN normalizar por Gamma
     # Esto hace que zonas más peligrosas requieran proporcionalmente más patrullas
-    zeta = {}
-    for z in Z:
-        total = 0
-        for d in D:
-            incidencia = I.get((d, z), 0)   # Puede ser 0 si no hay datos para (d,z)
-            daño = IDD.get(d, 0)            # Índice de daño del delito
-            total += incidencia * daño
-        # NO normalizar por Gamma - usar valor absoluto para reflejar peligrosidad real
-        zeta[z] = max(total, 0.05)  # Mínimo 0.05 para evitar zonas con 0 peligrosidad
+    # NO normalizar por Gamma - usar valor absoluto para reflejar peligrosidad real
+    zeta = {z: max(peligrosidad_zona[z], 0.05) for z in Z}  # Mínimo 0.05 para evitar zonas con 0 peligrosidad
 
     # Capacidad máxima por tipo de vehículo R_v
     R_v = {
@@ -216,5 +309,147 @@ def cargar_parametros(modo_testing=True, horizonte="mensual"):
         "C": C, "P": P, "E": E, "V": V, "Z": Z, "T": T, "M": M, "D": D,
         "q": q, "I": I, "IDD": IDD, "O": O, "P_e": P_e,
         "r": r, "w": w, "zeta": zeta, "beta": beta, "R_v": R_v,
-        "alpha": alpha, "Gamma": Gamma, "lambda": lambda_, "kappa": kappa, "M_big": M_big
+        "alpha": alpha, "Gamma": Gamma, "lambda": lambda_, "kappa": kappa, "M_big": M_big,
+        "multiplicador_presupuesto": multiplicador
+    }
+
+
+def aplicar_escenario(parametros, escenario):
+    """
+    Copia de los parámetros con los valores de un escenario de sensibilidad.
+
+    Args:
+        parametros: dict retornado por cargar_parametros (no se modifica)
+        escenario: dict con claves opcionales "kappa", "lambda" y "multiplicador_presupuesto"
+            (este último reemplaza al multiplicador del modo y reescala P_e)
+    """
+    desconocidas = set(escenario) - {"kappa", "lambda", "multiplicador_presupuesto"}
+    if desconocidas:
+        raise ValueError(f"Parámetros de escenario no soportados: {sorted(desconocidas)}")
+    sub = dict(parametros)
+    for clave in ("kappa", "lambda"):
+        if clave in escenario:
+            sub[clave] = float(escenario[clave])
+    if "multiplicador_presupuesto" in escenario:
+        factor = escenario["multiplicador_presupuesto"] / parametros["multiplicador_presupuesto"]
+        sub["P_e"] = {e: presupuesto * factor for e, presupuesto in parametros["P_e"].items()}
+        sub["multiplicador_presupuesto"] = escenario["multiplicador_presupuesto"]
+    return sub
+
+
+def calcular_compatibilidad(parametros):
+    """
+    Índice de compatibilidad para generar solo tuplas factibles de x e y.
+
+    Un carabinero c puede usar el vehículo p solo si ambos pertenecen a la misma
+    estación (R2: sum_e beta[c,e]*alpha[p,e] >= 1) y el vehículo p puede operar en la
+    zona z solo si su tipo es compatible con ella (R5: sum_v w[p,v]*r[v,z] >= 1).
+    Además se descartan los vehículos sin carabineros compatibles (R7 los anula) y
+    sin zonas compatibles (R6 anula a sus carabineros).
+    """
+    C, P, Z = parametros["C"], parametros["P"], parametros["Z"]
+    beta, alpha = parametros["beta"], parametros["alpha"]
+    w, r = parametros["w"], parametros["r"]
+
+    # Estaciones de cada carabinero y de cada vehículo
+    estaciones_carabinero = {}
+    for (c, e) in beta:
+        estaciones_carabinero.setdefault(c, set()).add(e)
+    estaciones_vehiculo = {}
+    for (p, e) in alpha:
+        estaciones_vehiculo.setdefault(p, set()).add(e)
+
+    carabineros_por_estacion = {}
+    for c in C:
+        for e in estaciones_carabinero.get(c, ()):
+            carabineros_por_estacion.setdefault(e, []).append(c)
+
+    # Zonas compatibles por vehículo (según su tipo)
+    tipos_vehiculo = {}
+    for (p, v) in w:
+        tipos_vehiculo.setdefault(p, []).append(v)
+    zonas_por_vehiculo = {}
+    for p in P:
+        zonas = [z for z in Z if any(r.get((v, z), 0) for v in tipos_vehiculo.get(p, ()))]
+        if zonas:
+            zonas_por_vehiculo[p] = zonas
+
+    # Carabineros compatibles por vehículo (misma estación)
+    carabineros_por_vehiculo = {}
+    for p in P:
+        if p not in zonas_por_vehiculo:
+            continue
+        carabineros = []
+        for e in sorted(estaciones_vehiculo.get(p, ())):
+            carabineros.extend(carabineros_por_estacion.get(e, []))
+        if carabineros:
+            carabineros_por_vehiculo[p] = list(dict.fromkeys(carabineros))
+
+    # Solo vehículos con zona y tripulación compatibles pueden patrullar
+    P_activos = [p for p in P if p in carabineros_por_vehiculo]
+    zonas_por_vehiculo = {p: zonas_por_vehiculo[p] for p in P_activos}
+
+    vehiculos_por_zona = {z: [] for z in Z}
+    for p in P_activos:
+        for z in zonas_por_vehiculo[p]:
+            vehiculos_por_zona[z].append(p)
+
+    vehiculos_por_carabinero = {}
+    for p in P_activos:
+        for c in carabineros_por_vehiculo[p]:
+            vehiculos_por_carabinero.setdefault(c, []).append(p)
+
+    return {
+        "P_activos": P_activos,
+        "pares_pz": [(p, z) for p in P_activos for z in zonas_por_vehiculo[p]],
+        "pares_cp": [(c, p) for p in P_activos for c in carabineros_por_vehiculo[p]],
+        "zonas_por_vehiculo": zonas_por_vehiculo,
+        "vehiculos_por_zona": vehiculos_por_zona,
+        "carabineros_por_vehiculo": carabineros_por_vehiculo,
+        "vehiculos_por_carabinero": vehiculos_por_carabinero,
     }
+
+
+def clases_experiencia(parametros, compat):
+    """
+    Agrupa a los carabineros compatibles por (estación, experiencia).
+
+    Dentro de una clase los carabineros son intercambiables para el modelo, por lo
+    que la formulación agregada solo necesita saber cuántos de cada clase usa cada
+    patrulla. Retorna las clases y las estaciones de cada vehículo activo.
+    """
+    q, beta, alpha = parametros["q"], parametros["beta"], parametros["alpha"]
+    clases = {}
+    for (c, e) in beta:
+        if c in compat["vehiculos_por_carabinero"]:
+            clases.setdefault((e, q[c]), []).append(c)
+    estaciones_vehiculo = {}
+    for (p, e) in alpha:
+        if p in compat["carabineros_por_vehiculo"]:
+            estaciones_vehiculo.setdefault(p, []).append(e)
+    return clases, estaciones_vehiculo
+
+
+def asignar_carabineros(parametros, dotacion):
+    """
+    Post-proceso de la formulación agregada: asigna IDs de carabineros.
+
+    Args:
+        dotacion: dict {(e, k, p, m, t): cantidad} con los valores de n en la solución
+
+    Returns:
+        Lista de tuplas (c, p, m, t) equivalentes a las variables y activas
+    """
+    compat = calcular_compatibilidad(parametros)
+    clases, _ = clases_experiencia(parametros, compat)
+    # R1 agregada garantiza que cada clase alcanza para todo el día
+    disponibles = {}
+    asignaciones = []
+    for (e, k, p, m, t), cantidad in sorted(dotacion.items()):
+        cantidad = int(round(cantidad))
+        if cantidad <= 0:
+            continue
+        libres = disponibles.setdefault((e, k, t), list(clases[e, k]))
+        for _ in range(cantidad):
+            asignaciones.append((libres.pop(0), p, m, t))
+    return asignaciones
@@ -0,0 +1,176 @@
+"""
+PERFILADOR DE CONSTRUCCIÓN POR FAMILIA
+Mide, para cada familia de variables y restricciones que agrega construir_modelo
+(x, y|n, phi, u, zeta, R1-R14, más el índice de compatibilidad que reemplaza R2/R5),
+el tiempo de reloj, el delta de RSS del proceso (incluye la memoria de Gurobi), la
+memoria Python asignada (tracemalloc, opcional: multiplica el tiempo de construcción,
+así que los tiempos solo son comparables entre corridas con la misma opción) y las
+filas, columnas y no nulos que agregó. El reporte se guarda como JSON y CSV y se
+puede imprimir como tabla.
+
+El constructor llama a perfil.marca(nombre, model) al terminar cada familia: cada
+marca mide desde la anterior y hace model.update() para que el costo de Gurobi quede
+en la familia que lo generó (sin perfil no se llama a update entre familias).
+
+Uso:
+    python perfilador.py [--testing | --cinco-zonas] [--completo] [--agregado] [--ajustada]
+        [--matricial] [--memoria-python] [--destino resultados/perfiles]
+"""
+
+import os
+import sys
+import json
+import time
+import resource
+import tracemalloc
+
+DIRECTORIO_PERFILES = "resultados/perfiles"
+COLUMNAS = ["familia", "tiempo", "rss_mb", "python_mb", "python_pico_mb", "filas", "columnas", "no_nulos"]
+
+
+def _rss_mb():
+    """RSS actual del proceso (Linux: /proc/self/statm; si no, el pico de getrusage)"""
+    try:
+        with open("/proc/self/statm") as archivo:
+            return int(archivo.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except (OSError, ValueError, IndexError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _tamano(model):
+    if model is None:
+        return 0, 0, 0
+    model.update()
+    return model.NumConstrs, model.NumVars, model.NumNZs
+
+
+class PerfilConstruccion:
+    """Registro de marcas por familia; se pasa a construir_modelo(..., perfil=perfil)"""
+
+    def __init__(self, memoria_python=False):
+        self.memoria_python = memoria_python
+        self.registros = []
+        self._tamano = (0, 0, 0)
+        if memoria_python and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        self._inicio = time.perf_counter()
+        self._rss = _rss_mb()
+        self._python = tracemalloc.get_traced_memory()[0] if memoria_python else 0
+        self._inicio_total = self._inicio
+
+    def marca(self, familia, model=None):
+        """Cierra la familia: mide desde la marca anterior hasta ahora (incluye model.update())"""
+        filas, columnas, no_nulos = _tamano(model)
+        ahora, rss = time.perf_counter(), _rss_mb()
+        registro = {
+            "familia": familia,
+            "tiempo": ahora - self._inicio,
+            "rss_mb": rss - self._rss,
+            "filas": filas - self._tamano[0],
+            "columnas": columnas - self._tamano[1],
+            "no_nulos": no_nulos - self._tamano[2],
+        }
+        if self.memoria_python:
+            actual, pico = tracemalloc.get_traced_memory()
+            registro["python_mb"] = (actual - self._python) / 2**20
+            registro["python_pico_mb"] = (pico - self._python) / 2**20
+            tracemalloc.reset_peak()
+            self._python = actual
+        self.registros.append(registro)
+        if model is not None:
+            self._tamano = (filas, columnas, no_nulos)
+        # La medición (update y lectura de RSS) no se cuenta en la familia siguiente
+        self._inicio, self._rss = time.perf_counter(), _rss_mb()
+
+    def reporte(self):
+        """Registros más los totales de la construcción"""
+        total = {clave: sum(r.get(clave, 0) for r in self.registros)
+                 for clave in ("tiempo", "rss_mb", "filas", "columnas", "no_nulos")}
+        total["tiempo_reloj"] = time.perf_counter() - self._inicio_total
+        return {"familias": self.registros, "total": total, "memoria_python": self.memoria_python}
+
+    def guardar(self, directorio=DIRECTORIO_PERFILES, nombre="perfil_construccion", metadatos=None):
+        """Escribe <nombre>.json (reporte + metadatos) y <nombre>.csv (una fila por familia)"""
+        import pandas as pd
+
+        os.makedirs(directorio, exist_ok=True)
+        reporte = self.reporte()
+        reporte.update(metadatos or {})
+        with open(os.path.join(directorio, f"{nombre}.json"), "w", encoding="utf-8") as archivo:
+            json.dump(reporte, archivo, indent=2, default=str)
+        columnas = [c for c in COLUMNAS if self.memoria_python or not c.startswith("python")]
+        pd.DataFrame(self.registros, columns=columnas).to_csv(os.path.join(directorio, f"{nombre}.csv"), index=False)
+        print(f"💾 Perfil de construcción guardado en {directorio}/{nombre}.json y .csv")
+
+    def mostrar(self, ordenar=True):
+        """Tabla en consola, por defecto de la familia más costosa a la menos costosa"""
+        reporte = self.reporte()
+        total_tiempo = reporte["total"]["tiempo"] or 1e-12
+        registros = sorted(self.registros, key=lambda r: -r["tiempo"]) if ordenar else self.registros
+        ancho = max([len(r["familia"]) for r in self.registros] + [len("familia")]) + 2
+        print("\n🔬 PERFIL DE CONSTRUCCIÓN POR FAMILIA")
+        encabezado = f"   {'familia':<{ancho}}{'tiempo':>10}{'%':>7}{'ΔRSS MB':>10}"
+        if self.memoria_python:
+            encabezado += f"{'py MB':>9}{'py pico':>9}"
+        print(encabezado + f"{'filas':>12}{'columnas':>12}{'no nulos':>13}")
+        for r in registros:
+            linea = f"   {r['familia']:<{ancho}}{r['tiempo']:>9.3f}s{100 * r['tiempo'] / total_tiempo:>6.1f}%{r['rss_mb']:>10.1f}"
+            if self.memoria_python:
+                linea += f"{r['python_mb']:>9.1f}{r['python_pico_mb']:>9.1f}"
+            print(linea + f"{r['filas']:>12,}{r['columnas']:>12,}{r['no_nulos']:>13,}")
+        t = reporte["total"]
+        print(f"   {'TOTAL':<{ancho}}{t['tiempo']:>9.3f}s{'':>7}{t['rss_mb']:>10.1f}"
+              + (" " * 18 if self.memoria_python else "")
+              + f"{t['filas']:>12,}{t['columnas']:>12,}{t['no_nulos']:>13,}")
+
+
+def perfilar_construccion(parametros, agregado=False, matricial=False, ajustada=False, memoria_python=False):
+    """
+    Construye el modelo con un perfil activo.
+
+    Returns:
+        (modelo, perfil)
+    """
+    from modelo import construir_modelo
+
+    perfil = PerfilConstruccion(memoria_python=memoria_python)
+    modelo = construir_modelo(parametros, agregado=agregado, matricial=matricial, ajustada=ajustada, perfil=perfil)
+    return modelo, perfil
+
+
+if __name__ == "__main__":
+    from parametros import cargar_parametros
+
+    modo_testing, horizonte = "cinco_zonas", "mensual"
+    agregado = matricial = ajustada = memoria_python = False
+    destino = DIRECTORIO_PERFILES
+
+    argumentos = iter(sys.argv[1:])
+    for arg in argumentos:
+        if arg == "--testing":
+            modo_testing, horizonte = True, "testing"
+        elif arg == "--cinco-zonas":
+            modo_testing = "cinco_zonas"
+        elif arg == "--completo":
+            horizonte = "completo"
+        elif arg == "--agregado":
+            agregado = True
+        elif arg == "--ajustada":
+            ajustada = True
+        elif arg == "--matricial":
+            matricial = True
+        elif arg == "--memoria-python":
+            memoria_python = True
+        elif arg == "--destino":
+            destino = next(argumentos, destino)
+        else:
+            print(f"❌ Argumento desconocido: {arg}")
+            print(__doc__)
+            sys.exit(1)
+
+    parametros = cargar_parametros(modo_testing=modo_testing, horizonte=horizonte)
+    _, perfil = perfilar_construccion(parametros, agregado=agregado, matricial=matricial, ajustada=ajustada,
+                                      memoria_python=memoria_python)
+    perfil.mostrar()
+    perfil.guardar(destino, metadatos={"modo": modo_testing, "horizonte": horizonte, "agregado": agregado,
+                                       "matricial": matricial, "ajustada": ajustada})
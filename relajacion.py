@@ -0,0 +1,107 @@
+"""
+MODO RÁPIDO: RELAJACIÓN LINEAL + REDONDEO
+Para preguntas "¿qué pasa si...?" que necesitan una curva de peligrosidad en
+segundos: resuelve la relajación LP del modelo (por defecto la formulación agregada,
+más compacta), redondea las patrullas x[p,z,m,t] fraccionarias y repara el plan con
+la heurística greedy, que respeta R1-R11 (un turno por vehículo R4, tripulación y
+capacidad R3/R8, presupuesto R11) y completa la cobertura R12.
+
+El valor de la relajación es una cota inferior del óptimo, así que el resultado
+trae su propio gap.
+"""
+
+import numpy as np
+from heuristica import construir_solucion_heuristica, plan_factible
+
+# Presupuesto de patrullas LP fraccionarias a reparar entre todos los redondeos
+# aleatorios: cada muestra es una pasada completa de la heurística, así que en
+# instancias grandes (anual, completo) se hacen menos muestras
+PRESUPUESTO_MUESTREO = 100_000
+MAX_MUESTRAS = 20
+
+
+def resolver_relajacion(parametros, agregado=True, matricial=True, ajustada=False):
+    """
+    Resuelve la relajación LP de construir_modelo.
+
+    Returns:
+        (cota, x_lp): valor de la relajación y dict {(p, z, m, t): valor} con las x
+        fraccionarias positivas, o (None, {}) si el LP no tiene óptimo
+    """
+    from gurobipy import GRB, GurobiError
+    from modelo import construir_modelo
+
+    modelo = construir_modelo(parametros, agregado=agregado, matricial=matricial, ajustada=ajustada)
+    modelo.update()
+    relajado = modelo.relax()
+    try:
+        relajado.optimize()
+    except GurobiError as error:
+        print(f"❌ No se pudo resolver la relajación LP: {error}")
+        return None, {}
+    if relajado.status != GRB.OPTIMAL:
+        print(f"❌ La relajación LP no tiene óptimo. Status: {relajado.status}")
+        return None, {}
+
+    x = modelo._variables["x"]
+    columnas = relajado.getVars()
+    valores = relajado.getAttr("X", [columnas[var.index] for var in x.values()])
+    x_lp = {clave: valor for clave, valor in zip(x.keys(), valores) if valor > 1e-6}
+    cota = relajado.ObjVal
+    relajado.dispose()
+    modelo.dispose()
+    return cota, x_lp
+
+
+def redondear(parametros, x_lp, muestras=None, semilla=0):
+    """
+    Redondeo del LP con reparación heurística; retorna el mejor plan factible.
+
+    Candidatos: el redondeo por umbral (x >= 0.5), `muestras` redondeos aleatorios
+    (cada patrulla se conserva con probabilidad igual a su valor LP) y la heurística
+    sin plan base. Las patrullas conservadas se ofrecen a la heurística en orden de
+    valor LP decreciente; las que violan alguna restricción se descartan. Con
+    muestras=None se escala con el tamaño del LP (entre 1 y MAX_MUESTRAS).
+    """
+    if not x_lp:
+        return construir_solucion_heuristica(parametros)
+    if muestras is None:
+        muestras = max(1, min(MAX_MUESTRAS, PRESUPUESTO_MUESTREO // len(x_lp)))
+    rng = np.random.default_rng(semilla)
+    claves = sorted(x_lp, key=lambda clave: -x_lp[clave])
+    valores = np.array([x_lp[clave] for clave in claves])
+
+    bases = [[clave for clave, valor in zip(claves, valores) if valor >= 0.5]]
+    for _ in range(muestras):
+        elegidas = rng.random(len(valores)) < valores
+        bases.append([clave for clave, elegida in zip(claves, elegidas) if elegida])
+    bases.append(None)
+
+    mejor = None
+    for base in bases:
+        plan = construir_solucion_heuristica(parametros, plan_base={"x": base, "y": []} if base is not None else None)
+        factible = plan_factible(plan)
+        if mejor is None or (factible, -plan["objetivo"]) > (plan_factible(mejor), -mejor["objetivo"]):
+            mejor = plan
+    return mejor
+
+
+def resolver_rapido(parametros, agregado=True, muestras=None, semilla=0, ajustada=False):
+    """
+    Relajación LP + redondeo con reparación.
+
+    Returns:
+        (plan, cota_lp): plan en el formato de construir_solucion_heuristica y valor de
+        la relajación (None si el LP falló; el plan sale entonces solo de la heurística).
+        Con ajustada=True la relajación es la de la formulación ajustada (cota más alta).
+        muestras=None escala los redondeos aleatorios al tamaño de la instancia
+    """
+    print("⚡ MODO RÁPIDO: relajación LP + redondeo con reparación")
+    cota, x_lp = resolver_relajacion(parametros, agregado=agregado, ajustada=ajustada)
+    plan = redondear(parametros, x_lp, muestras=muestras, semilla=semilla)
+    print(f"   • Cota LP: {cota if cota is not None else float('nan'):.6f}")
+    print(f"   • Objetivo redondeado: {plan['objetivo']:.6f} "
+          f"({'factible' if plan_factible(plan) else 'con cobertura o zeta fuera de rango'})")
+    if cota is not None:
+        print(f"   • Gap: {(plan['objetivo'] - cota) / max(abs(plan['objetivo']), 1e-9):.2%}")
+    return plan, cota
@@ -0,0 +1,222 @@
+"""
+REPLANIFICACIÓN INCREMENTAL
+Cuando los días 1..k del plan ya ocurrieron, fija x, y y phi de esos días según el
+plan ejecutado, reemplaza zeta por la peligrosidad observada, actualiza la incidencia
+I de las zonas que cambiaron (lado derecho de R13) y reoptimiza solo el resto del
+horizonte partiendo del plan anterior como MIP start.
+
+El modelo se modifica en su lugar (cotas, lado derecho y filas R13 de los días
+transcurridos), así que puede reutilizarse día a día sin reconstruirlo, siempre
+que k no disminuya.
+
+Uso:
+    python replanificacion.py --dias 7 [--origen resultados/solucion] [--destino resultados/replanificacion]
+        [--zeta-observada zeta.csv] [--incidencia-observada incidencia.csv] [--tiempo 120]
+
+zeta.csv tiene columnas z,t,valor; incidencia.csv el mismo esquema que data/incidencia_delito.csv.
+"""
+
+import sys
+import pandas as pd
+from parametros import cargar_parametros, asignar_carabineros
+from heuristica import criminalidad_base, cargar_inicio_mip, valores_plan
+from resultados import (DIRECTORIO_SOLUCION, cargar_tablas, cargar_metadatos, plan_desde_tablas,
+                        extraer_solucion, tabla_desde_claves, guardar_resultados)
+
+DIRECTORIO_REPLANIFICACION = "resultados/replanificacion"
+FAMILIAS_FIJADAS = ("x", "y", "n", "phi")
+
+
+def preparar_replanificacion(modelo, parametros, plan, dias_transcurridos, zeta_observada=None,
+                             incidencia_observada=None):
+    """
+    Modifica el modelo en su lugar para reoptimizar desde el día dias_transcurridos + 1.
+
+    Args:
+        modelo: modelo de construir_modelo (con model._restricciones["R13"])
+        parametros: parámetros con los que se construyó o se preparó por última vez el modelo
+        plan: plan anterior (formato de construir_solucion_heuristica, p.ej. plan_desde_tablas)
+        dias_transcurridos: cantidad k de días del horizonte que ya ocurrieron
+        zeta_observada: dict {(z, t): valor} con la peligrosidad observada en días
+            transcurridos; los (z, t) sin observación siguen la dinámica R13. Se acumula
+            con las observaciones de llamadas anteriores sobre el mismo modelo
+        incidencia_observada: dict {(d, z): incidencia} que reemplaza esas entradas de I
+
+    Returns:
+        Copia de los parámetros con la incidencia actualizada (para la próxima llamada)
+    """
+    from gurobipy import GRB
+
+    T = parametros["T"]
+    if dias_transcurridos < getattr(modelo, "_dias_transcurridos", 0):
+        raise ValueError(f"El modelo ya se replanificó desde el día {modelo._dias_transcurridos + 1}: "
+                         "las filas R13 de esos días se eliminaron; reconstruye el modelo para retroceder")
+    transcurridos = set(T[:dias_transcurridos])
+    variables = modelo._variables
+    modelo._dias_transcurridos = dias_transcurridos
+    modelo.update()
+
+    # Una replanificación anterior sobre el mismo modelo puede haber fijado otros días
+    originales = getattr(modelo, "_cotas_originales", {})
+    if originales:
+        lista = list(originales)
+        modelo.setAttr("LB", lista, [originales[v][0] for v in lista])
+        modelo.setAttr("UB", lista, [originales[v][1] for v in lista])
+    modelo._cotas_originales = {}
+
+    # El plan anterior como inicio; sus valores de los días transcurridos son los que se fijan
+    cargar_inicio_mip(modelo, plan, parametros)
+    del_plan = valores_plan(plan, parametros, variables)
+    # Las filas R13 de observaciones anteriores ya se eliminaron: esas zeta se vuelven a fijar
+    zeta_observada = {**getattr(modelo, "_zeta_observada", {}), **(zeta_observada or {})}
+    fijadas, valores = [], []
+    for familia in FAMILIAS_FIJADAS:
+        if familia in variables:
+            for clave, var in variables[familia].items():
+                if clave[-1] in transcurridos:
+                    fijadas.append(var)
+                    valores.append(del_plan[familia].get(clave, 0.0))
+    observadas = {clave: valor for clave, valor in zeta_observada.items() if clave[1] in transcurridos}
+    modelo._zeta_observada = observadas
+    for clave, valor in observadas.items():
+        fijadas.append(variables["zeta"][clave])
+        valores.append(valor)
+    cotas = zip(modelo.getAttr("LB", fijadas), modelo.getAttr("UB", fijadas))
+    modelo._cotas_originales = dict(zip(fijadas, cotas))
+    modelo.setAttr("LB", fijadas, valores)
+    modelo.setAttr("UB", fijadas, valores)
+
+    # La dinámica R13 de los (z, t) observados queda reemplazada por la observación
+    r13 = modelo._restricciones["R13"]
+    quitar = [clave for clave in observadas if clave in r13]
+    modelo.remove([r13.pop(clave) for clave in quitar])
+
+    # Nueva incidencia: solo cambia el término constante de R13 (0.2·criminalidad, o
+    # lambda·criminalidad en el día inicial sin u_anterior). Las filas de días transcurridos
+    # no se tocan: esos días ya ocurrieron con la incidencia anterior
+    actualizados = dict(parametros)
+    anterior = getattr(modelo, "_criminalidad", None) or criminalidad_base(parametros)
+    if incidencia_observada:
+        actualizados["I"] = {**parametros["I"], **incidencia_observada}
+    nueva = criminalidad_base(actualizados)
+    filas, deltas = [], []
+    for (z, t), fila in r13.items():
+        delta = nueva[z] - anterior[z]
+        if delta and t not in transcurridos:
+            inicial = t == T[0] and parametros.get("u_anterior") is None
+            filas.append(fila)
+            deltas.append((parametros["lambda"] if inicial else 0.2) * delta)
+    if filas:
+        rhs = [valor + delta for valor, delta in zip(modelo.getAttr("RHS", filas), deltas)]
+        modelo.setAttr("RHS", filas, rhs)
+    modelo._criminalidad = nueva
+
+    # Las continuas se recalculan: el plan anterior ya no es consistente con la zeta observada
+    for familia in ("u", "zeta"):
+        lista = list(variables[familia].values())
+        modelo.setAttr("Start", lista, [GRB.UNDEFINED] * len(lista))
+
+    print(f"🔁 Replanificación: {len(transcurridos)} días fijados ({len(fijadas):,} variables), "
+          f"{len(quitar)} filas R13 reemplazadas por zeta observada, "
+          f"{len(filas)} lados derechos de R13 actualizados")
+    return actualizados
+
+
+def replanificar(dias_transcurridos, directorio=DIRECTORIO_SOLUCION, zeta_observada=None,
+                 incidencia_observada=None, tiempo_limite=120, modelo=None, parametros=None, plan=None):
+    """
+    Reoptimiza el resto del horizonte de una solución guardada.
+
+    Si no se entregan, el plan se lee de `directorio`, los parámetros se recargan con el
+    modo, horizonte y zonas de sus metadatos y el modelo se construye con la misma
+    formulación. Para replanificar varias veces, pasa de vuelta el modelo, los
+    parámetros retornados y plan_desde_tablas(tablas) como plan.
+
+    Returns:
+        (tablas, objetivo, modelo, parametros); tablas y objetivo son None sin solución
+    """
+    from modelo import construir_modelo, resolver_modelo
+
+    metadatos = cargar_metadatos(directorio)
+    plan = plan or plan_desde_tablas(cargar_tablas(directorio=directorio))
+    if parametros is None:
+        parametros = cargar_parametros(modo_testing=metadatos.get("modo", "cinco_zonas"),
+                                       horizonte=metadatos.get("horizonte", "mensual"),
+                                       zonas=metadatos.get("zonas"))
+    if modelo is None:
+        modelo = construir_modelo(parametros, agregado=metadatos.get("agregado", False),
+                                  matricial=metadatos.get("matricial", False),
+                                  ajustada=metadatos.get("ajustada", False))
+
+    parametros = preparar_replanificacion(modelo, parametros, plan, dias_transcurridos,
+                                          zeta_observada, incidencia_observada)
+    modelo.setParam("TimeLimit", tiempo_limite)
+    if not resolver_modelo(modelo):
+        return None, None, modelo, parametros
+
+    tablas = extraer_solucion(modelo)
+    if modelo._agregado:
+        # Días transcurridos: las tripulaciones ejecutadas; resto: asignación desde la dotación
+        transcurridos = set(parametros["T"][:dias_transcurridos])
+        n = tablas["n"][(tablas["n"]["valor"] > 0.5) & ~tablas["n"]["t"].isin(transcurridos)]
+        dotacion = dict(zip(n[["e", "k", "p", "m", "t"]].itertuples(index=False, name=None), n["valor"]))
+        ejecutadas = [clave for clave in plan["y"] if clave[-1] in transcurridos]
+        tablas["y"] = tabla_desde_claves("y", ejecutadas + asignar_carabineros(parametros, dotacion))
+    return tablas, modelo.ObjVal, modelo, parametros
+
+
+def _leer_zeta(ruta):
+    tabla = pd.read_csv(ruta)
+    return dict(zip(zip(tabla["z"], tabla["t"]), tabla["valor"]))
+
+
+def _leer_incidencia(ruta):
+    tabla = pd.read_csv(ruta)
+    return dict(zip(zip(tabla["id_delito"], tabla["id_zona"]), tabla["incidencia"]))
+
+
+if __name__ == "__main__":
+    dias = None
+    origen = DIRECTORIO_SOLUCION
+    destino = DIRECTORIO_REPLANIFICACION
+    zeta_observada = None
+    incidencia_observada = None
+    tiempo_limite = 120
+
+    argumentos = iter(sys.argv[1:])
+    for arg in argumentos:
+        if arg == "--dias":
+            dias = int(next(argumentos, "0"))
+        elif arg == "--origen":
+            origen = next(argumentos, origen)
+        elif arg == "--destino":
+            destino = next(argumentos, destino)
+        elif arg == "--zeta-observada":
+            zeta_observada = _leer_zeta(next(argumentos))
+        elif arg == "--incidencia-observada":
+            incidencia_observada = _leer_incidencia(next(argumentos))
+        elif arg == "--tiempo":
+            tiempo_limite = float(next(argumentos, "120"))
+        else:
+            print(f"❌ Argumento desconocido: {arg}")
+            print(__doc__)
+            sys.exit(1)
+
+    if dias is None:
+        print("❌ Indica los días transcurridos con --dias K")
+        sys.exit(1)
+
+    tablas, objetivo, modelo, _ = replanificar(dias, directorio=origen, zeta_observada=zeta_observada,
+                                               incidencia_observada=incidencia_observada,
+                                               tiempo_limite=tiempo_limite)
+    if tablas is None:
+        print("\n❌ No se encontró un plan factible para los días restantes.")
+        sys.exit(1)
+    metadatos = cargar_metadatos(origen)
+    metadatos.update({"origen": origen, "dias_transcurridos": dias, "status": modelo.status,
+                      "gap": modelo.MIPGap, "tiempo": modelo.Runtime, "cota": modelo.ObjBound,
+                      "zeta_observada": zeta_observada is not None,
+                      "incidencia_observada": incidencia_observada is not None})
+    for clave in ("fecha", "objetivo", "total_variables", "familias", "filas", "formato"):
+        metadatos.pop(clave, None)
+    guardar_resultados(tablas, objetivo, modelo.NumVars, metadatos=metadatos, directorio=destino)
@@ -0,0 +1,427 @@
+"""
+EXTRACCIÓN Y ESCRITURA DE RESULTADOS
+Convierte la solución del modelo en tablas tipadas por familia de variables
+(x, y, phi, u, zeta) con los índices como columnas enteras, y las guarda en un
+almacén columnar (una tabla Parquet por familia + metadatos de la corrida).
+"""
+
+import os
+import json
+from datetime import datetime
+import numpy as np
+import pandas as pd
+
+DIRECTORIO_SOLUCION = "resultados/solucion"
+DIRECTORIO_POOL = "resultados/pool"
+
+# Columnas de índice de cada familia de variables
+COLUMNAS_INDICE = {
+    "x": ["p", "z", "m", "t"],
+    "y": ["c", "p", "m", "t"],
+    "n": ["e", "k", "p", "m", "t"],
+    "phi": ["p", "t"],
+    "u": ["z", "m", "t"],
+    "zeta": ["z", "t"],
+}
+
+TOLERANCIA = 1e-10
+
+
+def tabla_familia(familia, claves, valores):
+    """
+    Construye la tabla de una familia con las entradas activas (valor > TOLERANCIA).
+
+    Args:
+        familia: nombre de la familia ("x", "y", ...)
+        claves: lista de tuplas de índices, en el mismo orden que valores
+        valores: valores de las variables
+    """
+    valores = np.asarray(valores, dtype=float)
+    activos = np.flatnonzero(valores > TOLERANCIA)
+    columnas = COLUMNAS_INDICE[familia]
+    indices = np.array([claves[i] for i in activos], dtype=np.int64).reshape(len(activos), len(columnas))
+    tabla = pd.DataFrame(indices, columns=columnas)
+    tabla["valor"] = valores[activos]
+    return tabla
+
+
+def tabla_desde_claves(familia, claves):
+    """Tabla de una familia binaria a partir de las claves activas (valor 1)"""
+    return tabla_familia(familia, list(claves), np.ones(len(claves)))
+
+
+def extraer_solucion(modelo):
+    """
+    Extrae la solución con una consulta masiva de X por familia de variables.
+
+    Los índices se decodifican directamente desde las claves de los tupledict
+    registrados en modelo._variables, sin interpretar VarName.
+    """
+    tablas = {}
+    for familia, variables in modelo._variables.items():
+        claves = list(variables.keys())
+        valores = modelo.getAttr("X", list(variables.values()))
+        tablas[familia] = tabla_familia(familia, claves, valores)
+    return tablas
+
+
+def extraer_pool(modelo):
+    """
+    Extrae todas las soluciones del pool de Gurobi (SolCount) con consultas masivas de Xn.
+
+    Returns:
+        lista de (objetivo, tablas) ordenada de mejor a peor, como la deja Gurobi
+    """
+    familias = {familia: (list(variables.keys()), list(variables.values()))
+                for familia, variables in modelo._variables.items()}
+    soluciones = []
+    for k in range(modelo.SolCount):
+        modelo.setParam("SolutionNumber", k)
+        tablas = {familia: tabla_familia(familia, claves, modelo.getAttr("Xn", variables))
+                  for familia, (claves, variables) in familias.items()}
+        soluciones.append((modelo.PoolObjVal, tablas))
+    modelo.setParam("SolutionNumber", 0)
+    return soluciones
+
+
+def tablas_desde_plan(plan):
+    """Tablas de resultados a partir de un plan heurístico (listas de claves y dicts de valores)"""
+    tablas = {familia: tabla_desde_claves(familia, plan[familia]) for familia in ("x", "y", "phi")}
+    for familia in ("u", "zeta"):
+        valores = plan[familia]
+        tablas[familia] = tabla_familia(familia, list(valores.keys()), list(valores.values()))
+    return tablas
+
+
+def plan_desde_tablas(tablas):
+    """Inversa de tablas_desde_plan: plan (claves activas y dicts de valores) desde tablas guardadas"""
+    plan = {}
+    for familia in ("x", "y", "phi"):
+        tabla = tablas[familia]
+        activas = tabla.loc[tabla["valor"] > 0.5, COLUMNAS_INDICE[familia]]
+        plan[familia] = list(activas.itertuples(index=False, name=None))
+    for familia in ("u", "zeta"):
+        tabla = tablas[familia]
+        plan[familia] = dict(zip(tabla[COLUMNAS_INDICE[familia]].itertuples(index=False, name=None), tabla["valor"]))
+    plan["objetivo"] = sum(plan["zeta"].values())
+    plan["faltantes"] = []
+    return plan
+
+
+def resumen_diario(tablas):
+    """Resumen de recursos por día a partir de las tablas decodificadas"""
+    columnas = [
+        ("x", "patrullas_asignadas", "size"),
+        ("y", "carabineros_asignados", "size"),
+        ("phi", "vehiculos_utilizados", "size"),
+        ("u", "peligrosidad_acumulada", "sum"),
+        ("zeta", "deficit_cobertura", "sum"),
+    ]
+    series = []
+    for familia, nombre, agregacion in columnas:
+        tabla = tablas.get(familia)
+        if tabla is None or tabla.empty:
+            continue
+        agrupado = tabla.groupby("t")["valor"]
+        serie = agrupado.size() if agregacion == "size" else agrupado.sum()
+        series.append(serie.rename(nombre))
+    if not series:
+        return pd.DataFrame(columns=["dia"])
+    resumen = pd.concat(series, axis=1).sort_index()
+    resumen.index.name = "dia"
+    return resumen.reset_index()
+
+
+def nombres_variables(tablas):
+    """Tabla (variable, valor) con los nombres estilo Gurobi, p.ej. x[3,30,1,7]"""
+    partes = []
+    for familia, tabla in tablas.items():
+        if tabla.empty:
+            continue
+        columnas = COLUMNAS_INDICE[familia]
+        nombres = familia + "[" + tabla[columnas[0]].astype(str)
+        for columna in columnas[1:]:
+            nombres = nombres + "," + tabla[columna].astype(str)
+        nombres = nombres + "]"
+        partes.append(pd.DataFrame({"variable": nombres, "valor": tabla["valor"].to_numpy()}))
+    if not partes:
+        return pd.DataFrame(columns=["variable", "valor"])
+    return pd.concat(partes, ignore_index=True)
+
+
+def _formato_columnar():
+    """Parquet si pyarrow está instalado; si no, pickle (también tipado, sin límite de filas)"""
+    try:
+        import pyarrow  # noqa: F401
+        return "parquet"
+    except ImportError:
+        return "pkl"
+
+
+def _ruta_tabla(directorio, nombre):
+    for extension in ("parquet", "pkl"):
+        ruta = os.path.join(directorio, f"{nombre}.{extension}")
+        if os.path.exists(ruta):
+            return ruta
+    return None
+
+
+def _escribir_tabla(tabla, directorio, nombre, formato):
+    ruta = os.path.join(directorio, f"{nombre}.{formato}")
+    if formato == "parquet":
+        tabla.to_parquet(ruta, index=False)
+    else:
+        tabla.to_pickle(ruta)
+    return ruta
+
+
+def _leer_tabla(ruta, columnas=None):
+    if ruta.endswith(".parquet"):
+        return pd.read_parquet(ruta, columns=columnas)
+    tabla = pd.read_pickle(ruta)
+    return tabla[columnas] if columnas is not None else tabla
+
+
+def existe_solucion(directorio=DIRECTORIO_SOLUCION):
+    """True si hay una solución guardada en el almacén columnar"""
+    return os.path.exists(os.path.join(directorio, "metadata.json"))
+
+
+def cargar_tablas(familias=None, columnas=None, directorio=DIRECTORIO_SOLUCION):
+    """
+    Lee las tablas de la solución guardada.
+
+    Args:
+        familias: familias a leer (por defecto todas las guardadas)
+        columnas: dict {familia: [columnas]} para leer solo lo necesario
+    """
+    if familias is None:
+        familias = cargar_metadatos(directorio).get("familias", list(COLUMNAS_INDICE))
+    columnas = columnas or {}
+    tablas = {}
+    for familia in familias:
+        ruta = _ruta_tabla(directorio, familia)
+        if ruta is not None:
+            tablas[familia] = _leer_tabla(ruta, columnas.get(familia))
+    return tablas
+
+
+def cargar_resumen(directorio=DIRECTORIO_SOLUCION):
+    """Lee el resumen diario de recursos guardado junto a la solución"""
+    return _leer_tabla(_ruta_tabla(directorio, "resumen_diario"))
+
+
+def cargar_metadatos(directorio=DIRECTORIO_SOLUCION):
+    """Lee los metadatos de la corrida (modo, horizonte, objetivo, gap, tiempo)"""
+    with open(os.path.join(directorio, "metadata.json"), encoding="utf-8") as archivo:
+        return json.load(archivo)
+
+
+def decodificar_variables(variables_df):
+    """
+    Decodifica una tabla (variable, valor) con nombres estilo Gurobi a tablas por familia.
+
+    Usa str.extract/str.split vectorizados en vez de aplicar una regex fila por fila.
+    """
+    partes = variables_df["variable"].str.extract(r"^(\w+)\[([\d,]+)\]$")
+    tablas = {}
+    for familia, columnas in COLUMNAS_INDICE.items():
+        filas = partes[0] == familia
+        if not filas.any():
+            # Familias sin entradas activas quedan como tablas vacías, igual que en el almacén
+            tablas[familia] = pd.DataFrame({columna: pd.Series(dtype=np.int64) for columna in columnas + ["valor"]})
+            continue
+        indices = partes.loc[filas, 1].str.split(",", expand=True).astype(np.int64)
+        indices.columns = columnas
+        indices["valor"] = variables_df.loc[filas, "valor"].to_numpy()
+        tablas[familia] = indices.reset_index(drop=True)
+    return tablas
+
+
+def cargar_solucion(familias=None, columnas=None, directorio=DIRECTORIO_SOLUCION):
+    """
+    Tablas decodificadas, resumen diario y metadatos de la última solución.
+
+    Lee el almacén columnar; si no existe, decodifica los Excel de corridas antiguas.
+    """
+    if existe_solucion(directorio):
+        tablas = cargar_tablas(familias, columnas, directorio)
+        return tablas, cargar_resumen(directorio), cargar_metadatos(directorio)
+    tablas = decodificar_variables(pd.read_excel("resultados/variables_activas.xlsx"))
+    metadatos = {"filas": {familia: len(tabla) for familia, tabla in tablas.items()}}
+    if familias is not None:
+        tablas = {familia: tablas[familia] for familia in familias if familia in tablas}
+    for familia, lista in (columnas or {}).items():
+        if familia in tablas:
+            tablas[familia] = tablas[familia][lista]
+    return tablas, pd.read_excel("resultados/resumen_diario_recursos.xlsx"), metadatos
+
+
+def guardar_progreso(progreso, directorio=DIRECTORIO_SOLUCION):
+    """
+    Guarda la línea de tiempo del solver (incumbente, cota, gap, nodos, trabajo) como CSV.
+
+    Args:
+        progreso: lista de dicts registrada por resolver_modelo en model._progreso
+    """
+    os.makedirs(directorio, exist_ok=True)
+    ruta = os.path.join(directorio, "progreso.csv")
+    columnas = ["tiempo", "evento", "incumbente", "cota", "gap", "nodos", "trabajo"]
+    pd.DataFrame(progreso, columns=columnas).to_csv(ruta, index=False)
+    print(f"   • {ruta}")
+    return ruta
+
+
+def hitos_progreso(progreso, gaps=(0.1, 0.01)):
+    """
+    Tiempos a la primera solución y a cada gap objetivo a partir de la línea de tiempo.
+
+    Returns:
+        dict {"tiempo_primera_solucion": s, "tiempo_gap_10%": s, ...} (None si no se alcanzó)
+    """
+    hitos = {"tiempo_primera_solucion": None}
+    hitos.update({f"tiempo_gap_{gap:.0%}": None for gap in gaps})
+    for registro in progreso:
+        if registro["incumbente"] >= 1e100:
+            continue
+        if hitos["tiempo_primera_solucion"] is None:
+            hitos["tiempo_primera_solucion"] = registro["tiempo"]
+        for gap in gaps:
+            clave = f"tiempo_gap_{gap:.0%}"
+            if hitos[clave] is None and registro["gap"] <= gap:
+                hitos[clave] = registro["tiempo"]
+    return hitos
+
+
+def cargar_progreso(directorio=DIRECTORIO_SOLUCION):
+    """Lee la línea de tiempo del solver guardada junto a la solución"""
+    return pd.read_csv(os.path.join(directorio, "progreso.csv"))
+
+
+def guardar_resultados(tablas, objetivo, total_variables=None, metadatos=None,
+                       exportar_excel=False, directorio=DIRECTORIO_SOLUCION):
+    """
+    Guarda la solución en el almacén columnar y, opcionalmente, en Excel.
+
+    Args:
+        tablas: dict {familia: DataFrame} retornado por extraer_solucion
+        objetivo: valor de la función objetivo
+        total_variables: número total de variables del modelo (solo informativo)
+        metadatos: dict con datos de la corrida (modo, horizonte, gap, tiempo, ...)
+        exportar_excel: si True, escribe además variables_activas.xlsx y resumen_diario_recursos.xlsx
+    """
+    os.makedirs(directorio, exist_ok=True)
+
+    print(f"📊 Estadísticas del modelo:")
+    if total_variables is not None:
+        print(f"   • Total de variables: {total_variables:,}")
+    print(f"   • Variables activas: {sum(len(tabla) for tabla in tablas.values()):,}")
+    print(f"   • Función objetivo: {objetivo:.6f}")
+
+    # Una tabla por familia con índices enteros tipados
+    formato = _formato_columnar()
+    if formato != "parquet":
+        print("⚠️  pyarrow no está instalado: se usa pickle (pip install pyarrow para Parquet)")
+    archivos = []
+    for familia, tabla in tablas.items():
+        archivos.append(_escribir_tabla(tabla, directorio, familia, formato))
+
+    # Generar resumen diario
+    df_resumen = resumen_diario(tablas)
+    archivos.append(_escribir_tabla(df_resumen, directorio, "resumen_diario", formato))
+
+    datos = {
+        "fecha": datetime.now().isoformat(timespec="seconds"),
+        "objetivo": float(objetivo),
+        "total_variables": total_variables,
+        "familias": list(tablas),
+        "filas": {familia: len(tabla) for familia, tabla in tablas.items()},
+        "formato": formato,
+    }
+    datos.update(metadatos or {})
+    with open(os.path.join(directorio, "metadata.json"), "w", encoding="utf-8") as archivo:
+        json.dump(datos, archivo, indent=2, ensure_ascii=False, default=str)
+    archivos.append(os.path.join(directorio, "metadata.json"))
+
+    if exportar_excel:
+        # Exportación opcional en el formato histórico (limitada a ~1M filas por Excel)
+        nombres_variables(tablas).to_excel("resultados/variables_activas.xlsx", index=False)
+        df_resumen.to_excel("resultados/resumen_diario_recursos.xlsx", index=False)
+        archivos += ["resultados/variables_activas.xlsx", "resultados/resumen_diario_recursos.xlsx"]
+
+    print("✅ Archivos guardados:")
+    for ruta in archivos:
+        print(f"   • {ruta}")
+
+    print(f"\n🎯 FUNCIÓN OBJETIVO FINAL: {objetivo:.6f}")
+    print("   (Peligrosidad total minimizada - MENOR es MEJOR)")
+
+
+def diferencias_pool(soluciones):
+    """
+    Diferencias entre cada par de soluciones del pool en las patrullas asignadas (x).
+
+    Una patrulla (p, m) en (z, t) que está en una solución y no en la otra cuenta como
+    movida; "movidas" es la mitad de la diferencia simétrica (una que sale y otra que
+    entra es un solo cambio). Dos soluciones que solo difieren en carabineros o vehículos
+    (y, n, phi) aparecen con movidas = 0.
+
+    Args:
+        soluciones: lista de (objetivo, tablas) de extraer_pool
+
+    Returns:
+        (resumen, detalle): resumen con una fila por par (a, b) y detalle por par, zona y día
+        con las patrullas de cada solución y las que difieren
+    """
+    activas = []
+    for _, tablas in soluciones:
+        x = tablas["x"]
+        activas.append(set(x.loc[x["valor"] > 0.5, COLUMNAS_INDICE["x"]].itertuples(index=False, name=None)))
+
+    resumen, detalle = [], []
+    for a in range(len(soluciones)):
+        for b in range(a + 1, len(soluciones)):
+            solo_a, solo_b = activas[a] - activas[b], activas[b] - activas[a]
+            por_zona_dia = {}
+            for origen, claves in (("solo_a", solo_a), ("solo_b", solo_b)):
+                for _, z, _, t in claves:
+                    conteo = por_zona_dia.setdefault((z, t), {"solo_a": 0, "solo_b": 0})
+                    conteo[origen] += 1
+            for (z, t), conteo in sorted(por_zona_dia.items()):
+                detalle.append({"a": a, "b": b, "z": z, "t": t, **conteo,
+                                "movidas": (conteo["solo_a"] + conteo["solo_b"]) / 2})
+            resumen.append({
+                "a": a, "b": b,
+                "objetivo_a": soluciones[a][0], "objetivo_b": soluciones[b][0],
+                "patrullas_a": len(activas[a]), "patrullas_b": len(activas[b]),
+                "movidas": (len(solo_a) + len(solo_b)) / 2,
+                "zonas_dia_distintas": len(por_zona_dia),
+            })
+    columnas_detalle = ["a", "b", "z", "t", "solo_a", "solo_b", "movidas"]
+    columnas_resumen = ["a", "b", "objetivo_a", "objetivo_b", "patrullas_a", "patrullas_b", "movidas",
+                        "zonas_dia_distintas"]
+    return pd.DataFrame(resumen, columns=columnas_resumen), pd.DataFrame(detalle, columns=columnas_detalle)
+
+
+def guardar_pool(soluciones, total_variables=None, metadatos=None, directorio=DIRECTORIO_POOL):
+    """
+    Guarda cada solución del pool en directorio/sol_<k> (mismo formato que guardar_resultados)
+    y las diferencias entre pares en diferencias.csv y diferencias_zona_dia.csv.
+    """
+    os.makedirs(directorio, exist_ok=True)
+    for k, (objetivo, tablas) in enumerate(soluciones):
+        print(f"\n🗂️  Solución {k} del pool")
+        datos = dict(metadatos or {})
+        datos.update({"pool_indice": k, "pool_tamano": len(soluciones)})
+        guardar_resultados(tablas, objetivo, total_variables, metadatos=datos,
+                           directorio=os.path.join(directorio, f"sol_{k}"))
+
+    resumen, detalle = diferencias_pool(soluciones)
+    resumen.to_csv(os.path.join(directorio, "diferencias.csv"), index=False)
+    detalle.to_csv(os.path.join(directorio, "diferencias_zona_dia.csv"), index=False)
+    print(f"\n🔀 Pool de {len(soluciones)} soluciones guardado en {directorio}")
+    if not resumen.empty:
+        print(f"   • Patrullas movidas entre pares: mín {resumen['movidas'].min():.1f}, "
+              f"máx {resumen['movidas'].max():.1f}")
+        print(f"   • Objetivos: {soluciones[0][0]:.6f} a {soluciones[-1][0]:.6f}")
+    return resumen, detalle
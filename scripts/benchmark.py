@@ -0,0 +1,314 @@
+"""
+Benchmark reproducible sobre instancias sintéticas de tamaño creciente.
+
+Para cada instancia mide, por etapa (carga, construcción, presolve, resolución,
+extracción, exportación y análisis), el tiempo de reloj y la memoria (RSS actual y
+pico del proceso), junto con el tamaño del modelo y el objetivo. Cada instancia
+corre en un proceso nuevo para que el pico de memoria sea solo suyo. El resultado
+se escribe como JSON identificado por el commit, el solver y las opciones, para
+comparar entre versiones.
+Con --solver highs el modelo se resuelve con HiGHS a través de solvers.py (sin
+licencia de Gurobi; la etapa de presolve queda dentro de la resolución).
+
+Uso (desde la raíz del repositorio):
+    python scripts/benchmark.py [--tamanos pequeno,mediano] [--tiempo 60] [--matricial] [--agregado]
+        [--solver highs]
+    python scripts/benchmark.py --comparar resultados/benchmarks/A.json resultados/benchmarks/B.json
+"""
+
+import os
+import sys
+import io
+import json
+import time
+import platform
+import resource
+import tempfile
+import contextlib
+import subprocess
+import multiprocessing
+from datetime import datetime
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from generar_instancia import generar_instancia
+
+DIRECTORIO_BENCHMARKS = os.path.join(RAIZ, "resultados", "benchmarks")
+ETAPAS = ["carga", "construccion", "presolve", "resolucion", "extraccion", "exportacion", "analisis"]
+
+# Tamaños de instancia: zonas, comisarías, carabineros y vehículos por comisaría, días y kappa.
+# "pequeno" se resuelve al óptimo en menos de un segundo con Gurobi y HiGHS, así que su etapa
+# de resolución mide el solver y no el límite de tiempo
+TAMANOS = {
+    "pequeno": {"zonas": 1, "comisarias": 2, "carabineros": 4, "vehiculos": 3, "dias": 5, "kappa": 2},
+    "mediano": {"zonas": 5, "comisarias": 10, "carabineros": 12, "vehiculos": 8, "dias": 14, "kappa": 3},
+    "grande": {"zonas": 10, "comisarias": 25, "carabineros": 20, "vehiculos": 12, "dias": 30, "kappa": 4},
+    "muy_grande": {"zonas": 32, "comisarias": 66, "carabineros": 20, "vehiculos": 15, "dias": 90, "kappa": 6},
+}
+
+
+def _rss_mb():
+    """RSS actual del proceso en MB (desde /proc; 0 si no está disponible)"""
+    try:
+        with open("/proc/self/statm") as archivo:
+            return int(archivo.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except (OSError, ValueError):
+        return 0.0
+
+
+def _rss_pico_mb():
+    """Pico de RSS del proceso en MB (ru_maxrss está en KB en Linux y en bytes en macOS)"""
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return pico / 2**20 if sys.platform == "darwin" else pico / 2**10
+
+
+@contextlib.contextmanager
+def _etapa(registro, nombre):
+    inicio = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        yield
+    registro[nombre] = {"tiempo": time.perf_counter() - inicio, "rss_mb": _rss_mb(), "rss_pico_mb": _rss_pico_mb()}
+
+
+def ejecutar_instancia(nombre, configuracion, tiempo_limite=60, matricial=False, agregado=False, semilla=0,
+                       solver="gurobi"):
+    """
+    Genera la instancia, recorre todas las etapas y retorna las mediciones.
+
+    Un error de Gurobi (p.ej. licencia limitada) se registra en "error" y corta las
+    etapas restantes.
+    """
+    resultado = {"instancia": nombre, "configuracion": configuracion, "etapas": {}}
+    if solver != "gurobi":
+        return _ejecutar_etapas(resultado, tiempo_limite, matricial, agregado, semilla, solver)
+
+    from gurobipy import GurobiError
+    try:
+        return _ejecutar_etapas(resultado, tiempo_limite, matricial, agregado, semilla)
+    except GurobiError as error:
+        resultado["error"] = str(error)
+        return resultado
+
+
+def _ejecutar_etapas(resultado, tiempo_limite, matricial, agregado, semilla, solver="gurobi"):
+    from parametros import cargar_parametros, aplicar_escenario
+    from resultados import guardar_resultados, cargar_solucion
+    import analizador_resultados as analizador
+    import pandas as pd
+
+    configuracion, etapas = resultado["configuracion"], resultado["etapas"]
+    with tempfile.TemporaryDirectory() as temporal:
+        datos = os.path.join(temporal, "data")
+        solucion = os.path.join(temporal, "solucion")
+        generar_instancia(datos, semilla=semilla, **{k: v for k, v in configuracion.items() if k != "kappa"})
+
+        with _etapa(etapas, "carga"):
+            parametros = cargar_parametros(modo_testing=False, horizonte="completo", usar_cache=False,
+                                           directorio_datos=datos)
+            parametros = aplicar_escenario(parametros, {"kappa": configuracion["kappa"]})
+            dias = parametros["T"][:configuracion["dias"]]
+            parametros["T"] = dias
+            parametros["O"] = {(v, t): costo for (v, t), costo in parametros["O"].items() if t in dias}
+
+        if solver == "gurobi":
+            tablas = _resolver_con_gurobi(resultado, parametros, tiempo_limite, matricial, agregado)
+        else:
+            tablas = _resolver_con_capa(resultado, parametros, solver, tiempo_limite, agregado)
+        if tablas is None:
+            return resultado
+
+        with _etapa(etapas, "exportacion"):
+            guardar_resultados(tablas, resultado["objetivo"], resultado["variables"], directorio=solucion)
+
+        with _etapa(etapas, "analisis"):
+            tablas, resumen_df, _ = cargar_solucion(directorio=solucion)
+            vehiculos_df = pd.read_csv(os.path.join(datos, "vehiculos.csv"))
+            zonas_df = pd.read_csv(os.path.join(datos, "zonas.csv"))
+            zonas_usadas, dias_usados, _, _ = analizador.extraer_configuracion_modelo(tablas)
+            zona_nombres = analizador.mapear_zonas_nombres(zonas_usadas, zonas_df)
+            analizador.analizar_recursos_por_dia(tablas, dias_usados, zona_nombres)
+            analizador.analizar_distribucion_tipos_vehiculos(tablas, vehiculos_df)
+            analizador.mostrar_estadisticas_generales(tablas, resumen_df)
+    return resultado
+
+
+def _resolver_con_gurobi(resultado, parametros, tiempo_limite, matricial, agregado):
+    """Construcción, presolve, resolución y extracción con gurobipy; retorna las tablas o None"""
+    from modelo import construir_modelo, resolver_modelo
+    from resultados import extraer_solucion
+    from solvers import estado_gurobi
+
+    etapas = resultado["etapas"]
+    with _etapa(etapas, "construccion"):
+        modelo = construir_modelo(parametros, agregado=agregado, matricial=matricial)
+        modelo.setParam("OutputFlag", 0)
+        modelo.setParam("TimeLimit", tiempo_limite)
+        modelo.update()
+    resultado.update({"variables": modelo.NumVars, "restricciones": modelo.NumConstrs, "no_nulos": modelo.NumNZs})
+
+    with _etapa(etapas, "presolve"):
+        reducido = modelo.presolve()
+    resultado.update({"variables_presolve": reducido.NumVars, "restricciones_presolve": reducido.NumConstrs})
+    reducido.dispose()
+
+    with _etapa(etapas, "resolucion"):
+        exito = resolver_modelo(modelo)
+    resultado.update({"status": estado_gurobi(modelo.status), "solucion": exito})
+    if not exito:
+        return None
+    resultado.update({"objetivo": modelo.ObjVal, "cota": modelo.ObjBound, "gap": modelo.MIPGap,
+                      "nodos": modelo.NodeCount})
+
+    with _etapa(etapas, "extraccion"):
+        return extraer_solucion(modelo)
+
+
+def _resolver_con_capa(resultado, parametros, solver, tiempo_limite, agregado):
+    """Construcción, resolución y extracción a través de solvers.py; retorna las tablas o None"""
+    from solvers import crear_modelo
+
+    etapas = resultado["etapas"]
+    with _etapa(etapas, "construccion"):
+        modelo = crear_modelo(parametros, solver=solver, agregado=agregado)
+
+    with _etapa(etapas, "resolucion"):
+        reporte = modelo.resolver(tiempo_limite=tiempo_limite, salida=False)
+    resultado.update({"variables": reporte["variables"], "restricciones": reporte["restricciones"],
+                      "status": reporte["estado"], "solucion": reporte["con_solucion"]})
+    if not reporte["con_solucion"]:
+        return None
+    resultado.update({clave: reporte[clave] for clave in ("objetivo", "cota", "gap", "nodos")})
+
+    with _etapa(etapas, "extraccion"):
+        return modelo.tablas()
+
+
+def _commit():
+    try:
+        salida = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=RAIZ, capture_output=True, text=True)
+        cambios = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=RAIZ,
+                                 capture_output=True, text=True)
+        commit = salida.stdout.strip() or "desconocido"
+        return commit + ("-modificado" if cambios.stdout.strip() else "")
+    except OSError:
+        return "desconocido"
+
+
+def archivo_benchmark(commit, solver="gurobi", matricial=False, agregado=False, semilla=0, tiempo_limite=60):
+    """Nombre del JSON: corridas con otro solver u otras opciones no se sobrescriben entre sí"""
+    partes = [commit, solver] + (["matricial"] if matricial else []) + (["agregado"] if agregado else [])
+    partes += [f"semilla{semilla}", f"t{tiempo_limite:g}"]
+    return f"benchmark_{'_'.join(partes)}.json"
+
+
+def benchmark(tamanos, tiempo_limite=60, matricial=False, agregado=False, semilla=0, solver="gurobi"):
+    """Ejecuta las instancias en procesos nuevos y guarda el JSON del commit, solver y opciones"""
+    commit = _commit()
+    informe = {
+        "commit": commit,
+        "fecha": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "solver": solver,
+        "version_solver": _version_solver(solver),
+        "plataforma": platform.platform(),
+        "nucleos": os.cpu_count(),
+        "opciones": {"tiempo_limite": tiempo_limite, "matricial": matricial, "agregado": agregado, "semilla": semilla,
+                     "solver": solver},
+        "instancias": [],
+    }
+    contexto = multiprocessing.get_context("spawn")
+    for nombre in tamanos:
+        print(f"⏱️  Instancia {nombre}: {TAMANOS[nombre]}")
+        with contexto.Pool(1) as pool:
+            resultado = pool.apply(ejecutar_instancia, (nombre, TAMANOS[nombre], tiempo_limite, matricial,
+                                                       agregado, semilla, solver))
+        informe["instancias"].append(resultado)
+        for etapa, medicion in resultado["etapas"].items():
+            print(f"   • {etapa:<13} {medicion['tiempo']:8.3f} s   pico {medicion['rss_pico_mb']:8.1f} MB")
+        if "variables" in resultado:
+            print(f"   • {resultado['variables']:,} variables, {resultado['restricciones']:,} restricciones, "
+                  f"objetivo {resultado.get('objetivo', float('nan')):.6f}, status {resultado.get('status')}, "
+                  f"gap {resultado.get('gap', float('nan')):.2%}")
+        if "error" in resultado:
+            print(f"   ⚠️  {resultado['error']}")
+
+    os.makedirs(DIRECTORIO_BENCHMARKS, exist_ok=True)
+    ruta = os.path.join(DIRECTORIO_BENCHMARKS, archivo_benchmark(commit, solver, matricial, agregado, semilla,
+                                                                tiempo_limite))
+    with open(ruta, "w", encoding="utf-8") as archivo:
+        json.dump(informe, archivo, indent=2, default=str)
+    print(f"✅ Benchmark guardado en {ruta}")
+    return informe
+
+
+def _version_solver(solver):
+    if solver == "highs":
+        import highspy
+        return highspy.Highs().version()
+    import gurobipy
+    return ".".join(map(str, gurobipy.gurobi.version()))
+
+
+def comparar(ruta_base, ruta_nueva):
+    """Imprime la razón nuevo/base de tiempo y pico de memoria por instancia y etapa"""
+    with open(ruta_base, encoding="utf-8") as archivo:
+        base = json.load(archivo)
+    with open(ruta_nueva, encoding="utf-8") as archivo:
+        nuevo = json.load(archivo)
+    print(f"📊 {base['commit']} → {nuevo['commit']} (razón nuevo/base; < 1 es mejor)")
+    instancias_base = {i["instancia"]: i for i in base["instancias"]}
+    for instancia in nuevo["instancias"]:
+        anterior = instancias_base.get(instancia["instancia"])
+        if anterior is None:
+            continue
+        print(f"\n{instancia['instancia']}: objetivo {anterior.get('objetivo')} → {instancia.get('objetivo')}, "
+              f"status {anterior.get('status')} → {instancia.get('status')}, "
+              f"gap {anterior.get('gap')} → {instancia.get('gap')}")
+        for etapa in ETAPAS:
+            if etapa not in instancia["etapas"] or etapa not in anterior["etapas"]:
+                continue
+            a, b = anterior["etapas"][etapa], instancia["etapas"][etapa]
+            razon_tiempo = b["tiempo"] / a["tiempo"] if a["tiempo"] > 0 else float("nan")
+            razon_memoria = b["rss_pico_mb"] / a["rss_pico_mb"] if a["rss_pico_mb"] > 0 else float("nan")
+            print(f"   • {etapa:<13} tiempo ×{razon_tiempo:5.2f}   pico ×{razon_memoria:5.2f}")
+
+
+if __name__ == "__main__":
+    tamanos = ["pequeno", "mediano"]
+    tiempo_limite = 60
+    matricial = False
+    agregado = False
+    semilla = 0
+    solver = "gurobi"
+
+    argumentos = iter(sys.argv[1:])
+    for arg in argumentos:
+        if arg == "--comparar":
+            comparar(next(argumentos), next(argumentos))
+            sys.exit(0)
+        elif arg == "--tamanos":
+            tamanos = [t for t in next(argumentos, "").split(",") if t]
+            desconocidos = [t for t in tamanos if t not in TAMANOS]
+            if desconocidos:
+                print(f"❌ Tamaños desconocidos: {desconocidos}. Disponibles: {', '.join(TAMANOS)}")
+                sys.exit(1)
+        elif arg == "--tiempo":
+            tiempo_limite = float(next(argumentos, "60"))
+        elif arg == "--semilla":
+            semilla = int(next(argumentos, "0"))
+        elif arg == "--matricial":
+            matricial = True
+        elif arg == "--agregado":
+            agregado = True
+        elif arg == "--solver":
+            solver = next(argumentos, "gurobi")
+        else:
+            print(f"❌ Argumento desconocido: {arg}")
+            print(__doc__)
+            sys.exit(1)
+
+    os.chdir(RAIZ)
+    benchmark(tamanos, tiempo_limite=tiempo_limite, matricial=matricial, agregado=agregado, semilla=semilla,
+              solver=solver)
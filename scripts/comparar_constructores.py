@@ -0,0 +1,103 @@
+"""
+Compara el constructor con generadores (modelo.construir_modelo) y el matricial
+(modelo_matricial.construir_modelo_matricial): verifica que generen el mismo modelo
+(mismas variables, cotas, tipos, objetivo y filas) y reporta los tiempos de construcción.
+
+Uso (desde la raíz del repositorio):
+    python scripts/comparar_constructores.py [--agregado] [--ajustada] [--cinco-zonas] [--resolver]
+
+--resolver además optimiza ambos modelos y compara el valor objetivo.
+"""
+
+import os
+import sys
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from parametros import cargar_parametros
+from modelo import construir_modelo
+from modelo_matricial import construir_modelo_matricial
+
+DECIMALES = 9
+
+
+def forma_canonica(model):
+    """Variables (nombre -> tipo, cotas, costo) y multiconjunto de filas normalizadas"""
+    model.update()
+    variables = model.getVars()
+    nombres = model.getAttr("VarName", variables)
+    datos = zip(nombres, model.getAttr("VType", variables), model.getAttr("LB", variables),
+                model.getAttr("UB", variables), model.getAttr("Obj", variables))
+    columnas = {nombre: (tipo, round(lb, DECIMALES), min(ub, 1e30), round(obj, DECIMALES))
+                for nombre, tipo, lb, ub, obj in datos}
+
+    A = model.getA().tocsr()
+    restricciones = model.getConstrs()
+    sentidos = model.getAttr("Sense", restricciones)
+    rhs = model.getAttr("RHS", restricciones)
+    filas = Counter()
+    for i, (sentido, lado_derecho) in enumerate(zip(sentidos, rhs)):
+        inicio, fin = A.indptr[i], A.indptr[i + 1]
+        terminos = sorted((nombres[j], v) for j, v in zip(A.indices[inicio:fin], A.data[inicio:fin]) if v != 0)
+        signo = 1.0
+        if sentido == ">" or (sentido == "=" and terminos and terminos[0][1] < 0):
+            signo = -1.0
+        sentido = "<" if sentido in "<>" else "="
+        terminos = tuple((nombre, round(signo * v, DECIMALES)) for nombre, v in terminos)
+        filas[(terminos, sentido, round(signo * lado_derecho, DECIMALES))] += 1
+    return columnas, filas
+
+
+def main():
+    agregado = "--agregado" in sys.argv
+    ajustada = "--ajustada" in sys.argv
+    resolver = "--resolver" in sys.argv
+    modo, horizonte = ("cinco_zonas", "semanal") if "--cinco-zonas" in sys.argv else (True, "testing")
+
+    parametros = cargar_parametros(modo_testing=modo, horizonte=horizonte)
+
+    inicio = time.perf_counter()
+    generadores = construir_modelo(parametros, agregado=agregado, ajustada=ajustada)
+    generadores.update()
+    tiempo_generadores = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    matricial = construir_modelo_matricial(parametros, agregado=agregado, nombres=True, ajustada=ajustada)
+    matricial.update()
+    tiempo_matricial = time.perf_counter() - inicio
+
+    print("\n⏱️  Tiempo de construcción (incluye model.update()):")
+    print(f"   • Generadores: {tiempo_generadores:.2f} s")
+    print(f"   • Matricial:   {tiempo_matricial:.2f} s")
+
+    columnas_g, filas_g = forma_canonica(generadores)
+    columnas_m, filas_m = forma_canonica(matricial)
+    iguales = True
+    if columnas_g != columnas_m:
+        iguales = False
+        distintas = [nombre for nombre in set(columnas_g) | set(columnas_m) if columnas_g.get(nombre) != columnas_m.get(nombre)]
+        print(f"❌ {len(distintas)} columnas distintas, p.ej. {sorted(distintas)[:5]}")
+    if filas_g != filas_m:
+        iguales = False
+        print(f"❌ Filas distintas: {sum((filas_g - filas_m).values())} solo en generadores, "
+              f"{sum((filas_m - filas_g).values())} solo en matricial")
+    if iguales:
+        print(f"✅ Modelos idénticos: {len(columnas_g):,} variables y {sum(filas_g.values()):,} restricciones")
+
+    if resolver:
+        generadores.optimize()
+        matricial.optimize()
+        if generadores.SolCount and matricial.SolCount:
+            diferencia = abs(generadores.ObjVal - matricial.ObjVal)
+            print(f"🎯 Objetivo generadores {generadores.ObjVal:.6f}, matricial {matricial.ObjVal:.6f} (diferencia {diferencia:.2e})")
+            iguales = iguales and diferencia <= 1e-6 * max(1.0, abs(generadores.ObjVal))
+        else:
+            print(f"⚠️  Sin solución para comparar (status {generadores.status} / {matricial.status})")
+
+    sys.exit(0 if iguales else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Compara la formulación original y la ajustada (construir_modelo(..., ajustada=True))
+sobre las instancias testing y cinco_zonas: filas, no nulos, cota de la relajación LP,
+objetivo, cota final y tiempo hasta el gap objetivo. Ambas deben llegar al mismo
+óptimo; la ajustada debería tener menos filas y una cota LP más alta.
+
+Uso (desde la raíz del repositorio):
+    python scripts/comparar_formulaciones.py [--instancias testing,cinco_zonas] [--agregado]
+        [--solver gurobi|highs] [--gap 0.01] [--tiempo 600]
+
+El resultado se imprime y se guarda en resultados/benchmarks/formulaciones.csv.
+"""
+
+import io
+import os
+import sys
+import time
+import contextlib
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+import pandas as pd
+from parametros import cargar_parametros
+from solvers import crear_modelo, SOLVERS
+
+# Instancias: (modo_testing, horizonte) de cargar_parametros
+INSTANCIAS = {
+    "testing": (True, "testing"),
+    "cinco_zonas": ("cinco_zonas", "mensual"),
+}
+
+
+def comparar_instancia(nombre, solver="gurobi", agregado=False, gap=0.01, tiempo_limite=600):
+    """Construye y resuelve las dos formulaciones; retorna una fila por formulación"""
+    modo, horizonte = INSTANCIAS[nombre]
+    with contextlib.redirect_stdout(io.StringIO()):
+        parametros = cargar_parametros(modo_testing=modo, horizonte=horizonte)
+
+    filas = []
+    for ajustada in (False, True):
+        inicio = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            modelo = crear_modelo(parametros, solver=solver, agregado=agregado, ajustada=ajustada)
+        construccion = time.perf_counter() - inicio
+        cota_lp = modelo.cota_lp()
+        reporte = modelo.resolver(tiempo_limite=tiempo_limite, gap=gap, salida=False)
+        filas.append({
+            "instancia": nombre,
+            "formulacion": "ajustada" if ajustada else "original",
+            "variables": reporte["variables"],
+            "restricciones": reporte["restricciones"],
+            "construccion_s": construccion,
+            "cota_lp": cota_lp,
+            "objetivo": reporte["objetivo"],
+            "cota": reporte["cota"],
+            "gap": reporte["gap"],
+            # Tiempo hasta el gap objetivo: el de la resolución si lo alcanzó
+            "tiempo_a_gap_s": reporte["tiempo"] if reporte["gap"] <= gap else None,
+            "tiempo_s": reporte["tiempo"],
+            "nodos": reporte["nodos"],
+            "estado": reporte["estado"],
+        })
+        print(f"   • {filas[-1]['formulacion']:<9} {reporte['restricciones']:>9,} filas   "
+              f"cota LP {cota_lp if cota_lp is not None else float('nan'):.6f}   "
+              f"objetivo {reporte['objetivo'] if reporte['objetivo'] is not None else float('nan'):.6f}   "
+              f"gap {reporte['gap']:.2%}   {reporte['tiempo']:.1f} s   {reporte['nodos']} nodos")
+    return filas
+
+
+if __name__ == "__main__":
+    instancias = list(INSTANCIAS)
+    solver = "gurobi"
+    agregado = False
+    gap = 0.01
+    tiempo_limite = 600
+
+    argumentos = iter(sys.argv[1:])
+    for arg in argumentos:
+        if arg == "--instancias":
+            instancias = [i for i in next(argumentos, "").split(",") if i]
+            desconocidas = [i for i in instancias if i not in INSTANCIAS]
+            if desconocidas:
+                print(f"❌ Instancias desconocidas: {desconocidas}. Disponibles: {', '.join(INSTANCIAS)}")
+                sys.exit(1)
+        elif arg == "--solver":
+            solver = next(argumentos, "gurobi")
+            if solver not in SOLVERS:
+                print(f"❌ Solver desconocido: {solver}. Disponibles: {', '.join(SOLVERS)}")
+                sys.exit(1)
+        elif arg == "--agregado":
+            agregado = True
+        elif arg == "--gap":
+            gap = float(next(argumentos, "0.01"))
+        elif arg == "--tiempo":
+            tiempo_limite = float(next(argumentos, "600"))
+        else:
+            print(f"❌ Argumento desconocido: {arg}")
+            print(__doc__)
+            sys.exit(1)
+
+    os.chdir(RAIZ)
+    filas = []
+    for nombre in instancias:
+        print(f"📐 {nombre} ({solver}{', agregado' if agregado else ''}, gap objetivo {gap:.0%})")
+        filas.extend(comparar_instancia(nombre, solver=solver, agregado=agregado, gap=gap,
+                                        tiempo_limite=tiempo_limite))
+
+    tabla = pd.DataFrame(filas)
+    ruta = os.path.join(RAIZ, "resultados", "benchmarks", "formulaciones.csv")
+    os.makedirs(os.path.dirname(ruta), exist_ok=True)
+    tabla.to_csv(ruta, index=False)
+    print(f"✅ Comparación guardada en {ruta}")
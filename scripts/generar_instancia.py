@@ -0,0 +1,121 @@
+"""
+Genera una instancia sintética con los mismos CSV y esquemas que data/ (zonas,
+tipos de delito, incidencia, comisarías, carabineros, vehículos y costos diarios),
+escalable en zonas, comisarías, carabineros, vehículos y días. Con la misma semilla
+produce siempre los mismos archivos.
+
+Uso (desde la raíz del repositorio):
+    python scripts/generar_instancia.py DIRECTORIO [--zonas 5] [--comisarias 10]
+        [--carabineros 20] [--vehiculos 15] [--dias 365] [--semilla 0]
+"""
+
+import os
+import sys
+import numpy as np
+import pandas as pd
+
+# Costo medio diario por tipo de vehículo en data/costos_diarios.csv
+COSTOS_MEDIOS = {
+    "Costo_uso_peaton": 5000, "Costo_uso_moto": 3600, "Costo_uso_bici": 1000,
+    "Costo_uso_caballo": 4600, "Costo_uso_auto": 8000, "Costo_uso_furgon": 10000,
+}
+ZONAS_REGION = 32
+COLUMNAS_COMPATIBILIDAD = ["compatible_moto", "compatible_bici", "compatible_caballo",
+                           "compatible_auto", "compatible_furgon"]
+
+
+def generar_instancia(directorio, zonas=5, comisarias=10, carabineros=20, vehiculos=15, dias=365,
+                      delitos=14, semilla=0):
+    """
+    Escribe los siete CSV de entrada de cargar_parametros en `directorio`.
+
+    Sigue las convenciones de data/: carabineros.id_estacion = id_comisaria - 1 y
+    vehiculos.id_estacion = id_comisaria.
+
+    Args:
+        zonas: número de zonas (comunas)
+        comisarias: número de comisarías; se reparten entre las zonas (al menos una por zona si alcanza)
+        carabineros: carabineros por comisaría
+        vehiculos: vehículos por comisaría
+        dias: filas de costos_diarios.csv (al menos 365 para que sirvan todos los horizontes)
+        delitos: tipos de delito
+        semilla: semilla del generador aleatorio
+    """
+    rng = np.random.default_rng(semilla)
+    os.makedirs(directorio, exist_ok=True)
+
+    zonas_df = pd.DataFrame({"id_zona": np.arange(zonas), "nombre_zona": [f"Zona_{z}" for z in range(zonas)]})
+    for columna in COLUMNAS_COMPATIBILIDAD:
+        zonas_df[columna] = (rng.random(zonas) < 0.6).astype(int)
+
+    idd = np.sort(rng.uniform(0.3, 1.0, delitos))[::-1]
+    idd[0] = 1.0
+    delitos_df = pd.DataFrame({"id_delito": np.arange(delitos), "nombre_delito": [f"Delito_{d}" for d in range(delitos)],
+                               "idd": idd})
+
+    # Incidencia: para cada delito los casos se reparten entre al menos ZONAS_REGION zonas (como
+    # las 32 comunas de data/); con pocas zonas solo se escribe su fracción, para que la
+    # peligrosidad inicial quede en la misma escala que los datos reales
+    reparto = rng.dirichlet(np.ones(max(zonas, ZONAS_REGION)), size=delitos)[:, :zonas]
+    incidencia_df = pd.DataFrame({
+        "id_delito": np.repeat(np.arange(delitos), zonas),
+        "id_zona": np.tile(np.arange(zonas), delitos),
+        "incidencia": reparto.reshape(-1).round(6),
+    })
+
+    zona_comisaria = np.concatenate([rng.permutation(zonas)[:comisarias],
+                                     rng.integers(0, zonas, max(0, comisarias - zonas))])
+    tipos_vehiculo = rng.choice(np.arange(1, 7), size=(comisarias, vehiculos), p=[0.1, 0.25, 0.1, 0.1, 0.35, 0.1])
+    comisarias_df = pd.DataFrame({
+        "id_comisaria": np.arange(1, comisarias + 1),
+        "id_zona": zona_comisaria,
+        "numero_carabineros": carabineros,
+        "numero_motos": (tipos_vehiculo == 2).sum(axis=1),
+        "numero_bicis": (tipos_vehiculo == 3).sum(axis=1),
+        "numero_caballos": (tipos_vehiculo == 4).sum(axis=1),
+        "numero_autos": (tipos_vehiculo == 5).sum(axis=1),
+        "numero_furgon": (tipos_vehiculo == 6).sum(axis=1),
+        "presupuesto_anual": (rng.uniform(2.15e8, 5.33e8, comisarias) // 1e5 * 1e5).astype(np.int64),
+    })
+
+    carabineros_df = pd.DataFrame({
+        "id_carabinero": np.arange(comisarias * carabineros),
+        "experiencia": rng.integers(1, 6, comisarias * carabineros),
+        "id_estacion": np.repeat(np.arange(comisarias), carabineros),
+    })
+
+    vehiculos_df = pd.DataFrame({
+        "id": np.arange(1, comisarias * vehiculos + 1),
+        "tipo_medio": tipos_vehiculo.reshape(-1),
+        "id_estacion": np.repeat(np.arange(1, comisarias + 1), vehiculos),
+    })
+
+    dias = max(dias, 365)
+    costos_df = pd.DataFrame({"Dia": np.arange(1, dias + 1)})
+    for columna, media in COSTOS_MEDIOS.items():
+        costos_df[columna] = np.maximum(rng.normal(media, 0.19 * media, dias), 0.1 * media).round()
+
+    archivos = {
+        "zonas.csv": zonas_df, "tipos_delitos.csv": delitos_df, "incidencia_delito.csv": incidencia_df,
+        "comisarias.csv": comisarias_df, "carabineros.csv": carabineros_df, "vehiculos.csv": vehiculos_df,
+        "costos_diarios.csv": costos_df,
+    }
+    for nombre, tabla in archivos.items():
+        tabla.to_csv(os.path.join(directorio, nombre), index=False)
+    return directorio
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2 or sys.argv[1].startswith("--"):
+        print(__doc__)
+        sys.exit(1)
+    opciones = {}
+    argumentos = iter(sys.argv[2:])
+    for arg in argumentos:
+        clave = arg.lstrip("-")
+        if clave not in ("zonas", "comisarias", "carabineros", "vehiculos", "dias", "delitos", "semilla"):
+            print(f"❌ Argumento desconocido: {arg}")
+            sys.exit(1)
+        opciones[clave] = int(next(argumentos, "0"))
+    generar_instancia(sys.argv[1], **opciones)
+    print(f"✅ Instancia sintética escrita en {sys.argv[1]}")
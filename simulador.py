@@ -0,0 +1,232 @@
+"""
+SIMULADOR MONTE CARLO DE PELIGROSIDAD
+Toma un plan de patrullaje fijo (cobertura por zona, turno y día) y recorre las
+recurrencias R13/R14 para miles de escenarios de incidencia a la vez, con arreglos
+escenarios × zonas por día. Sirve para estresar un plan contra el ruido de la
+incidencia en vez de confiar en los valores zeta/u del MIP.
+
+Ruido: la criminalidad estructural sum_d I[d,z]·IDD[d] de cada zona se multiplica
+por un factor lognormal de media 1 por escenario, zona y día, con desviación `ruido`
+en escala logarítmica y autocorrelación diaria `persistencia` (0 = días
+independientes; cerca de 1 = olas de delitos que duran varios días). Con ruido=0 el
+resultado coincide con heuristica.calcular_peligrosidad.
+
+Uso:
+    python simulador.py [--origen resultados/solucion] [--destino resultados/simulacion]
+        [--escenarios 10000] [--ruido 0.2] [--persistencia 0.0] [--semilla 0]
+"""
+
+import os
+import sys
+import numpy as np
+import pandas as pd
+from heuristica import criminalidad_base
+
+DIRECTORIO_SIMULACION = "resultados/simulacion"
+CUANTILES = (0.05, 0.5, 0.95)
+
+
+def cobertura_plan(parametros, x):
+    """
+    Cobertura del plan como arreglo zonas × turnos × días.
+
+    Args:
+        x: claves activas (p, z, m, t) del plan (plan["x"] o plan_desde_tablas(tablas)["x"])
+    """
+    Z, M, T = parametros["Z"], parametros["M"], parametros["T"]
+    pos_z = {z: i for i, z in enumerate(Z)}
+    pos_m = {m: i for i, m in enumerate(M)}
+    pos_t = {t: i for i, t in enumerate(T)}
+    cobertura = np.zeros((len(Z), len(M), len(T)))
+    for _, z, m, t in x:
+        if z in pos_z and t in pos_t:
+            cobertura[pos_z[z], pos_m[m], pos_t[t]] += 1
+    return cobertura
+
+
+def _cuantiles(valores, cuantiles):
+    """Cuantiles (interpolación lineal) por columna de un arreglo escenarios × zonas"""
+    # Ordenar filas contiguas es varias veces más rápido que np.quantile(axis=0)
+    ordenados = np.sort(np.ascontiguousarray(valores.T), axis=1)
+    posicion = np.asarray(cuantiles) * (ordenados.shape[1] - 1)
+    abajo = np.floor(posicion).astype(np.int64)
+    arriba = np.minimum(abajo + 1, ordenados.shape[1] - 1)
+    fraccion = posicion - abajo
+    return (ordenados[:, abajo] + (ordenados[:, arriba] - ordenados[:, abajo]) * fraccion).T
+
+
+def simular(parametros, cobertura, escenarios=10000, ruido=0.2, persistencia=0.0, semilla=0,
+            cuantiles=CUANTILES, trayectorias=False):
+    """
+    Recorre R13/R14 con incidencia estocástica para un plan fijo.
+
+    Igual que la heurística, u[z,m,t] toma el menor valor factible max(0, zeta/3 - cobertura)
+    y, si la cobertura llevaría zeta del día siguiente bajo 0, absorbe el exceso
+    (u no tiene cota superior en el modelo y actúa como holgura de R13).
+
+    Args:
+        cobertura: arreglo zonas × turnos × días de cobertura_plan
+        escenarios: número de escenarios de incidencia
+        ruido: desviación del logaritmo del factor de criminalidad (0 = determinístico)
+        persistencia: autocorrelación diaria del ruido en [0, 1)
+        cuantiles: cuantiles por (zona, día) que se reportan
+        trayectorias: si True, retorna además zeta y déficit completos (escenarios × zonas × días)
+
+    Returns:
+        dict con, para "zeta" y "deficit" (sum_m u[z,m,t]), la "media" y los "cuantiles"
+        por (zona, día); "excedencia": fracción de escenarios con zeta > 1 por (zona, día);
+        "total" y "deficit_total": suma por escenario (la primera es el objetivo del modelo)
+    """
+    Z, T = parametros["Z"], parametros["T"]
+    lambda_, Gamma = parametros["lambda"], parametros["Gamma"]
+    n_z, n_t = len(Z), len(T)
+    rng = np.random.default_rng(semilla)
+    tipo = np.float32 if escenarios * n_z > 10**5 else np.float64
+
+    base = np.array([criminalidad_base(parametros)[z] for z in Z], dtype=tipo)
+    zeta_init = np.array([parametros["zeta"][z] for z in Z], dtype=tipo)
+    u_anterior = parametros.get("u_anterior")
+    cobertura = cobertura.astype(tipo)
+    cobertura_dia = cobertura.sum(axis=1)
+    cuantiles = list(cuantiles)
+
+    zeta_media, deficit_media = np.zeros((n_z, n_t)), np.zeros((n_z, n_t))
+    zeta_q, deficit_q = np.zeros((len(cuantiles), n_z, n_t)), np.zeros((len(cuantiles), n_z, n_t))
+    excedencia = np.zeros((n_z, n_t))
+    total, deficit_total = np.zeros(escenarios), np.zeros(escenarios)
+    if trayectorias:
+        zeta_s = np.empty((escenarios, n_z, n_t), dtype=tipo)
+        deficit_s = np.empty((escenarios, n_z, n_t), dtype=tipo)
+
+    innovacion = float(np.sqrt(1 - persistencia**2))
+    choque = np.zeros((escenarios, n_z), dtype=tipo)
+    zeta_previo = np.broadcast_to(zeta_init, (escenarios, n_z)).copy()
+    deficit_previo = None
+    for i in range(n_t):
+        if ruido > 0:
+            choque = persistencia * choque + innovacion * rng.standard_normal((escenarios, n_z), dtype=tipo)
+            criminalidad = base * np.exp(ruido * choque - ruido**2 / 2)
+        else:
+            criminalidad = np.broadcast_to(base, (escenarios, n_z))
+
+        # R13
+        patrullaje = Gamma * cobertura_dia[:, i] / 10
+        if i == 0 and u_anterior is None:
+            zeta = zeta_previo + lambda_ * criminalidad - patrullaje
+        else:
+            arrastre = lambda_ * (deficit_previo if i > 0 else np.array([u_anterior[z] for z in Z], dtype=tipo))
+            zeta = zeta_previo + 0.2 * criminalidad + arrastre - patrullaje
+        if i > 0:
+            # Holgura: el déficit del día anterior sube lo justo para que zeta no quede bajo 0
+            exceso = np.maximum(-zeta, 0)
+            deficit_previo += exceso / lambda_
+            zeta += exceso
+            deficit_media[:, i - 1] = deficit_previo.mean(axis=0)
+            deficit_q[:, :, i - 1] = _cuantiles(deficit_previo, cuantiles)
+            deficit_total += deficit_previo.sum(axis=1)
+            if trayectorias:
+                deficit_s[:, :, i - 1] = deficit_previo
+
+        # R14
+        por_turno = zeta / 3
+        deficit = np.zeros_like(zeta)
+        for m in range(cobertura.shape[1]):
+            deficit += np.maximum(por_turno - cobertura[:, m, i], 0)
+
+        zeta_media[:, i] = zeta.mean(axis=0)
+        zeta_q[:, :, i] = _cuantiles(zeta, cuantiles)
+        excedencia[:, i] = (zeta > 1).mean(axis=0)
+        total += zeta.sum(axis=1)
+        if trayectorias:
+            zeta_s[:, :, i] = zeta
+        zeta_previo, deficit_previo = zeta, deficit
+
+    deficit_media[:, -1] = deficit_previo.mean(axis=0)
+    deficit_q[:, :, -1] = _cuantiles(deficit_previo, cuantiles)
+    deficit_total += deficit_previo.sum(axis=1)
+    resultado = {
+        "zonas": list(Z), "dias": list(T), "cuantiles": cuantiles, "escenarios": escenarios,
+        "zeta": {"media": zeta_media, "cuantiles": zeta_q},
+        "deficit": {"media": deficit_media, "cuantiles": deficit_q},
+        "excedencia": excedencia,
+        "total": total,
+        "deficit_total": deficit_total,
+    }
+    if trayectorias:
+        deficit_s[:, :, -1] = deficit_previo
+        resultado["trayectorias"] = {"zeta": zeta_s, "deficit": deficit_s}
+    return resultado
+
+
+def tabla_simulacion(resultado):
+    """DataFrame por (z, t) con media y cuantiles de zeta y del déficit, y la excedencia"""
+    Z, T = resultado["zonas"], resultado["dias"]
+    tabla = pd.DataFrame({"z": np.repeat(Z, len(T)), "t": np.tile(T, len(Z))})
+    for familia in ("zeta", "deficit"):
+        tabla[f"{familia}_media"] = resultado[familia]["media"].ravel()
+        for q, valores in zip(resultado["cuantiles"], resultado[familia]["cuantiles"]):
+            tabla[f"{familia}_p{round(q * 100)}"] = valores.ravel()
+    tabla["excedencia"] = resultado["excedencia"].ravel()
+    return tabla
+
+
+def mostrar_simulacion(resultado, objetivo_plan=None):
+    """Resumen de la distribución de la peligrosidad total y de las zonas en riesgo"""
+    total, deficit = resultado["total"], resultado["deficit_total"]
+    print(f"🎲 Simulación: {resultado['escenarios']:,} escenarios × {len(resultado['zonas'])} zonas × "
+          f"{len(resultado['dias'])} días")
+    if objetivo_plan is not None:
+        print(f"   • Peligrosidad total del plan: {objetivo_plan:.6f}")
+    print(f"   • Peligrosidad total: media {total.mean():.6f}, p5 {np.quantile(total, 0.05):.6f}, "
+          f"p95 {np.quantile(total, 0.95):.6f}")
+    print(f"   • Déficit total: media {deficit.mean():.6f}, p95 {np.quantile(deficit, 0.95):.6f}")
+    excedencia = resultado["excedencia"]
+    riesgo = excedencia.max(axis=1)
+    print(f"   • Zonas con zeta > 1 en algún escenario: {int((riesgo > 0).sum())} "
+          f"(probabilidad máxima {riesgo.max():.2%})")
+
+
+if __name__ == "__main__":
+    import time
+    from parametros import cargar_parametros
+    from resultados import DIRECTORIO_SOLUCION, cargar_tablas, cargar_metadatos, plan_desde_tablas
+
+    origen = DIRECTORIO_SOLUCION
+    destino = DIRECTORIO_SIMULACION
+    escenarios, ruido, persistencia, semilla = 10000, 0.2, 0.0, 0
+
+    argumentos = iter(sys.argv[1:])
+    for arg in argumentos:
+        if arg == "--origen":
+            origen = next(argumentos, origen)
+        elif arg == "--destino":
+            destino = next(argumentos, destino)
+        elif arg == "--escenarios":
+            escenarios = int(next(argumentos, "10000"))
+        elif arg == "--ruido":
+            ruido = float(next(argumentos, "0.2"))
+        elif arg == "--persistencia":
+            persistencia = float(next(argumentos, "0"))
+        elif arg == "--semilla":
+            semilla = int(next(argumentos, "0"))
+        else:
+            print(f"❌ Argumento desconocido: {arg}")
+            print(__doc__)
+            sys.exit(1)
+
+    metadatos = cargar_metadatos(origen)
+    parametros = cargar_parametros(modo_testing=metadatos.get("modo", "cinco_zonas"),
+                                   horizonte=metadatos.get("horizonte", "mensual"),
+                                   zonas=metadatos.get("zonas"))
+    plan = plan_desde_tablas(cargar_tablas(directorio=origen))
+    inicio = time.perf_counter()
+    resultado = simular(parametros, cobertura_plan(parametros, plan["x"]), escenarios=escenarios,
+                        ruido=ruido, persistencia=persistencia, semilla=semilla)
+    print(f"⏱️  {time.perf_counter() - inicio:.2f} s")
+    mostrar_simulacion(resultado, metadatos.get("objetivo"))
+
+    os.makedirs(destino, exist_ok=True)
+    tabla_simulacion(resultado).to_csv(os.path.join(destino, "peligrosidad_simulada.csv"), index=False)
+    pd.DataFrame({"total": resultado["total"], "deficit_total": resultado["deficit_total"]}).to_csv(
+        os.path.join(destino, "totales_escenarios.csv"), index_label="escenario")
+    print(f"✅ Simulación guardada en {destino}")
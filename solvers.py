@@ -0,0 +1,275 @@
+"""
+CAPA DE SOLVERS
+Una sola formulación (forma_matricial / construir_modelo) y varios backends con la
+misma interfaz: construir, cargar un plan como inicio, resolver y extraer las tablas
+por familia de resultados.py. El reporte (estado, objetivo, cota, gap, tiempo y
+nodos) tiene las mismas claves en todos los backends, para comparar solvers sobre
+las mismas instancias.
+
+Backends:
+    gurobi: construir_modelo + resolver_modelo; requiere licencia. Opciones propias:
+            constructor, perfil de construcción, caché de modelos, pool de soluciones
+            y registro de progreso
+    highs:  forma_matricial cargada en HiGHS (highspy); no requiere licencia
+"""
+
+import numpy as np
+from heuristica import valores_plan
+from resultados import tabla_familia
+
+SOLVERS = ("gurobi", "highs")
+
+
+def _gap(objetivo, cota):
+    if objetivo is None or cota is None or not np.isfinite(cota):
+        return float("inf")
+    if abs(objetivo - cota) <= 1e-10:
+        return 0.0
+    return abs(objetivo - cota) / abs(objetivo) if objetivo != 0 else float("inf")
+
+
+def estado_gurobi(status):
+    """Nombre uniforme del status de Gurobi (el mismo que usa ModeloHighs)"""
+    from gurobipy import GRB
+    estados = {GRB.OPTIMAL: "optimo", GRB.TIME_LIMIT: "limite_tiempo", GRB.INFEASIBLE: "infactible",
+               GRB.MEM_LIMIT: "limite_memoria"}
+    return estados.get(status, f"status_{status}")
+
+
+class ModeloGurobi:
+    """
+    Backend Gurobi: el modelo de construir_modelo resuelto con resolver_modelo.
+
+    Args:
+        matricial: constructor matricial (por defecto) o el de generadores
+        perfil: PerfilConstruccion que mide cada familia al construir
+        cache: lee el modelo (y su última solución como inicio) de cache_modelo.py
+            si existe una entrada para estos parámetros; si no, lo construye y lo guarda
+        presolvido: con cache=True guarda además el modelo presolvido en la entrada
+    """
+
+    nombre = "gurobi"
+
+    def __init__(self, parametros, agregado=False, ajustada=False, matricial=True, perfil=None, cache=False,
+                 presolvido=False):
+        from modelo import construir_modelo
+        self.parametros = parametros
+        self.agregado, self.ajustada, self.cache = agregado, ajustada, cache
+        self.modelo = None
+        if cache:
+            from cache_modelo import cargar_modelo_cache
+            self.modelo = cargar_modelo_cache(parametros, agregado=agregado, ajustada=ajustada,
+                                              presolvido=presolvido)
+        self.desde_cache = self.modelo is not None
+        # Con una solución guardada en la caché el modelo ya trae su inicio
+        self.con_inicio = getattr(self.modelo, "_inicio_cache", False)
+        if self.modelo is None:
+            print("🔧 Construyendo modelo...")
+            self.modelo = construir_modelo(parametros, agregado=agregado, matricial=matricial, ajustada=ajustada,
+                                           perfil=perfil)
+            if cache:
+                from cache_modelo import guardar_modelo_cache
+                guardar_modelo_cache(self.modelo, parametros, agregado=agregado, ajustada=ajustada,
+                                     presolvido=presolvido)
+
+    def cargar_inicio(self, plan):
+        from heuristica import cargar_inicio_mip
+        cargar_inicio_mip(self.modelo, plan, self.parametros)
+        self.con_inicio = True
+
+    def resolver(self, tiempo_limite=None, hilos=None, gap=None, salida=True, pool=0, gap_pool=0.05):
+        """
+        Con pool > 1 busca además hasta pool soluciones dentro de gap_pool (ver
+        soluciones_pool). La evolución de incumbente y cota queda en self.progreso.
+        """
+        from modelo import resolver_modelo
+
+        if tiempo_limite is not None:
+            self.modelo.setParam("TimeLimit", tiempo_limite)
+        if hilos is not None:
+            self.modelo.setParam("Threads", hilos)
+        if gap is not None:
+            self.modelo.setParam("MIPGap", gap)
+        if not salida:
+            self.modelo.setParam("OutputFlag", 0)
+        resolver_modelo(self.modelo, pool=pool, gap_pool=gap_pool)
+        self.progreso = self.modelo._progreso
+
+        modelo = self.modelo
+        con_solucion = modelo.SolCount > 0
+        return {
+            "solver": self.nombre,
+            "estado": estado_gurobi(modelo.status),
+            "con_solucion": con_solucion,
+            "objetivo": modelo.ObjVal if con_solucion else None,
+            "cota": modelo.ObjBound if modelo.IsMIP else (modelo.ObjVal if con_solucion else None),
+            "gap": modelo.MIPGap if con_solucion else float("inf"),
+            "tiempo": modelo.Runtime,
+            "nodos": int(modelo.NodeCount),
+            "variables": modelo.NumVars,
+            "restricciones": modelo.NumConstrs,
+        }
+
+    def cota_lp(self):
+        """Valor de la relajación LP (sin modificar el modelo entero)"""
+        from gurobipy import GRB
+        self.modelo.update()
+        relajado = self.modelo.relax()
+        relajado.setParam("OutputFlag", 0)
+        relajado.optimize()
+        valor = relajado.ObjVal if relajado.status == GRB.OPTIMAL else None
+        relajado.dispose()
+        return valor
+
+    def tablas(self):
+        from resultados import extraer_solucion
+        return extraer_solucion(self.modelo)
+
+    def soluciones_pool(self):
+        """Soluciones del pool de la última resolución (resultados.extraer_pool)"""
+        from resultados import extraer_pool
+        return extraer_pool(self.modelo)
+
+    def guardar_solucion_cache(self):
+        """Guarda la solución en la entrada de caché del modelo (solo con cache=True)"""
+        if self.cache:
+            from cache_modelo import guardar_solucion_cache
+            guardar_solucion_cache(self.modelo, self.parametros, agregado=self.agregado, ajustada=self.ajustada)
+
+
+class ModeloHighs:
+    """Backend HiGHS: forma_matricial apilada en una sola matriz por filas"""
+
+    nombre = "highs"
+    desde_cache = False
+    con_inicio = False
+
+    def __init__(self, parametros, agregado=False, ajustada=False):
+        import highspy
+        import scipy.sparse as sp
+        from modelo_matricial import forma_matricial
+
+        print("🔧 Construyendo modelo para HiGHS...")
+        self.parametros = parametros
+        self.forma = forma = forma_matricial(parametros, agregado=agregado, ajustada=ajustada)
+        inf = highspy.kHighsInf
+
+        bloques, inferior, superior = [], [], []
+        for _, A, sentido, rhs in forma["restricciones"]:
+            bloques.append(A)
+            inferior.append(np.full(len(rhs), -inf) if sentido == "<" else rhs)
+            superior.append(np.full(len(rhs), inf) if sentido == ">" else rhs)
+        A = sp.vstack(bloques, format="csr")
+
+        lp = highspy.HighsLp()
+        lp.num_col_, lp.num_row_ = forma["n"], A.shape[0]
+        lp.col_cost_ = forma["objetivo"]
+        lp.col_lower_ = np.concatenate([datos["lb"] for datos in forma["familias"].values()])
+        lp.col_upper_ = np.minimum(np.concatenate([datos["ub"] for datos in forma["familias"].values()]), inf)
+        lp.row_lower_, lp.row_upper_ = np.concatenate(inferior), np.concatenate(superior)
+        lp.a_matrix_.format_ = highspy.MatrixFormat.kRowwise
+        lp.a_matrix_.num_col_, lp.a_matrix_.num_row_ = forma["n"], A.shape[0]
+        lp.a_matrix_.start_, lp.a_matrix_.index_, lp.a_matrix_.value_ = A.indptr, A.indices, A.data
+        lp.integrality_ = [highspy.HighsVarType.kContinuous if datos["tipo"] == "C" else highspy.HighsVarType.kInteger
+                           for datos in forma["familias"].values() for _ in datos["claves"]]
+
+        self.lp = lp
+        self.highs = highspy.Highs()
+        self.highs.passModel(lp)
+        self.filas = A.shape[0]
+        print(f"📊 Matriz: {A.shape[0]:,} filas × {forma['n']:,} columnas, {A.nnz:,} no nulos")
+
+    def cargar_inicio(self, plan):
+        import highspy
+        valores = valores_plan(plan, self.parametros, self.forma["familias"])
+        inicio = np.zeros(self.forma["n"])
+        for familia, datos in self.forma["familias"].items():
+            fijados = valores.get(familia, {})
+            inicio[datos["inicio"]:datos["inicio"] + len(datos["claves"])] = [fijados.get(clave, 0.0) for clave in datos["claves"]]
+        solucion = highspy.HighsSolution()
+        solucion.col_value = inicio.tolist()
+        solucion.value_valid = True
+        self.highs.setSolution(solucion)
+        self.con_inicio = True
+
+    def resolver(self, tiempo_limite=None, hilos=None, gap=None, salida=True):
+        import highspy
+
+        highs = self.highs
+        if tiempo_limite is not None:
+            highs.setOptionValue("time_limit", float(tiempo_limite))
+        if hilos is not None:
+            highs.setOptionValue("threads", int(hilos))
+        if gap is not None:
+            highs.setOptionValue("mip_rel_gap", float(gap))
+        highs.setOptionValue("output_flag", bool(salida))
+        if salida:
+            print("🚀 Llamando a Highs.run()...")
+        highs.run()
+
+        estado = highs.getModelStatus()
+        estados = {highspy.HighsModelStatus.kOptimal: "optimo", highspy.HighsModelStatus.kTimeLimit: "limite_tiempo",
+                   highspy.HighsModelStatus.kInfeasible: "infactible", highspy.HighsModelStatus.kMemoryLimit: "limite_memoria"}
+        info = highs.getInfo()
+        con_solucion = info.primal_solution_status == 2  # kSolutionStatusFeasible
+        objetivo = info.objective_function_value if con_solucion else None
+        cota = info.mip_dual_bound if np.isfinite(info.mip_dual_bound) else None
+        return {
+            "solver": self.nombre,
+            "estado": estados.get(estado, highs.modelStatusToString(estado)),
+            "con_solucion": con_solucion,
+            "objetivo": objetivo,
+            "cota": cota,
+            "gap": _gap(objetivo, cota),
+            "tiempo": highs.getRunTime(),
+            "nodos": info.mip_node_count,
+            "variables": self.forma["n"],
+            "restricciones": self.filas,
+        }
+
+    def cota_lp(self):
+        """Valor de la relajación LP (sin modificar el modelo entero)"""
+        import highspy
+        enteras = self.lp.integrality_
+        self.lp.integrality_ = []
+        relajado = highspy.Highs()
+        relajado.setOptionValue("output_flag", False)
+        relajado.passModel(self.lp)
+        self.lp.integrality_ = enteras
+        relajado.run()
+        if relajado.getModelStatus() != highspy.HighsModelStatus.kOptimal:
+            return None
+        return relajado.getInfo().objective_function_value
+
+    def tablas(self):
+        valores = np.asarray(self.highs.getSolution().col_value)
+        return {
+            familia: tabla_familia(familia, datos["claves"],
+                                   valores[datos["inicio"]:datos["inicio"] + len(datos["claves"])])
+            for familia, datos in self.forma["familias"].items()
+        }
+
+
+def crear_modelo(parametros, solver="gurobi", agregado=False, ajustada=False, **opciones):
+    """
+    Construye el modelo con el backend pedido.
+
+    Args:
+        opciones: opciones propias del backend (ver ModeloGurobi)
+
+    Returns:
+        Objeto con cargar_inicio(plan), resolver(tiempo_limite, hilos, gap, salida) -> reporte,
+        cota_lp() -> valor de la relajación LP y tablas() -> {familia: DataFrame}
+    """
+    backends = {"gurobi": ModeloGurobi, "highs": ModeloHighs}
+    if solver not in backends:
+        raise ValueError(f"Solver desconocido: {solver}. Disponibles: {', '.join(SOLVERS)}")
+    return backends[solver](parametros, agregado=agregado, ajustada=ajustada, **opciones)
+
+
+def mostrar_reporte(reporte):
+    """Imprime el reporte uniforme de resolver()"""
+    objetivo = f"{reporte['objetivo']:.6f}" if reporte["objetivo"] is not None else "sin solución"
+    cota = f"{reporte['cota']:.6f}" if reporte["cota"] is not None else "-"
+    print(f"📊 {reporte['solver']}: {reporte['estado']}, objetivo {objetivo}, cota {cota}, "
+          f"gap {reporte['gap']:.2%}, {reporte['tiempo']:.2f} s, {reporte['nodos']} nodos")
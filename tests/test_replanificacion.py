@@ -0,0 +1,93 @@
+"""
+Replanificación sobre el mismo modelo: llamar preparar_replanificacion varias veces
+debe dar el mismo óptimo que un modelo nuevo con las mismas observaciones.
+"""
+
+import io
+import os
+import sys
+import contextlib
+import pytest
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+sys.path.insert(0, os.path.join(RAIZ, "scripts"))
+
+gp = pytest.importorskip("gurobipy")
+
+from generar_instancia import generar_instancia
+from parametros import cargar_parametros, aplicar_escenario
+from modelo import construir_modelo, resolver_modelo
+from resultados import extraer_solucion, plan_desde_tablas
+from replanificacion import preparar_replanificacion
+
+
+@pytest.fixture(scope="module")
+def parametros(tmp_path_factory):
+    """Instancia sintética de una zona y 5 días (cabe en la licencia limitada de Gurobi)"""
+    datos = str(tmp_path_factory.mktemp("data"))
+    generar_instancia(datos, zonas=1, comisarias=1, carabineros=6, vehiculos=3, dias=365)
+    with contextlib.redirect_stdout(io.StringIO()):
+        parametros = cargar_parametros(modo_testing=False, horizonte="completo", usar_cache=False,
+                                       directorio_datos=datos)
+    parametros = aplicar_escenario(parametros, {"kappa": 1})
+    dias = parametros["T"][:5]
+    parametros["T"] = dias
+    parametros["O"] = {(v, t): costo for (v, t), costo in parametros["O"].items() if t in dias}
+    return parametros
+
+
+def _resolver(modelo):
+    with contextlib.redirect_stdout(io.StringIO()):
+        assert resolver_modelo(modelo)
+    return modelo.ObjVal
+
+
+def _modelo(parametros):
+    with contextlib.redirect_stdout(io.StringIO()):
+        modelo = construir_modelo(parametros)
+    modelo.setParam("OutputFlag", 0)
+    return modelo
+
+
+def test_replanificar_dos_veces_igual_a_modelo_nuevo(parametros):
+    z, t0 = parametros["Z"][0], parametros["T"][0]
+    observada = {(z, t0): 0.3, (z, t0 + 1): 0.2}
+
+    modelo = _modelo(parametros)
+    _resolver(modelo)
+    with contextlib.redirect_stdout(io.StringIO()):
+        preparar_replanificacion(modelo, parametros, plan_desde_tablas(extraer_solucion(modelo)), 2,
+                                 zeta_observada=observada)
+    _resolver(modelo)
+    plan = plan_desde_tablas(extraer_solucion(modelo))
+    # Segunda replanificación sin observaciones nuevas: las de la primera siguen fijas
+    with contextlib.redirect_stdout(io.StringIO()):
+        preparar_replanificacion(modelo, parametros, plan, 4)
+    reutilizado = _resolver(modelo)
+    zeta = modelo._variables["zeta"]
+    assert [zeta[clave].X for clave in observada] == pytest.approx(list(observada.values()))
+
+    nuevo = _modelo(parametros)
+    with contextlib.redirect_stdout(io.StringIO()):
+        preparar_replanificacion(nuevo, parametros, plan, 4, zeta_observada=observada)
+    assert reutilizado == pytest.approx(_resolver(nuevo), abs=1e-6)
+    assert reutilizado > 0
+
+
+def test_incidencia_no_cambia_dias_transcurridos(parametros):
+    modelo = _modelo(parametros)
+    _resolver(modelo)
+    r13 = modelo._restricciones["R13"]
+    antes = {clave: fila.RHS for clave, fila in r13.items()}
+    incidencia = {clave: 3 * valor for clave, valor in parametros["I"].items()}
+    with contextlib.redirect_stdout(io.StringIO()):
+        preparar_replanificacion(modelo, parametros, plan_desde_tablas(extraer_solucion(modelo)), 2,
+                                 incidencia_observada=incidencia)
+    modelo.update()
+    transcurridos = set(parametros["T"][:2])
+    for (z, t), fila in r13.items():
+        if t in transcurridos:
+            assert fila.RHS == antes[z, t]
+        else:
+            assert fila.RHS != antes[z, t]
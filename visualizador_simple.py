@@ -5,59 +5,46 @@ Genera reportes y tablas usando solo pandas (sin gráficos)
 
 import pandas as pd
 import numpy as np
-import re
-from collections import defaultdict
 import os
+from resultados import cargar_solucion
 
 def cargar_datos():
     """Cargar todos los datos necesarios"""
     try:
         # Resultados del modelo
-        variables_df = pd.read_excel("resultados/variables_activas.xlsx")
-        resumen_df = pd.read_excel("resultados/resumen_diario_recursos.xlsx")
+        # Solo las columnas que usan los reportes
+        tablas, resumen_df, metadatos = cargar_solucion(
+            ["x", "u", "zeta"], columnas={"x": ["p", "z", "t"], "u": ["valor"], "zeta": ["valor"]})
+        total_activas = sum(metadatos.get("filas", {}).values())
         
         # Datos base
         zonas_df = pd.read_csv("data/zonas.csv")
         vehiculos_df = pd.read_csv("data/vehiculos.csv")
         
         print("✅ Datos cargados exitosamente:")
-        print(f"   • Variables activas: {len(variables_df):,}")
+        print(f"   • Variables activas: {total_activas:,}")
         print(f"   • Días de resumen: {len(resumen_df)}")
         print(f"   • Zonas disponibles: {len(zonas_df)}")
         print(f"   • Vehículos totales: {len(vehiculos_df)}")
         
-        return variables_df, resumen_df, zonas_df, vehiculos_df
+        return tablas, total_activas, resumen_df, zonas_df, vehiculos_df
         
     except Exception as e:
         print(f"❌ Error cargando datos: {e}")
         print("💡 Asegúrate de ejecutar 'python main.py' primero")
-        return None, None, None, None
+        return None, None, None, None, None
 
-def procesar_datos(variables_df, zonas_df):
+def procesar_datos(tablas, zonas_df):
     """Procesar datos para análisis"""
-    # Extraer información de variables
-    zonas_utilizadas = set()
-    dias_utilizados = set()
-    vehiculos_utilizados = set()
-
-    for _, row in variables_df.iterrows():
-        var_name = row['variable']
-        if var_name.startswith('x['):  # x[p,z,m,t]
-            match = re.search(r'x\[(\d+),(\d+),(\d+),(\d+)\]', var_name)
-            if match:
-                p, z, m, t = map(int, match.groups())
-                zonas_utilizadas.add(z)
-                dias_utilizados.add(t)
-                vehiculos_utilizados.add(p)
+    # Extraer información de las asignaciones x[p,z,m,t]
+    x = tablas["x"]
+    zonas_utilizadas = set(x['z'].unique().tolist())
+    dias_utilizados = set(x['t'].unique().tolist())
+    vehiculos_utilizados = set(x['p'].unique().tolist())
 
     # Crear mapeo de nombres
-    zona_nombres = {}
-    for zona_id in zonas_utilizadas:
-        zona_row = zonas_df[zonas_df['id_zona'] == zona_id]
-        if not zona_row.empty:
-            zona_nombres[zona_id] = zona_row.iloc[0]['nombre_zona']
-        else:
-            zona_nombres[zona_id] = f"Zona {zona_id}"
+    nombres = zonas_df.set_index('id_zona')['nombre_zona']
+    zona_nombres = {zona_id: nombres.get(zona_id, f"Zona {zona_id}") for zona_id in zonas_utilizadas}
 
     tipos_vehiculos = {1: "Peatón", 2: "Moto", 3: "Bicicleta", 4: "Caballo", 5: "Auto", 6: "Furgón"}
 
@@ -67,45 +54,26 @@ def procesar_datos(variables_df, zonas_df):
     
     return zonas_utilizadas, dias_utilizados, vehiculos_utilizados, zona_nombres, tipos_vehiculos
 
-def crear_tabla_patrullas(variables_df, zonas_utilizadas, dias_utilizados, zona_nombres):
+def crear_tabla_patrullas(tablas, zonas_utilizadas, dias_utilizados, zona_nombres):
     """Crear tabla de distribución de patrullas"""
     print("\n📊 TABLA DE DISTRIBUCIÓN DE PATRULLAS POR ZONA Y DÍA")
     print("="*80)
     
-    # Crear matriz de patrullas
-    patrullas_matriz = defaultdict(lambda: defaultdict(int))
-    
-    for _, row in variables_df.iterrows():
-        var_name = row['variable']
-        if var_name.startswith('x['):
-            match = re.search(r'x\[(\d+),(\d+),(\d+),(\d+)\]', var_name)
-            if match:
-                p, z, m, t = map(int, match.groups())
-                patrullas_matriz[t][z] += 1
-
-    # Convertir a DataFrame
+    # Matriz de patrullas días x zonas
+    x = tablas["x"]
     dias_sorted = sorted(dias_utilizados)
     zonas_sorted = sorted(zonas_utilizadas)
-    
-    tabla_data = []
-    for dia in dias_sorted:
-        fila = {'Día': dia}
-        total_dia = 0
-        for zona in zonas_sorted:
-            patrullas = patrullas_matriz[dia][zona]
-            fila[zona_nombres[zona]] = patrullas
-            total_dia += patrullas
-        fila['Total_Día'] = total_dia
-        tabla_data.append(fila)
+    matriz = pd.crosstab(x['t'], x['z']).reindex(index=dias_sorted, columns=zonas_sorted, fill_value=0)
+    matriz.columns = [zona_nombres[zona] for zona in zonas_sorted]
 
-    tabla_df = pd.DataFrame(tabla_data)
+    tabla_df = matriz.rename_axis('Día').reset_index()
+    tabla_df.columns.name = None
+    tabla_df['Total_Día'] = matriz.sum(axis=1).to_numpy()
     
     # Agregar fila de totales
     totales = {'Día': 'TOTAL'}
-    for zona in zonas_sorted:
-        total_zona = sum(patrullas_matriz[dia][zona] for dia in dias_sorted)
-        totales[zona_nombres[zona]] = total_zona
-    totales['Total_Día'] = sum(totales[col] for col in totales if col not in ['Día', 'Total_Día'])
+    totales.update(matriz.sum().to_dict())
+    totales['Total_Día'] = int(matriz.to_numpy().sum())
     
     # Crear DataFrame de totales y concatenar
     totales_df = pd.DataFrame([totales])
@@ -132,28 +100,20 @@ def crear_ranking_comunas(tabla_df, zona_nombres):
     print("="*60)
     
     # Calcular totales por zona
-    ranking_data = []
-    total_general = 0
-    
-    for zona_id in sorted(zona_nombres.keys()):
-        zona_name = zona_nombres[zona_id]
-        if zona_name in tabla_df.columns:
-            total_zona = tabla_df[zona_name].sum()
-            promedio_dia = total_zona / len(tabla_df)
-            total_general += total_zona
-            
-            ranking_data.append({
-                'Comuna': zona_name,
-                'Total_Patrullas': total_zona,
-                'Promedio_Diario': round(promedio_dia, 1),
-                'Min_Diario': tabla_df[zona_name].min(),
-                'Max_Diario': tabla_df[zona_name].max()
-            })
-    
-    ranking_df = pd.DataFrame(ranking_data)
+    columnas = [zona_nombres[zona_id] for zona_id in sorted(zona_nombres) if zona_nombres[zona_id] in tabla_df.columns]
+    patrullas = tabla_df[columnas]
+    
+    ranking_df = pd.DataFrame({
+        'Comuna': columnas,
+        'Total_Patrullas': patrullas.sum().to_numpy(),
+        'Promedio_Diario': patrullas.mean().round(1).to_numpy(),
+        'Min_Diario': patrullas.min().to_numpy(),
+        'Max_Diario': patrullas.max().to_numpy()
+    })
     ranking_df = ranking_df.sort_values('Total_Patrullas', ascending=False)
     
     # Agregar porcentajes
+    total_general = ranking_df['Total_Patrullas'].sum()
     ranking_df['Porcentaje'] = round((ranking_df['Total_Patrullas'] / total_general) * 100, 1)
     
     print(ranking_df.to_string(index=False))
@@ -169,29 +129,16 @@ def analizar_vehiculos(vehiculos_utilizados, vehiculos_df, tipos_vehiculos):
     print("\n🚗 ANÁLISIS DE TIPOS DE VEHÍCULOS UTILIZADOS")
     print("="*60)
     
-    vehiculos_por_tipo = defaultdict(int)
-    
-    for vehiculo_id in vehiculos_utilizados:
-        vehiculo_row = vehiculos_df[vehiculos_df['id'] == vehiculo_id]
-        if not vehiculo_row.empty:
-            tipo = vehiculo_row.iloc[0]['tipo_medio']
-            vehiculos_por_tipo[tipo] += 1
+    usados = vehiculos_df[vehiculos_df['id'].isin(vehiculos_utilizados)]
+    vehiculos_por_tipo = usados['tipo_medio'].value_counts()
     
     # Crear tabla de vehículos
-    vehiculos_data = []
-    total_utilizados = sum(vehiculos_por_tipo.values())
-    
-    for tipo, cantidad in vehiculos_por_tipo.items():
-        nombre_tipo = tipos_vehiculos.get(tipo, f"Tipo {tipo}")
-        porcentaje = (cantidad / total_utilizados) * 100
-        
-        vehiculos_data.append({
-            'Tipo_Vehiculo': nombre_tipo,
-            'Cantidad_Utilizada': cantidad,
-            'Porcentaje': round(porcentaje, 1)
-        })
-    
-    vehiculos_tabla = pd.DataFrame(vehiculos_data)
+    total_utilizados = int(vehiculos_por_tipo.sum())
+    vehiculos_tabla = pd.DataFrame({
+        'Tipo_Vehiculo': [tipos_vehiculos.get(tipo, f"Tipo {tipo}") for tipo in vehiculos_por_tipo.index],
+        'Cantidad_Utilizada': vehiculos_por_tipo.to_numpy(),
+        'Porcentaje': ((vehiculos_por_tipo / total_utilizados) * 100).round(1).to_numpy()
+    })
     vehiculos_tabla = vehiculos_tabla.sort_values('Cantidad_Utilizada', ascending=False)
     
     print(vehiculos_tabla.to_string(index=False))
@@ -211,15 +158,15 @@ def analizar_vehiculos(vehiculos_utilizados, vehiculos_df, tipos_vehiculos):
     
     return vehiculos_tabla
 
-def crear_reporte_ejecutivo(variables_df, ranking_df, vehiculos_tabla, zonas_utilizadas, dias_utilizados, vehiculos_utilizados, vehiculos_df):
+def crear_reporte_ejecutivo(tablas, total_activas, ranking_df, vehiculos_tabla, zonas_utilizadas, dias_utilizados, vehiculos_utilizados, vehiculos_df):
     """Crear reporte ejecutivo completo"""
     print("\n" + "="*80)
     print("📋 REPORTE EJECUTIVO - MODELO DE PATRULLAJE PREVENTIVO")
     print("="*80)
     
     # Extraer función objetivo
-    u_vars = variables_df[variables_df['variable'].str.startswith('u[')]
-    zeta_vars = variables_df[variables_df['variable'].str.startswith('zeta[')]
+    u_vars = tablas["u"]
+    zeta_vars = tablas["zeta"]
     funcion_objetivo = u_vars['valor'].sum() if not u_vars.empty else 0
     deficit_total = zeta_vars['valor'].sum() if not zeta_vars.empty else 0
     
@@ -253,7 +200,7 @@ def crear_reporte_ejecutivo(variables_df, ranking_df, vehiculos_tabla, zonas_uti
             f"{promedio_diario:.1f}",
             total_vehiculos_utilizados,
             f"{eficiencia_flota:.1f}%",
-            f"{len(variables_df):,}",
+            f"{total_activas:,}",
             f"{(total_patrullas/funcion_objetivo):.0f}" if funcion_objetivo > 0 else "N/A"
         ]
     }
@@ -297,19 +244,19 @@ def main():
     print("")
     
     # Cargar datos
-    variables_df, resumen_df, zonas_df, vehiculos_df = cargar_datos()
-    if variables_df is None:
+    tablas, total_activas, resumen_df, zonas_df, vehiculos_df = cargar_datos()
+    if tablas is None:
         return
     
     # Procesar datos
     zonas_utilizadas, dias_utilizados, vehiculos_utilizados, zona_nombres, tipos_vehiculos = procesar_datos(
-        variables_df, zonas_df)
+        tablas, zonas_df)
     
     # Generar análisis
-    tabla_df, totales = crear_tabla_patrullas(variables_df, zonas_utilizadas, dias_utilizados, zona_nombres)
+    tabla_df, totales = crear_tabla_patrullas(tablas, zonas_utilizadas, dias_utilizados, zona_nombres)
     ranking_df = crear_ranking_comunas(tabla_df, zona_nombres)
     vehiculos_tabla = analizar_vehiculos(vehiculos_utilizados, vehiculos_df, tipos_vehiculos)
-    crear_reporte_ejecutivo(variables_df, ranking_df, vehiculos_tabla, zonas_utilizadas, 
+    crear_reporte_ejecutivo(tablas, total_activas, ranking_df, vehiculos_tabla, zonas_utilizadas, 
                            dias_utilizados, vehiculos_utilizados, vehiculos_df)
     
     print(f"\n✅ ANÁLISIS COMPLETADO EXITOSAMENTE")